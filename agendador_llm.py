@@ -0,0 +1,215 @@
+"""
+Agendador de Requisições ao LLM - Desafio Siemens Energy
+Respeita as cotas do Groq (requisições e tokens por minuto), adapta a concorrência e repete requisições que falham por limite/instabilidade
+"""
+
+import os
+import random
+import threading
+import time
+from groq import APIConnectionError, APIStatusError, APITimeoutError
+
+_agendador_padrao = None
+_lock_padrao = threading.Lock()
+
+
+def status_http(erro):
+    """Status HTTP de um erro do Groq (None se não houve resposta)"""
+    return getattr(erro, 'status_code', None)
+
+
+def erro_retentavel(erro):
+    """429, 5xx, timeout e falha de conexão valem nova tentativa; o resto (ex: 400, 401) não"""
+    if isinstance(erro, APIConnectionError):
+        return True
+    status = status_http(erro)
+    return isinstance(erro, APIStatusError) and status is not None and (status == 429 or status >= 500)
+
+
+def espera_sugerida(erro):
+    """Segundos pedidos pelo servidor no cabeçalho retry-after, se houver"""
+    resposta = getattr(erro, 'response', None)
+    if resposta is None:
+        return None
+    try:
+        return float(resposta.headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class AgendadorLLM:
+    """
+    Controla o ritmo das requisições ao LLM
+
+    - Balde de fichas duplo: requisições/minuto e tokens/minuto. Cada
+      requisição reserva os tokens estimados (prompt + parte da resposta) e o
+      valor é corrigido pelo uso real informado pela API.
+    - Concorrência adaptativa (AIMD): cada sucesso aumenta o limite de
+      requisições simultâneas em ~1 por "janela"; cada 429/5xx o corta pela metade.
+    - Retentativas com espera exponencial e jitter (ou o retry-after do
+      servidor) para erros retentáveis; os demais sobem na hora. Tempo
+      esgotado conta à parte (max_tentativas_timeout): uma requisição lenta
+      não prende a vaga por max_tentativas vezes o timeout.
+    """
+
+    def __init__(self, rpm=30, tpm=12000, concorrencia_inicial=2, concorrencia_maxima=8,
+                 max_tentativas=5, espera_base=1.0, espera_maxima=60.0, max_tentativas_timeout=2):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.concorrencia_maxima = concorrencia_maxima
+        self.max_tentativas = max_tentativas
+        self.max_tentativas_timeout = max_tentativas_timeout
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+
+        self._condicao = threading.Condition()
+        self._fichas_requisicoes = float(rpm)
+        self._fichas_tokens = float(tpm)
+        self._ultima_recarga = time.monotonic()
+        self._pausado_ate = 0.0
+        self._limite = float(min(concorrencia_inicial, concorrencia_maxima))
+        self._em_voo = 0
+
+        self.requisicoes = 0
+        self.sucessos = 0
+        self.retentativas = 0
+        self.falhas = 0
+        self.erros_limite = 0
+        self.erros_servidor = 0
+        self.tempo_espera = 0.0
+
+    def executar(self, funcao, tokens_estimados):
+        """
+        Executa funcao() respeitando cotas e concorrência, com retentativas
+        Retorna o resultado de funcao; se todas as tentativas falharem, a última exceção sobe.
+        """
+        timeouts = 0
+        for tentativa in range(1, self.max_tentativas + 1):
+            self._entrar(tokens_estimados)
+            try:
+                resultado = funcao()
+            except Exception as e:
+                self._sair(sucesso=False, erro=e)
+
+                # APITimeoutError é um APIConnectionError: sem o limite próprio, seria repetido como queda de conexão
+                if isinstance(e, APITimeoutError):
+                    timeouts += 1
+                    esgotou = timeouts >= self.max_tentativas_timeout
+                else:
+                    esgotou = tentativa == self.max_tentativas
+
+                if not erro_retentavel(e) or esgotou:
+                    with self._condicao:
+                        self.falhas += 1
+                    raise
+
+                espera = espera_sugerida(e)
+                if espera is None:
+                    espera = min(self.espera_maxima, self.espera_base * 2 ** (tentativa - 1))
+                    espera *= random.uniform(0.5, 1.5)
+
+                with self._condicao:
+                    self.retentativas += 1
+                    if status_http(e) == 429:
+                        # Todo mundo espera: a cota é compartilhada
+                        self._pausado_ate = max(self._pausado_ate, time.monotonic() + espera)
+                time.sleep(espera)
+                continue
+
+            self._sair(sucesso=True)
+            return resultado
+
+    def ajustar_tokens(self, reservados, usados):
+        """Corrige a reserva com o uso real (tokens de prompt + resposta)"""
+        if usados is None:
+            return
+        with self._condicao:
+            self._fichas_tokens = min(self.tpm, self._fichas_tokens + reservados - usados)
+            self._condicao.notify_all()
+
+    def _entrar(self, tokens):
+        """Espera vaga de concorrência e fichas suficientes, e as consome"""
+        tokens = min(tokens, self.tpm)  # requisição maior que a cota: espera o balde encher
+        inicio = time.monotonic()
+
+        with self._condicao:
+            while True:
+                agora = time.monotonic()
+                self._recarregar(agora)
+
+                if agora < self._pausado_ate:
+                    espera = self._pausado_ate - agora
+                elif self._em_voo >= int(self._limite):
+                    espera = None  # acorda quando alguém sair
+                elif self._fichas_requisicoes >= 1 and self._fichas_tokens >= tokens:
+                    self._fichas_requisicoes -= 1
+                    self._fichas_tokens -= tokens
+                    self._em_voo += 1
+                    self.requisicoes += 1
+                    self.tempo_espera += agora - inicio
+                    return
+                else:
+                    falta_requisicoes = max(0.0, 1 - self._fichas_requisicoes) * 60 / self.rpm
+                    falta_tokens = max(0.0, tokens - self._fichas_tokens) * 60 / self.tpm
+                    espera = max(falta_requisicoes, falta_tokens, 0.01)
+
+                self._condicao.wait(espera)
+
+    def _sair(self, sucesso, erro=None):
+        with self._condicao:
+            self._em_voo -= 1
+
+            if sucesso:
+                self.sucessos += 1
+                self._limite = min(self.concorrencia_maxima, self._limite + 1 / self._limite)
+            else:
+                status = status_http(erro)
+                if status == 429:
+                    self.erros_limite += 1
+                elif status is not None and status >= 500:
+                    self.erros_servidor += 1
+                if erro_retentavel(erro):
+                    self._limite = max(1.0, self._limite / 2)
+
+            self._condicao.notify_all()
+
+    def _recarregar(self, agora):
+        decorrido = agora - self._ultima_recarga
+        self._ultima_recarga = agora
+        self._fichas_requisicoes = min(self.rpm, self._fichas_requisicoes + decorrido * self.rpm / 60)
+        self._fichas_tokens = min(self.tpm, self._fichas_tokens + decorrido * self.tpm / 60)
+
+    def estatisticas(self):
+        """Contadores do agendador"""
+        with self._condicao:
+            return {
+                "requisicoes": self.requisicoes,
+                "sucessos": self.sucessos,
+                "retentativas": self.retentativas,
+                "falhas": self.falhas,
+                "erros_limite": self.erros_limite,
+                "erros_servidor": self.erros_servidor,
+                "tempo_espera": self.tempo_espera,
+                "concorrencia_atual": int(self._limite)
+            }
+
+
+def agendador_padrao():
+    """
+    Agendador compartilhado por todos os clientes do processo (a cota é da chave da API)
+    GROQ_RPM / GROQ_TPM: cotas do plano (padrão: plano gratuito do llama-3.3-70b)
+    LLM_CONCORRENCIA_MAXIMA: teto de requisições simultâneas (padrão 8)
+    LLM_MAX_TENTATIVAS: tentativas por requisição (padrão 5)
+    LLM_MAX_TENTATIVAS_TIMEOUT: tentativas quando o tempo de cada uma se esgota (padrão 2)
+    """
+    global _agendador_padrao
+    with _lock_padrao:
+        if _agendador_padrao is None:
+            _agendador_padrao = AgendadorLLM(
+                rpm=int(os.getenv('GROQ_RPM') or 30),
+                tpm=int(os.getenv('GROQ_TPM') or 12000),
+                concorrencia_maxima=int(os.getenv('LLM_CONCORRENCIA_MAXIMA') or 8),
+                max_tentativas=int(os.getenv('LLM_MAX_TENTATIVAS') or 5),
+                max_tentativas_timeout=int(os.getenv('LLM_MAX_TENTATIVAS_TIMEOUT') or 2)
+            )
+        return _agendador_padrao
@@ -3,16 +3,52 @@ Analisador de Motores Elétricos - Desafio Siemens Energy
 Sistema de matching inteligente usando LLM para comparação de requisitos técnicos
 """
 
-from groq import Groq
+import io
 import json
 import os
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from pathlib import Path
 from datetime import datetime
+from cache_llm import criar_cache_padrao
+from cliente_llm import ClienteLLM, RequisicaoCancelada
+from catalogo_colunar import CatalogoColunar
+from catalogo_preparado import CatalogoPreparado
+from custo_energia import CalculadoraEnergia, PrecosReferenciaIE2, cenario_padrao
+from indice_catalogo import IndiceCatalogo
+from leitor_catalogo import antecipar, em_blocos, ler_produtos
+from memo_analises import chave_analise, criar_memo_padrao, resumo, resumo_requisitos
+from pontuacao import CalculadoraPontuacao, chave_ranking, selecionar_top_k
+from prompt_analise import PromptAnalise
+from selecao_relevancia import estimar_tokens
+from snapshot_catalogo import abrir_snapshot
 
 # Carrega variáveis de ambiente
 load_dotenv()
 
+# Acima deste tamanho, sem o snapshot, main() lê o catálogo em fluxo em vez de carregá-lo inteiro
+CATALOGO_GRANDE_MB = 50
+
+
+class PrazoAnalise:
+    """
+    Cancelamento de uma requisição com prazo próprio, ligado ao cancelamento do lote
+    Vai ao ClienteLLM no lugar do threading.Event: is_set() vale quando o
+    lote foi cancelado (ex: Ctrl+C) ou quando o prazo desta requisição venceu.
+    Vencer o prazo de um motor não afeta as requisições dos demais.
+    """
+    
+    def __init__(self, cancelar):
+        self.cancelar = cancelar
+        self.vencido = threading.Event()
+    
+    def is_set(self):
+        return self.cancelar.is_set() or self.vencido.is_set()
+
+
 class AnalisadorMotores:
     """
     Classe para análise de adequação de motores elétricos usando LLM
@@ -20,8 +56,35 @@ class AnalisadorMotores:
     """
     
     def __init__(self):
-        self.client = Groq(api_key=os.getenv('GROQ_API_KEY'))
         self.model = "llama-3.3-70b-versatile"
+        self.llm = ClienteLLM(self.model, cache=criar_cache_padrao())
+        # Análise de cada motor guardada entre execuções: só os motores que mudaram voltam ao LLM
+        self.memo = criar_memo_padrao()
+        self.motores_com_falha = []
+        self.motores_eliminados = []
+        self.analises_reaproveitadas = 0
+        self.analises_recalculadas = 0
+        self.analises_evitadas = 0
+        self.tempo_triagem = 0.0
+        self.catalogo_preparado = None
+        self.prompt = None
+        # Só os K melhores pela pontuação seguem para a análise descritiva (0 = todos)
+        self.top_k = int(os.getenv('ANALISADOR_TOP_K') or 0)
+        # Motores analisados em paralelo e tempo máximo de cada um (0 = sem limite)
+        self.concorrencia = int(os.getenv('ANALISADOR_CONCORRENCIA') or 4)
+        self.timeout_motor = float(os.getenv('ANALISADOR_TIMEOUT_MOTOR') or 0)
+        # Vários motores por requisição: o lote cresce até o orçamento de tokens (prompt + resposta)
+        self.tokens_por_lote = int(os.getenv('ANALISADOR_TOKENS_POR_LOTE') or 10000)
+        self.max_motores_lote = int(os.getenv('ANALISADOR_MOTORES_POR_LOTE') or 8)  # 1 = um motor por requisição
+        self.tokens_resposta_motor = 1000
+        # Catálogos lidos em fluxo são filtrados e pontuados em blocos deste tamanho
+        self.bloco_catalogo = int(os.getenv('ANALISADOR_BLOCO_CATALOGO') or 5000)
+        # Catálogo aberto pelo snapshot colunar (mmap), recompilado quando o JSON muda
+        self.usar_snapshot = os.getenv('ANALISADOR_SNAPSHOT', '1') != '0'
+        # Custo de energia, TCO e payback calculados pelas curvas de rendimento (não pelo LLM)
+        self.energia = CalculadoraEnergia(cenario_padrao())
+        self.referencias_ie2 = PrecosReferenciaIE2()
+        self.motores_analisados = {}
         
     def carregar_requisitos(self, caminho_arquivo):
         """Carrega requisitos do projeto (aceita formato individual ou consolidado)"""
@@ -39,62 +102,282 @@ class AnalisadorMotores:
         return requisitos
     
     def carregar_catalogo(self, caminho_arquivo):
-        """Carrega catálogo de motores"""
+        """
+        Carrega catálogo de motores
+        Com o snapshot ligado, abre o snapshot colunar (já com índice e colunas
+        prontos) e retorna os produtos, lidos do JSON só quando usados.
+        """
+        if self.usar_snapshot:
+            snapshot = abrir_snapshot(caminho_arquivo)
+            self.catalogo_preparado = snapshot.preparado
+            self.prompt = None
+            return snapshot.produtos
+        
         with open(caminho_arquivo, 'r', encoding='utf-8') as f:
             catalogo = json.load(f)
         return catalogo['catalogo_motores']['produtos']
     
-    def analisar_motor(self, requisitos, motor):
+    def ler_catalogo(self, caminho_arquivo):
+        """Produtos do catálogo um a um, sem carregar o arquivo inteiro (para catálogos grandes)"""
+        return ler_produtos(caminho_arquivo)
+    
+    def analisar_motor(self, requisitos, motor, ao_campo=None, pontuacao=None, cancelar=None, saida=None):
         """
-        Analisa um motor específico usando LLM
-        Retorna score de adequação e análise detalhada
+        Analisa um motor específico
+        O score e a análise por critério vêm da rubrica (pontuacao.py); o LLM
+        escreve só a parte descritiva. Com streaming, ao_campo(campo, valor)
+        recebe cada campo da resposta assim que chega. `cancelar`
+        (threading.Event) interrompe a requisição; erros vão para `saida`.
         """
         
-        prompt = self._criar_prompt_analise(requisitos, motor)
+        if pontuacao is None:
+            pontuacao = CalculadoraPontuacao(requisitos).avaliar(motor)
+        
+        # O prompt é o mesmo de um lote com um motor: a resposta vem em "analises"
+        recebidos = {}
+        
+        def repassar(caminho, valor):
+            partes = caminho.split('.')
+            if len(partes) == 3 and partes[1] == '0':
+                recebidos[partes[2]] = valor
+                return ao_campo(partes[2], valor)
         
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt()
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
-                temperature=0.2,  # Baixa para maior consistência
-                max_tokens=3000,
-                response_format={"type": "json_object"}
+            lote = [(motor, pontuacao)]
+            resposta = self._gerar_narrativa(
+                self._prompt_analise(requisitos).montar(lote),
+                repassar if ao_campo is not None else None,
+                cancelar,
+                profundidade=3
             )
+            if 'analises' not in resposta and recebidos:
+                # ao_campo interrompeu a geração: fica com os campos recebidos
+                return self._montar_analise(motor, pontuacao, recebidos)
             
-            resposta_texto = response.choices[0].message.content.strip()
-            
-            # Limpa possível markdown
-            if '```json' in resposta_texto:
-                resposta_texto = resposta_texto.split('```json')[1].split('```')[0]
-            elif '```' in resposta_texto:
-                resposta_texto = resposta_texto.split('```')[1].split('```')[0]
+            entradas = self._distribuir_analises(lote, resposta.get('analises'))
+            if 0 not in entradas:
+                raise ValueError("resposta sem análise válida do motor")
+            return self._montar_analise(motor, pontuacao, entradas[0])
             
-            analise = json.loads(resposta_texto.strip())
-            
-            # Adiciona informações comerciais
-            analise['dados_comerciais'] = {
-                'preco_base_brl': motor['comercial']['preco_base_brl'],
-                'preco_com_impostos_brl': motor['comercial']['preco_com_impostos_brl'],
-                'prazo_entrega_dias': motor['comercial']['prazo_entrega_dias'],
-                'disponibilidade': motor['comercial']['disponibilidade'],
-                'garantia_meses': motor['comercial']['garantia_meses'],
-                'origem': motor['comercial']['origem_produto']
-            }
-            
-            return analise
+        except RequisicaoCancelada:
+            return None  # quem cancelou informa o motivo
             
         except Exception as e:
-            print(f"   ❌ Erro ao analisar {motor['codigo_produto']}: {e}")
+            print(f"   ❌ Erro ao analisar {motor['codigo_produto']}: {e}", file=saida)
+            return None
+    
+    def _montar_analise(self, motor, pontuacao, narrativa):
+        """Junta a pontuação calculada, a narrativa do LLM e os dados comerciais"""
+        analise = {
+            "codigo_produto": motor['codigo_produto'],
+            "fabricante": motor['fabricante'],
+            "score_adequacao": pontuacao['score_adequacao'],
+            "classificacao": pontuacao['classificacao'],
+            "parecer_tecnico": narrativa.get('parecer_tecnico'),
+            "analise_pontuacao": pontuacao['analise_pontuacao'],
+            "eliminado": pontuacao['eliminado'],
+            "criterios_eliminatorios": pontuacao['criterios_eliminatorios']
+        }
+        
+        # A pontuação calculada prevalece sobre o que o modelo devolver
+        for campo, valor in narrativa.items():
+            analise.setdefault(campo, valor)
+        
+        # Adiciona informações comerciais
+        analise['dados_comerciais'] = {
+            'preco_base_brl': motor['comercial']['preco_base_brl'],
+            'preco_com_impostos_brl': motor['comercial']['preco_com_impostos_brl'],
+            'prazo_entrega_dias': motor['comercial']['prazo_entrega_dias'],
+            'disponibilidade': motor['comercial']['disponibilidade'],
+            'garantia_meses': motor['comercial']['garantia_meses'],
+            'origem': motor['comercial']['origem_produto']
+        }
+        
+        return analise
+    
+    def _gerar_narrativa(self, prompt, ao_campo=None, cancelar=None, max_tokens=3000, timeout=None, profundidade=1):
+        """Pede ao LLM os campos descritivos da análise (em streaming, se ligado)"""
+        timeout = timeout or self.timeout_motor or None
+        if self.llm.streaming:
+            return self.llm.completar_json_stream(
+                self._get_system_prompt(),
+                prompt,
+                temperature=0.2,
+                max_tokens=max_tokens,
+                ao_campo=ao_campo,
+                profundidade=profundidade,
+                cancelar=cancelar,
+                timeout=timeout
+            )
+        
+        return self.llm.completar_json(
+            self._get_system_prompt(),
+            prompt,
+            temperature=0.2,  # Baixa para maior consistência
+            max_tokens=max_tokens,
+            cancelar=cancelar,
+            timeout=timeout
+        )
+    
+    def _analisar_lote(self, requisitos, lote, cancelar):
+        """
+        Analisa um lote de (motor, pontuacao) numa thread do pool, capturando o log
+        Com mais de um motor vai uma única requisição; as análises que faltarem
+        ou vierem malformadas na resposta são refeitas em requisições individuais.
+        O prazo (timeout_motor por motor do lote) conta a partir do início da
+        análise, não do tempo em que o lote esperou na fila.
+        Cada requisição individual tem o seu prazo: um motor que esgota o tempo
+        não leva junto os seguintes do lote.
+        Retorna [(analise, log, tempo_esgotado)] na ordem do lote.
+        """
+        saidas = [io.StringIO() for _ in lote]
+        if cancelar.is_set():
+            return [(None, "", False) for _ in lote]
+        
+        entradas = {}
+        if len(lote) > 1:
+            prazo, temporizador = self._armar_prazo(cancelar, len(lote))
+            try:
+                resposta = self._gerar_narrativa(
+                    self._prompt_analise(requisitos).montar(lote),
+                    cancelar=prazo,
+                    max_tokens=min(self.tokens_resposta_motor * len(lote) + 500, 16384),
+                    timeout=self.timeout_motor * len(lote)
+                )
+                entradas = self._distribuir_analises(lote, resposta.get('analises'))
+            except RequisicaoCancelada:
+                return [(None, "", prazo.vencido.is_set()) for _ in lote]
+            except Exception as e:
+                for saida in saidas:
+                    print(f"   ⚠️  Requisição do lote falhou: {e}", file=saida)
+            finally:
+                if temporizador is not None:
+                    temporizador.cancel()
+        
+        resultados = []
+        for j, ((motor, pontuacao), saida) in enumerate(zip(lote, saidas)):
+            narrativa = entradas.get(j)
+            esgotado = False
+            if narrativa is not None:
+                analise = self._montar_analise(motor, pontuacao, narrativa)
+            else:
+                if len(lote) > 1:
+                    print("   ↩️  Sem análise válida no lote para este motor: requisição individual", file=saida)
+                prazo, temporizador = self._armar_prazo(cancelar, 1)
+                try:
+                    analise = self.analisar_motor(requisitos, motor, pontuacao=pontuacao, cancelar=prazo, saida=saida)
+                finally:
+                    if temporizador is not None:
+                        temporizador.cancel()
+                esgotado = analise is None and prazo.vencido.is_set()
+            resultados.append((analise, saida.getvalue(), esgotado))
+        
+        return resultados
+    
+    def _armar_prazo(self, cancelar, motores):
+        """
+        PrazoAnalise ligado a `cancelar` que vence em timeout_motor segundos por motor
+        Retorna (prazo, temporizador); temporizador é None se não há limite.
+        """
+        prazo = PrazoAnalise(cancelar)
+        if not self.timeout_motor:
+            return prazo, None
+        temporizador = threading.Timer(self.timeout_motor * motores, prazo.vencido.set)
+        temporizador.daemon = True
+        temporizador.start()
+        return prazo, temporizador
+    
+    def _montar_lotes(self, requisitos, itens):
+        """
+        Agrupa (motor, pontuacao), na ordem do ranking, em lotes de uma requisição
+        Cada lote cresce enquanto cabeçalho + motores + respostas estimadas
+        couberem em tokens_por_lote, até max_motores_lote motores.
+        """
+        if self.max_motores_lote <= 1:
+            return [[item] for item in itens]
+        
+        prompt = self._prompt_analise(requisitos)
+        cabecalho = estimar_tokens(self._get_system_prompt()) + estimar_tokens(prompt.prefixo)
+        lotes = []
+        lote = []
+        tokens = cabecalho
+        
+        for item in itens:
+            custo = estimar_tokens(prompt.bloco_motor(*item)) + self.tokens_resposta_motor
+            if lote and (tokens + custo > self.tokens_por_lote or len(lote) >= self.max_motores_lote):
+                lotes.append(lote)
+                lote = []
+                tokens = cabecalho
+            lote.append(item)
+            tokens += custo
+        
+        if lote:
+            lotes.append(lote)
+        return lotes
+    
+    def _distribuir_analises(self, lote, analises):
+        """
+        Associa cada análise da resposta ao seu motor pelo codigo_produto
+        Retorna {indice_no_lote: narrativa} só com as análises válidas.
+        """
+        if not isinstance(analises, list):
+            return {}
+        
+        por_codigo = {}
+        for entrada in analises:
+            if isinstance(entrada, dict):
+                por_codigo.setdefault(entrada.get('codigo_produto'), []).append(entrada)
+        
+        entradas = {}
+        for j, (motor, _) in enumerate(lote):
+            candidatas = por_codigo.get(motor['codigo_produto'])
+            if candidatas:
+                entrada = candidatas.pop(0)
+                if self._narrativa_valida(entrada):
+                    entradas[j] = entrada
+        return entradas
+    
+    def _narrativa_valida(self, narrativa):
+        """Confere a estrutura mínima de uma análise descritiva"""
+        return (
+            isinstance(narrativa.get('parecer_tecnico'), str)
+            and bool(narrativa['parecer_tecnico'].strip())
+            and isinstance(narrativa.get('recomendacao_engenharia'), str)
+            and all(isinstance(narrativa.get(campo, []), list) for campo in ('vantagens', 'desvantagens', 'riscos_tecnicos'))
+        )
+    
+    def _analise_memorizada(self, chave):
+        """Análise guardada numa execução anterior (ou None)"""
+        if self.memo is None:
             return None
+        texto = self.memo.obter(chave)
+        return json.loads(texto) if texto is not None else None
+    
+    def _resumo_motor(self, motor):
+        """Resumo do registro do motor para a memória (reaproveita o do CatalogoPreparado)"""
+        if self.catalogo_preparado is not None:
+            return self.catalogo_preparado.resumo(motor)
+        return resumo(motor)
+    
+    def _prompt_analise(self, requisitos):
+        """PromptAnalise do projeto, montado uma vez por conjunto de requisitos"""
+        if self.prompt is None or self.prompt.requisitos is not requisitos:
+            if self.catalogo_preparado is not None:
+                self.prompt = PromptAnalise(requisitos, codificar=self.catalogo_preparado.projecao)
+            else:
+                self.prompt = PromptAnalise(requisitos)
+        return self.prompt
+    
+    def preparar_catalogo(self, catalogo):
+        """
+        CatalogoPreparado (índice, colunas, projeções) do catálogo, montado uma vez
+        Chamadas seguintes com a mesma lista de produtos reaproveitam o anterior;
+        um catálogo alterado deve ser recarregado (nova lista), não editado no lugar.
+        """
+        if self.catalogo_preparado is None or self.catalogo_preparado.produtos is not catalogo:
+            self.catalogo_preparado = CatalogoPreparado(catalogo)
+            self.prompt = None
+        return self.catalogo_preparado
     
     def _get_system_prompt(self):
         """Retorna o system prompt com persona de engenheiro"""
@@ -115,303 +398,300 @@ Suas análises são:
 
 Você sempre retorna JSON válido e estruturado."""
     
-    def _criar_prompt_analise(self, requisitos, motor):
-        """Cria o prompt de análise detalhado"""
-        
-        return f"""
-TAREFA: Analisar adequação técnica do motor para a aplicação especificada.
-
-═══════════════════════════════════════════════════════════════════════════
-REQUISITOS DO PROJETO
-═══════════════════════════════════════════════════════════════════════════
-
-PROJETO: {requisitos.get('projeto_info', {}).get('nome', 'N/A')}
-APLICAÇÃO: {requisitos['requisitos']['aplicacao'].get('modelo_bomba', 'N/A')}
-- Bomba: {requisitos['requisitos']['aplicacao'].get('fabricante_bomba', 'N/A')} {requisitos['requisitos']['aplicacao'].get('modelo_bomba', 'N/A')}
-- Vazão: {requisitos['requisitos']['aplicacao'].get('vazao_m3h', 'N/A')} m³/h
-- AMT: {requisitos['requisitos']['aplicacao'].get('altura_manometrica_m', 'N/A')} m
-- Regime: {requisitos['requisitos']['aplicacao'].get('regime_operacao', 'N/A')}
-
-REQUISITOS CRÍTICOS (NÃO NEGOCIÁVEIS):
-- Potência: {requisitos['requisitos']['eletricos'].get('potencia_kw', 'N/A')} kW (exata)
-- Tensão: {requisitos['requisitos']['eletricos'].get('tensao_v', 'N/A')}V ±10%
-- Grau Proteção: {requisitos['requisitos']['operacionais'].get('grau_protecao', 'N/A')} (mínimo)
-- Eficiência: {requisitos['requisitos']['eletricos'].get('eficiencia_minima', 'N/A')} (mínimo), {requisitos['requisitos']['eletricos'].get('eficiencia_desejada', 'N/A')} (desejado)
-
-REQUISITOS IMPORTANTES:
-- Rotação: {requisitos['requisitos']['mecanicos'].get('rotacao_rpm', 'N/A')} rpm (±{requisitos['requisitos']['mecanicos'].get('rotacao_tolerancia_percentual', 2.0)}%)
-- Corrente máxima: {requisitos['requisitos']['eletricos'].get('corrente_nominal_a', 'N/A')} A @ 380V
-- Montagem: {requisitos['requisitos']['mecanicos'].get('tipo_montagem', 'N/A')}
-- Altura eixo: {requisitos['requisitos']['mecanicos'].get('altura_eixo_mm', 'N/A')} mm
-- Preparado inversor: {'Obrigatório' if requisitos['requisitos']['eletricos'].get('preparado_inversor', False) else 'Não necessário'}
-
-REQUISITOS COMERCIAIS:
-- Prazo máximo: {requisitos['requisitos']['comercial'].get('prazo_entrega_maximo_dias', 'N/A')} dias
-- Garantia mínima: {requisitos['requisitos']['comercial'].get('garantia_minima_meses', 'N/A')} meses
-- Orçamento: até R$ {requisitos['requisitos']['comercial'].get('orcamento_disponivel_brl', 'N/A')}
-
-═══════════════════════════════════════════════════════════════════════════
-MOTOR EM ANÁLISE
-═══════════════════════════════════════════════════════════════════════════
-
-{json.dumps(motor, indent=2, ensure_ascii=False)}
-
-═══════════════════════════════════════════════════════════════════════════
-SISTEMA DE PONTUAÇÃO
-═══════════════════════════════════════════════════════════════════════════
-
-TOTAL: 100 pontos
-
-1. POTÊNCIA (20 pontos) - CRÍTICO
-   - Exata (15.0 kW): +20 pontos
-   - ±5% (14.25-15.75 kW): +15 pontos
-   - ±10% (13.5-16.5 kW): +10 pontos
-   - Fora: 0 pontos (ELIMINATÓRIO)
-
-2. TENSÃO (15 pontos) - CRÍTICO
-   - 380V disponível: +15 pontos
-   - Apenas 440V: 0 pontos (ELIMINATÓRIO)
-
-3. EFICIÊNCIA (15 pontos)
-   - IE4: +15 pontos (EXCELENTE)
-   - IE3: +15 pontos (ATENDE)
-   - IE2: +10 pontos (ACEITÁVEL, perdas maiores)
-   - IE1: +5 pontos (RUIM, custo operacional alto)
-
-4. GRAU DE PROTEÇÃO (10 pontos)
-   - IP55 ou superior: +10 pontos
-   - IP54: +5 pontos (INADEQUADO - ambiente úmido)
-   - Inferior: 0 pontos (ELIMINATÓRIO)
-
-5. ROTAÇÃO (10 pontos)
-   - 1750 rpm ±1% (1733-1767 rpm): +10 pontos
-   - 1750 rpm ±2% (1715-1785 rpm): +8 pontos
-   - 1750 rpm ±3% (1697-1803 rpm): +5 pontos
-   - Fora ±3%: +2 pontos
-
-6. PREPARADO INVERSOR (10 pontos)
-   - Sim: +10 pontos
-   - Não: +5 pontos (limitação futura)
-
-7. PRAZO ENTREGA (10 pontos)
-   - ≤15 dias: +10 pontos (EXCELENTE)
-   - 16-30 dias: +8 pontos (ATENDE)
-   - 31-45 dias: +5 pontos (ACEITÁVEL)
-   - 46-60 dias: +3 pontos (CRÍTICO)
-   - >60 dias: +1 ponto (INADEQUADO)
-
-8. DISPONIBILIDADE (5 pontos)
-   - Estoque: +5 pontos
-   - Nacional (pronta entrega): +4 pontos
-   - Importação: +2 pontos
-
-9. GARANTIA (5 pontos)
-   - ≥24 meses: +5 pontos
-   - 18-23 meses: +4 pontos
-   - 12-17 meses: +3 pontos
-   - <12 meses: +1 ponto
-
-═══════════════════════════════════════════════════════════════════════════
-INSTRUÇÕES DE ANÁLISE
-═══════════════════════════════════════════════════════════════════════════
-
-1. CALCULE o score exato somando os pontos de cada critério
-2. SEJA RIGOROSO com requisitos críticos (Potência, Tensão, Grau Proteção)
-3. CONSIDERE trade-offs reais:
-   - IE4 é melhor que IE3, mas pode ter prazo maior
-   - Importação tem qualidade superior, mas prazo longo
-   - Garantia maior reduz TCO
-4. JUSTIFIQUE tecnicamente cada decisão
-5. IDENTIFIQUE riscos operacionais
-6. COMPARE com especificações da bomba KSB Megabloc
-
-═══════════════════════════════════════════════════════════════════════════
-FORMATO DE SAÍDA (JSON)
-═══════════════════════════════════════════════════════════════════════════
-
-{{
-  "codigo_produto": "...",
-  "fabricante": "...",
-  "score_adequacao": 87.5,
-  "classificacao": "RECOMENDADO",
-  "parecer_tecnico": "Resumo executivo em 2-3 linhas",
-  
-  "analise_pontuacao": {{
-    "potencia": {{
-      "pontos_obtidos": 20,
-      "pontos_maximos": 20,
-      "valor_especificado": 15.0,
-      "valor_motor": 15.0,
-      "atende": true,
-      "observacao": "Potência exata conforme especificação"
-    }},
-    "tensao": {{
-      "pontos_obtidos": 15,
-      "pontos_maximos": 15,
-      "valor_especificado": 380,
-      "valor_motor": [380, 440],
-      "atende": true,
-      "observacao": "Tensão 380V disponível em configuração delta"
-    }},
-    "eficiencia": {{
-      "pontos_obtidos": 15,
-      "pontos_maximos": 15,
-      "valor_especificado": "IE3",
-      "valor_motor": "IE3",
-      "atende": true,
-      "observacao": "Eficiência IE3 conforme desejado. Economia operacional significativa."
-    }},
-    "grau_protecao": {{
-      "pontos_obtidos": 10,
-      "pontos_maximos": 10,
-      "valor_especificado": "IP55",
-      "valor_motor": "IP55",
-      "atende": true,
-      "observacao": "IP55 adequado para ambiente úmido com respingos"
-    }},
-    "rotacao": {{
-      "pontos_obtidos": 8,
-      "pontos_maximos": 10,
-      "valor_especificado": 1750,
-      "valor_motor": 1780,
-      "variacao_percentual": 1.7,
-      "atende": true,
-      "observacao": "1780 rpm representa variação de 1.7%, dentro da tolerância de ±2%"
-    }},
-    "preparado_inversor": {{
-      "pontos_obtidos": 10,
-      "pontos_maximos": 10,
-      "valor_especificado": true,
-      "valor_motor": true,
-      "atende": true,
-      "observacao": "Isolamento reforçado IEC 60034-17 para operação com VFD"
-    }},
-    "prazo_entrega": {{
-      "pontos_obtidos": 3,
-      "pontos_maximos": 10,
-      "valor_especificado": 30,
-      "valor_motor": 60,
-      "atende": false,
-      "observacao": "Prazo de 60 dias excede o máximo de 30 dias. Requer importação."
-    }},
-    "disponibilidade": {{
-      "pontos_obtidos": 2,
-      "pontos_maximos": 5,
-      "valor_especificado": "estoque",
-      "valor_motor": "importacao",
-      "atende": false,
-      "observacao": "Produto importado, sem estoque local"
-    }},
-    "garantia": {{
-      "pontos_obtidos": 5,
-      "pontos_maximos": 5,
-      "valor_especificado": 18,
-      "valor_motor": 24,
-      "atende": true,
-      "observacao": "24 meses de garantia supera o mínimo de 18 meses"
-    }}
-  }},
-  
-  "vantagens": [
-    "Eficiência IE3 proporciona economia de energia",
-    "Garantia estendida de 24 meses",
-    "Preparado para operação com inversor de frequência"
-  ],
-  
-  "desvantagens": [
-    "Prazo de entrega de 60 dias excede especificação (30 dias)",
-    "Produto importado, sem estoque local",
-    "Preço acima do orçamento disponível"
-  ],
-  
-  "riscos_tecnicos": [
-    "Prazo longo pode impactar cronograma do projeto",
-    "Dependência de importação para peças de reposição"
-  ],
-  
-  "recomendacao_engenharia": "ALTERNATIVA | RECOMENDADO | CONDICIONAL | NÃO RECOMENDADO",
-  "justificativa_recomendacao": "Explicação técnica da recomendação",
-  
-  "adequacao_aplicacao": {{
-    "bomba_centrifuga": "alta | média | baixa",
-    "regime_continuo": "alta | média | baixa",
-    "ambiente_umido": "alta | média | baixa"
-  }},
-  
-  "analise_custo_beneficio": {{
-    "custo_aquisicao_brl": 10500.00,
-    "custo_energia_anual_estimado_brl": 8500.00,
-    "economia_vs_ie1_anual_brl": 2400.00,
-    "payback_vs_ie2_anos": 1.2,
-    "tco_5anos_brl": 53000.00
-  }}
-}}
-
-═══════════════════════════════════════════════════════════════════════════
-CLASSIFICAÇÃO FINAL
-═══════════════════════════════════════════════════════════════════════════
-
-- 90-100 pontos: RECOMENDADO (Atende plenamente)
-- 75-89 pontos: ALTERNATIVA (Atende com ressalvas)
-- 60-74 pontos: CONDICIONAL (Requer aprovação de desvios)
-- <60 pontos: NÃO RECOMENDADO (Inadequado)
-
-IMPORTANTE: Seja objetivo, técnico e baseado em fatos. Evite subjetividade.
-"""
-    
-    def processar_catalogo(self, requisitos, catalogo):
-        """Processa todo o catálogo e gera ranking"""
+    def processar_catalogo(self, requisitos, catalogo, saida=None):
+        """
+        Processa todo o catálogo e gera ranking
+        O progresso vai para `saida` (padrão: console)
+        """
         
-        print(f"\n{'='*80}")
-        print(f"🔧 ANÁLISE DE ADEQUAÇÃO DE MOTORES ELÉTRICOS")
-        print(f"{'='*80}")
+        print(f"\n{'='*80}", file=saida)
+        print(f"🔧 ANÁLISE DE ADEQUAÇÃO DE MOTORES ELÉTRICOS", file=saida)
+        print(f"{'='*80}", file=saida)
         
         # Mostra documentos origem
         docs_origem = requisitos.get('documentos_origem', requisitos.get('documento_origem', ['N/A']))
         if isinstance(docs_origem, str):
             docs_origem = [docs_origem]
         
-        print(f"\n📋 Documentos Fonte: {len(docs_origem)}")
+        print(f"\n📋 Documentos Fonte: {len(docs_origem)}", file=saida)
         for doc in docs_origem:
-            print(f"   • {doc}")
+            print(f"   • {doc}", file=saida)
         
-        print(f"\n🏭 Cliente: {requisitos.get('projeto_info', {}).get('cliente', 'N/A')}")
-        print(f"📅 Data Extração: {requisitos.get('data_extracao', 'N/A')[:10]}")
-        print(f"\n💡 Aplicação: {requisitos['requisitos']['aplicacao'].get('modelo_bomba', 'N/A')}")
-        print(f"   Bomba: {requisitos['requisitos']['aplicacao'].get('fabricante_bomba', 'N/A')} {requisitos['requisitos']['aplicacao'].get('modelo_bomba', 'N/A')}")
-        print(f"   Vazão: {requisitos['requisitos']['aplicacao'].get('vazao_m3h', 'N/A')} m³/h")
-        print(f"   AMT: {requisitos['requisitos']['aplicacao'].get('altura_manometrica_m', 'N/A')} m")
+        print(f"\n🏭 Cliente: {requisitos.get('projeto_info', {}).get('cliente', 'N/A')}", file=saida)
+        print(f"📅 Data Extração: {requisitos.get('data_extracao', 'N/A')[:10]}", file=saida)
+        print(f"\n💡 Aplicação: {requisitos['requisitos']['aplicacao'].get('modelo_bomba', 'N/A')}", file=saida)
+        print(f"   Bomba: {requisitos['requisitos']['aplicacao'].get('fabricante_bomba', 'N/A')} {requisitos['requisitos']['aplicacao'].get('modelo_bomba', 'N/A')}", file=saida)
+        print(f"   Vazão: {requisitos['requisitos']['aplicacao'].get('vazao_m3h', 'N/A')} m³/h", file=saida)
+        print(f"   AMT: {requisitos['requisitos']['aplicacao'].get('altura_manometrica_m', 'N/A')} m", file=saida)
         
-        print(f"\n{'='*80}")
-        print(f"📦 Catálogo: {len(catalogo)} motores disponíveis para análise")
-        print(f"{'='*80}\n")
+        em_fluxo = not isinstance(catalogo, Sequence)
+        print(f"\n{'='*80}", file=saida)
+        if em_fluxo:
+            print(f"📦 Catálogo: lido em fluxo, em blocos de {self.bloco_catalogo} motores", file=saida)
+        else:
+            print(f"📦 Catálogo: {len(catalogo)} motores disponíveis para análise", file=saida)
+        print(f"{'='*80}\n", file=saida)
         
         resultados = []
+        self.motores_com_falha = []
+        self.motores_analisados = {}
+        self.analises_reaproveitadas = 0
+        self.analises_recalculadas = 0
+        calculadora = CalculadoraPontuacao(requisitos)
         
-        for i, motor in enumerate(catalogo, 1):
-            codigo = motor['codigo_produto']
-            fabricante = motor['fabricante']
+        if em_fluxo:
+            candidatos, interrompido = self._triar_em_fluxo(requisitos, calculadora, catalogo, resultados, saida)
+            if interrompido:
+                candidatos = []
+        else:
+            # Restrições rígidas pelo índice: eliminados não são pontuados nem vão ao LLM
+            preparado = self.preparar_catalogo(catalogo)
+            inicio_triagem = time.perf_counter()
+            inicio = inicio_triagem
+            filtro = preparado.indice.filtrar(requisitos)
+            tempo_filtro = (time.perf_counter() - inicio) * 1000
+            self.motores_eliminados = filtro.relatorio_eliminados()
             
-            print(f"[{i}/{len(catalogo)}] Analisando: {codigo} ({fabricante})... ", end='', flush=True)
+            print(f"🔎 {len(filtro.viaveis)} de {len(catalogo)} motores atendem os requisitos críticos (índice: {tempo_filtro:.2f} ms)", file=saida)
+            for eliminado in self.motores_eliminados:
+                print(f"   🚫 {eliminado['codigo_produto']}: {'; '.join(eliminado['motivos'])}", file=saida)
             
-            analise = self.analisar_motor(requisitos, motor)
-            
-            if analise:
-                resultados.append(analise)
-                score = analise['score_adequacao']
-                classificacao = analise['classificacao']
-                print(f"✅ Score: {score:.1f}% ({classificacao})")
+            # Pontuação pela rubrica: vetorizada sobre os viáveis, antes de qualquer chamada ao LLM
+            inicio = time.perf_counter()
+            viaveis = filtro.viaveis
+            ordem, _ = self._ordenar_viaveis(calculadora, preparado.colunas.selecionar(viaveis))
+            # Referência do payback: IE2 mais barato do catálogo inteiro, não só dos viáveis
+            self.referencias_ie2 = preparado.referencias_ie2
+            if hasattr(catalogo, 'selecionar'):
+                # Registros do snapshot: decodificados só quando a onda de análise chega a eles
+                candidatos = catalogo.selecionar(viaveis[ordem])
             else:
-                print(f"❌ Falha")
+                candidatos = [catalogo[indice] for indice in viaveis[ordem].tolist()]
+            self.tempo_triagem = time.perf_counter() - inicio_triagem
+            print(f"🧮 Pontuação calculada para {len(viaveis)} motores em {(time.perf_counter() - inicio) * 1000:.1f} ms", file=saida)
+        
+        if self.top_k and self.top_k < len(candidatos):
+            print(f"🎯 Top-{self.top_k}: só os {self.top_k} melhores pela pontuação vão ao LLM", file=saida)
+        print(file=saida)
+        
+        if self.concorrencia > 1 and candidatos:
+            print(f"⚡ Até {self.concorrencia} motores analisados em paralelo", file=saida)
+        
+        # Top-K pela rubrica: o LLM não altera o score, então os K primeiros da ordem de pontuação
+        # já são os K melhores. Motor cuja análise falha abre vaga para o seguinte.
+        k = self.top_k or len(candidatos)
+        proximo = 0
+        analisados = 0
+        while proximo < len(candidatos) and analisados < k:
+            onda = candidatos[proximo:proximo + k - analisados]
+            novos, interrompido = self._analisar_em_ordem(requisitos, calculadora, onda, proximo, len(candidatos), saida)
+            proximo += len(onda)
+            analisados += len(novos)
+            resultados.extend(novos)
+            if interrompido:
+                break
         
-        # Ordena por score
-        resultados.sort(key=lambda x: x['score_adequacao'], reverse=True)
+        self.analises_evitadas = len(candidatos) - proximo
+        if self.top_k and candidatos:
+            print(
+                f"\n🎯 Top-{self.top_k} confirmado com {proximo} de {len(candidatos)} motores analisados "
+                f"({self.analises_evitadas} análises pelo LLM evitadas)",
+                file=saida
+            )
+        
+        # Motor sem análise não pode sumir do ranking em silêncio
+        if self.motores_com_falha:
+            print(f"\n⚠️  {len(self.motores_com_falha)} motores não puderam ser analisados: {', '.join(self.motores_com_falha)}", file=saida)
+        
+        # Ordena por score (eliminados sempre depois dos que atendem os requisitos críticos)
+        resultados.sort(key=lambda x: (not x.get('eliminado', False), x['score_adequacao']), reverse=True)
         
         return resultados
     
+    def _ordenar_viaveis(self, calculadora, colunas):
+        """
+        Pontua os motores viáveis (colunas) pela rubrica, de uma vez
+        Retorna (ordem, chaves): posições em ordem decrescente de score e a chave de ranking de cada uma
+        """
+        notas = calculadora.pontuar_colunas(colunas)
+        chaves = chave_ranking(notas['score_adequacao'], notas['eliminado'])
+        ordem = selecionar_top_k(notas['score_adequacao'], notas['eliminado'])
+        return ordem, chaves[ordem].tolist()
+    
+    def _triar_em_fluxo(self, requisitos, calculadora, produtos, resultados, saida=None):
+        """
+        Filtro e pontuação bloco a bloco de um catálogo lido em fluxo (ver leitor_catalogo)
+        Só os motores viáveis ficam em memória; o bloco seguinte é lido enquanto o atual
+        é triado e analisado. Sem top-K, cada bloco vai para a análise assim que é
+        triado (os resultados entram em `resultados`) e não sobram candidatos. Com
+        top-K, retorna os viáveis de todos os blocos em ordem decrescente de score
+        (os que passam de K cobrem análises que falharem).
+        Retorna (candidatos, interrompido).
+        """
+        # Projeções e resumos são calculados motor a motor, sem CatalogoPreparado
+        self.catalogo_preparado = None
+        self.prompt = None
+        self.motores_eliminados = []
+        self.tempo_triagem = 0.0
+        self.referencias_ie2 = PrecosReferenciaIE2()
+        candidatos = []
+        chaves_candidatos = []
+        lidos = 0
+        viaveis_total = 0
+        if not self.top_k and self.concorrencia > 1:
+            print(f"⚡ Até {self.concorrencia} motores analisados em paralelo, bloco a bloco", file=saida)
+        
+        blocos = antecipar(em_blocos(produtos, self.bloco_catalogo))
+        try:
+            for numero, bloco in enumerate(blocos, 1):
+                inicio = time.perf_counter()
+                indice_bloco = IndiceCatalogo(bloco)
+                filtro = indice_bloco.filtrar(requisitos)
+                viaveis = [bloco[indice] for indice in filtro.viaveis.tolist()]
+                ordem, chaves = self._ordenar_viaveis(calculadora, CatalogoColunar(viaveis))
+                # Referência do payback: os IE2 do bloco, viáveis ou não
+                ie2 = indice_bloco.por_ie.get(2)
+                if ie2 is not None:
+                    self.referencias_ie2.acrescentar(CatalogoColunar([bloco[indice] for indice in ie2.nonzero()[0].tolist()]))
+                viaveis = [viaveis[indice] for indice in ordem.tolist()]
+                eliminados = filtro.relatorio_eliminados()
+                self.tempo_triagem += time.perf_counter() - inicio
+                
+                lidos += len(bloco)
+                viaveis_total += len(viaveis)
+                self.motores_eliminados.extend(eliminados)
+                print(
+                    f"🔎 Bloco {numero}: {len(viaveis)} de {len(bloco)} motores atendem os requisitos críticos "
+                    f"(índice + pontuação: {(time.perf_counter() - inicio) * 1000:.1f} ms)",
+                    file=saida
+                )
+                for eliminado in eliminados:
+                    print(f"   🚫 {eliminado['codigo_produto']}: {'; '.join(eliminado['motivos'])}", file=saida)
+                
+                if self.top_k:
+                    candidatos.extend(viaveis)
+                    chaves_candidatos.extend(chaves)
+                    continue
+                
+                novos, interrompido = self._analisar_em_ordem(
+                    requisitos, calculadora, viaveis, len(resultados) + len(self.motores_com_falha), None, saida
+                )
+                resultados.extend(novos)
+                if interrompido:
+                    return [], True
+        except KeyboardInterrupt:
+            print(f"\n⛔ Leitura do catálogo cancelada após {lidos} motores", file=saida)
+            return [], True
+        finally:
+            blocos.close()
+        
+        print(f"🔎 {viaveis_total} de {lidos} motores atendem os requisitos críticos", file=saida)
+        
+        # Mesma ordem de selecionar_top_k: score decrescente, empates na ordem do catálogo
+        ordem = sorted(range(len(candidatos)), key=lambda i: -chaves_candidatos[i])
+        return [candidatos[i] for i in ordem], False
+    
+    def _analisar_em_ordem(self, requisitos, calculadora, motores, inicio, total, saida=None):
+        """
+        Analisa os motores (memória, lotes e pool de threads), imprimindo o progresso na ordem dada
+        `total` pode ser None quando ainda não se sabe quantos motores serão analisados.
+        Retorna (resultados, interrompido); motores sem análise vão para motores_com_falha.
+        """
+        
+        # Detalhamento por critério (observações) só para quem vai ao relatório
+        itens = [(motor, calculadora.avaliar(motor)) for motor in motores]
+        for motor in motores:
+            self.motores_analisados[motor['codigo_produto']] = motor
+        
+        # Mesma chave (requisitos, motor, versões da rubrica e do prompt, modelo) que numa execução anterior: reaproveita
+        projeto = resumo_requisitos(requisitos)
+        chaves = [chave_analise(projeto, self._resumo_motor(motor), self.model) for motor in motores]
+        memorizadas = [self._analise_memorizada(chave) for chave in chaves]
+        posicoes = [i for i, analise in enumerate(memorizadas) if analise is None]
+        self.analises_reaproveitadas += len(motores) - len(posicoes)
+        if self.memo is not None and motores:
+            print(f"♻️  {len(motores) - len(posicoes)} análises reaproveitadas, {len(posicoes)} a recalcular", file=saida)
+        
+        lotes = self._montar_lotes(requisitos, [itens[i] for i in posicoes])
+        if len(lotes) < len(posicoes):
+            print(f"📦 {len(posicoes)} motores em {len(lotes)} requisições (até {self.max_motores_lote} por lote)", file=saida)
+        if posicoes:
+            prompt = self._prompt_analise(requisitos)
+            compacto = sum(estimar_tokens(prompt.bloco_motor(*itens[i])) for i in posicoes) // len(posicoes)
+            completo = sum(estimar_tokens(json.dumps(itens[i][0], indent=2, ensure_ascii=False)) for i in posicoes) // len(posicoes)
+            print(f"✂️  Prompt: prefixo fixo de {estimar_tokens(prompt.prefixo)} tokens + ~{compacto} tokens por motor (registro completo: ~{completo})", file=saida)
+        
+        # Para cada motor a recalcular: (futuro do lote, índice dentro do lote)
+        executor = ThreadPoolExecutor(max_workers=max(self.concorrencia, 1))
+        cancelamentos = []
+        tarefas = [None] * len(motores)
+        restantes = iter(posicoes)
+        for lote in lotes:
+            cancelar = threading.Event()
+            futuro = executor.submit(self._analisar_lote, requisitos, lote, cancelar)
+            cancelamentos.append(cancelar)
+            for j in range(len(lote)):
+                tarefas[next(restantes)] = (futuro, j)
+        
+        # O progresso sai na ordem do ranking, mesmo com os lotes terminando fora de ordem
+        resultados = []
+        i = 0
+        try:
+            for i, motor in enumerate(motores, 1):
+                codigo = motor['codigo_produto']
+                fabricante = motor['fabricante']
+                
+                posicao = f"{inicio + i}/{total}" if total else f"{inicio + i}"
+                print(f"[{posicao}] Analisando: {codigo} ({fabricante})... ", end='', flush=True, file=saida)
+                
+                if memorizadas[i - 1] is not None:
+                    analise = memorizadas[i - 1]
+                    resultados.append(analise)
+                    print(f"♻️  Score: {analise['score_adequacao']:.1f}% ({analise['classificacao']}) - análise reaproveitada", file=saida)
+                    continue
+                
+                futuro, j = tarefas[i - 1]
+                analise, log, esgotado = futuro.result()[j]
+                
+                if analise:
+                    resultados.append(analise)
+                    self.analises_recalculadas += 1
+                    if self.memo is not None:
+                        self.memo.gravar(chaves[i - 1], json.dumps(analise, ensure_ascii=False))
+                    print(f"✅ Score: {analise['score_adequacao']:.1f}% ({analise['classificacao']})", file=saida)
+                elif esgotado:
+                    print(f"⏱️  Tempo esgotado ({self.timeout_motor:g}s por motor)", file=saida)
+                    self.motores_com_falha.append(codigo)
+                else:
+                    print(f"❌ Falha", file=saida)
+                    self.motores_com_falha.append(codigo)
+                print(log, end='', file=saida)
+        except KeyboardInterrupt:
+            # Cancela o que está em andamento (o streaming para no pedaço seguinte) e o que nem começou
+            for cancelar in cancelamentos:
+                cancelar.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            pendentes = []
+            for motor, analise in zip(motores[max(i - 1, 0):], memorizadas[max(i - 1, 0):]):
+                if analise is not None:
+                    resultados.append(analise)
+                else:
+                    pendentes.append(motor['codigo_produto'])
+            self.motores_com_falha.extend(pendentes)
+            print(f"\n⛔ Análise cancelada: {len(pendentes)} motores ficaram sem análise", file=saida)
+            return resultados, True
+        
+        executor.shutdown()
+        return resultados, False
+        
+    
     def gerar_relatorio(self, requisitos, resultados):
         """Gera relatório final consolidado"""
         
+        # Custo-benefício calculado no cenário atual (tarifa, horizonte, perfil de carga), nunca memorizado
+        for resultado, custo in zip(resultados, self.custos_energia(resultados)):
+            resultado['analise_custo_beneficio'] = custo
+        
         # Normaliza documentos origem
         docs_origem = requisitos.get('documentos_origem', requisitos.get('documento_origem', ['N/A']))
         if isinstance(docs_origem, str):
@@ -426,6 +706,12 @@ IMPORTANTE: Seja objetivo, técnico e baseado em fatos. Evite subjetividade.
                 "total_documentos_analisados": len(docs_origem),
                 "data_analise": datetime.now().isoformat(),
                 "total_motores_analisados": len(resultados),
+                "motores_nao_analisados": list(self.motores_com_falha),
+                "motores_eliminados": list(self.motores_eliminados),
+                "analises_reaproveitadas": self.analises_reaproveitadas,
+                "analises_recalculadas": self.analises_recalculadas,
+                "analises_evitadas": self.analises_evitadas,
+                "cenario_energia": self.energia.cenario.resumo(),
                 "ferramenta": "Analisador Motores Elétricos v1.0",
                 "llm_modelo": self.model
             },
@@ -433,9 +719,9 @@ IMPORTANTE: Seja objetivo, técnico e baseado em fatos. Evite subjetividade.
                 "recomendacao_principal": resultados[0]['codigo_produto'] if resultados else None,
                 "score_recomendacao": resultados[0]['score_adequacao'] if resultados else 0,
                 "alternativas_viaveis": [
-                    r['codigo_produto'] for r in resultados[1:4] if r['score_adequacao'] >= 75
+                    r['codigo_produto'] for r in resultados[1:4] if r['score_adequacao'] >= 75 and not r.get('eliminado')
                 ],
-                "motores_inadequados": len([r for r in resultados if r['score_adequacao'] < 60])
+                "motores_inadequados": len([r for r in resultados if r['score_adequacao'] < 60 or r.get('eliminado')]) + len(self.motores_eliminados)
             },
             "requisitos_projeto": requisitos,
             "analises_detalhadas": resultados,
@@ -455,6 +741,13 @@ IMPORTANTE: Seja objetivo, técnico e baseado em fatos. Evite subjetividade.
         
         return relatorio
     
+    def custos_energia(self, resultados):
+        """analise_custo_beneficio de cada resultado, num único passe sobre os motores analisados (None se desconhecido)"""
+        motores = [self.motores_analisados.get(resultado['codigo_produto']) for resultado in resultados]
+        conhecidos = [motor for motor in motores if motor is not None]
+        custos = iter(self.energia.analises(CatalogoColunar(conhecidos), self.referencias_ie2))
+        return [next(custos) if motor is not None else None for motor in motores]
+    
     def salvar_relatorio(self, relatorio, caminho_saida):
         """Salva relatório em JSON"""
         
@@ -480,6 +773,9 @@ IMPORTANTE: Seja objetivo, técnico e baseado em fatos. Evite subjetividade.
             print(f"   Classificação: {top['classificacao']}")
             print(f"   Preço: R$ {top['dados_comerciais']['preco_base_brl']:,.2f}")
             print(f"   Prazo: {top['dados_comerciais']['prazo_entrega_dias']} dias")
+            custo = top.get('analise_custo_beneficio') or {}
+            if custo.get('tco_brl') is not None:
+                print(f"   Energia: R$ {custo['custo_energia_anual_estimado_brl']:,.2f}/ano | TCO ({custo['horizonte_anos']:g} anos): R$ {custo['tco_brl']:,.2f}")
             print(f"\n   📝 Parecer: {top['parecer_tecnico']}")
         
         print(f"\n{'='*80}")
@@ -516,10 +812,17 @@ def main():
             return
     
     requisitos = analisador.carregar_requisitos(arquivo_requisitos)
-    catalogo = analisador.carregar_catalogo('motor_catalog.json')
-    
     print(f"✅ Requisitos carregados: {arquivo_requisitos}")
-    print(f"✅ Catálogo carregado ({len(catalogo)} motores)")
+    
+    # Catálogo grande sem snapshot: lido em fluxo, a análise começa no primeiro bloco
+    arquivo_catalogo = 'motor_catalog.json'
+    tamanho_mb = Path(arquivo_catalogo).stat().st_size / (1024 * 1024)
+    if tamanho_mb > CATALOGO_GRANDE_MB and not analisador.usar_snapshot:
+        catalogo = analisador.ler_catalogo(arquivo_catalogo)
+        print(f"✅ Catálogo de {tamanho_mb:.0f} MB: leitura em fluxo")
+    else:
+        catalogo = analisador.carregar_catalogo(arquivo_catalogo)
+        print(f"✅ Catálogo carregado ({len(catalogo)} motores)")
     
     # Processa análise
     resultados = analisador.processar_catalogo(requisitos, catalogo)
@@ -533,6 +836,16 @@ def main():
     # Imprime resumo
     analisador.imprimir_resumo(relatorio)
     
+    stats_cache = analisador.llm.estatisticas_cache()
+    if stats_cache:
+        print(f"🧠 Cache LLM: {stats_cache['acertos']} reaproveitadas, {stats_cache['faltas']} novas")
+    
+    if analisador.memo is not None:
+        print(f"♻️  Análises de motores: {analisador.analises_reaproveitadas} reaproveitadas, {analisador.analises_recalculadas} recalculadas")
+    
+    stats_agendador = analisador.llm.estatisticas_agendador()
+    print(f"🚦 Requisições ao LLM: {stats_agendador['requisicoes']} enviadas, {stats_agendador['retentativas']} retentativas, {stats_agendador['falhas']} falhas")
+    
     print(f"\n{'='*80}")
     print(f"✅ Análise concluída com sucesso!")
     print(f"{'='*80}\n")
@@ -3,6 +3,8 @@ import json
 import os
 from pathlib import Path
 import pandas as pd
+from cache_pdf import CachePDF
+from custo_energia import aplicar_cenario
 
 # Configuração da página
 st.set_page_config(
@@ -37,6 +39,15 @@ with st.sidebar:
     - PyPDF2
     - Streamlit
     """)
+    
+    # Cache de texto dos PDFs (mesmo diretório usado pelo extrator_requisitos.py)
+    st.markdown("## Cache de PDFs")
+    cache_pdf = CachePDF()
+    stats_cache = cache_pdf.estatisticas()
+    st.caption(f"{stats_cache['entradas']} documentos em cache ({stats_cache['tamanho_bytes'] / 1024:.1f} KB)")
+    if st.button("🗑️ Limpar cache de PDFs"):
+        removidos = cache_pdf.invalidar()
+        st.success(f"{removidos} entradas removidas")
 
 # Tabs principais
 tab1, tab2, tab3, tab4 = st.tabs(["📄 Requisitos Extraídos", "🔍 Análises de Matching", "📊 Dashboard", "ℹ️ Sobre o Projeto"])
@@ -196,7 +207,7 @@ with tab2:
                     # Dados Comerciais e Eficiência
                     c1, c2, c3 = st.columns(3)
                     comercial = motor.get('dados_comerciais', {})
-                    eficiencia = motor.get('analise_eficiencia', {})
+                    custo = motor.get('analise_custo_beneficio') or {}
                     
                     with c1:
                         st.write("**💰 Comercial**")
@@ -208,11 +219,48 @@ with tab2:
                         st.write(f"Garantia: {comercial.get('garantia_meses')} meses")
                     with c3:
                         st.write("**🌱 Eficiência**")
-                        st.write(f"ROI: {eficiencia.get('roi_anos')} anos")
-                        st.write(f"TCO (5 anos): R$ {eficiencia.get('tco_5anos_brl', 0):,.2f}")
+                        payback = custo.get('payback_vs_ie2_anos')
+                        st.write(f"Energia: R$ {custo.get('custo_energia_anual_estimado_brl') or 0:,.2f}/ano")
+                        st.write(f"Payback vs IE2: {f'{payback:.1f} anos' if payback is not None else 'não se paga'}")
+                        st.write(f"TCO ({custo.get('horizonte_anos', 0):g} anos): R$ {custo.get('tco_brl') or 0:,.2f}")
                     
                     st.progress(int(score_motor) / 100)
 
+            # --- SEÇÃO: CENÁRIOS DE ENERGIA ---
+            # Energia (kWh) do relatório recalculada para outra tarifa e horizonte, sem reler o catálogo
+            st.markdown("---")
+            st.subheader("🔋 Cenários de Energia e TCO")
+            cenario = matching_data.get('metadata', {}).get('cenario_energia')
+            custos = [m.get('analise_custo_beneficio') for m in motores_detalhados]
+            if cenario and any(custos):
+                col_t, col_h = st.columns(2)
+                with col_t:
+                    tarifa = st.slider("Tarifa (R$/kWh)", 0.20, 2.00, float(cenario['tarifa_brl_kwh']), 0.01)
+                with col_h:
+                    horizonte = st.slider("Horizonte do TCO (anos)", 1, 20, int(cenario['horizonte_anos']))
+                st.caption(f"Perfil de carga do relatório: {cenario['horas_ano']:,.0f} h/ano")
+                
+                codigos = [m.get('codigo_produto') for m in motores_detalhados]
+                financeiro = aplicar_cenario(custos, tarifa, horizonte)
+                df_cenario = pd.DataFrame({
+                    'Motor': codigos,
+                    'Energia (R$/ano)': financeiro['custo_energia_anual_estimado_brl'],
+                    'Economia vs IE2 (R$/ano)': financeiro['economia_vs_ie2_anual_brl'],
+                    'Payback vs IE2 (anos)': financeiro['payback_vs_ie2_anos'],
+                    f'TCO {horizonte} anos (R$)': financeiro['tco_brl']
+                }).sort_values(f'TCO {horizonte} anos (R$)')
+                st.dataframe(df_cenario.round(2), use_container_width=True, hide_index=True)
+                
+                # TCO acumulado ano a ano na tarifa escolhida
+                df_tco = pd.DataFrame(
+                    {ano: aplicar_cenario(custos, tarifa, ano)['tco_brl'] for ano in range(0, horizonte + 1)},
+                    index=codigos
+                ).T
+                df_tco.index.name = 'Ano'
+                st.line_chart(df_tco)
+            else:
+                st.info("Relatório sem cálculo de custo de energia: execute novamente o analisador_motores.py.")
+            
             # JSON bruto no final para conferência
             st.markdown("---")
             with st.expander("📝 Visualizar JSON de Matching Completo"):
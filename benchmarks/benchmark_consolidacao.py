@@ -0,0 +1,193 @@
+"""
+Benchmark da Consolidação - Desafio Siemens Energy
+Compara o ConsolidadorRequisitos (matriz campo × documento) com a implementação
+anterior de consolidar_requisitos (laços aninhados), em lotes sintéticos gerados
+a partir dos JSONs de outputs/
+
+Uso: python benchmarks/benchmark_consolidacao.py [documentos] [projetos]
+"""
+
+import contextlib
+import copy
+import io
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from consolidacao import ConsolidadorRequisitos
+
+
+# Implementação anterior (ExtratorRequisitos.consolidar_requisitos), mantida aqui como referência
+
+def consolidar_legado(lista_requisitos):
+    """
+    Consolida múltiplos documentos em um único JSON de requisitos
+    Mescla valores de todos os PDFs, priorizando informações mais completas
+    """
+    if not lista_requisitos:
+        return None
+
+    if len(lista_requisitos) == 1:
+        return lista_requisitos[0]
+
+    print(f"\n{'='*80}")
+    print(f"🔄 Consolidando {len(lista_requisitos)} documentos...")
+    print(f"{'='*80}\n")
+
+    # Inicializa estrutura consolidada
+    consolidado = {
+        "documentos_origem": [r['documento_origem'] for r in lista_requisitos],
+        "data_extracao": datetime.now().isoformat(),
+        "requisitos": {
+            "eletricos": {},
+            "mecanicos": {},
+            "operacionais": {},
+            "aplicacao": {},
+            "protecoes": {},
+            "comercial": {}
+        },
+        "informacoes_faltantes": [],
+        "confianca_extracao": {
+            "eletricos": 0.0,
+            "mecanicos": 0.0,
+            "operacionais": 0.0,
+            "aplicacao": 0.0
+        },
+        "observacoes": [f"Requisitos consolidados de {len(lista_requisitos)} documentos"]
+    }
+
+    # Consolida cada seção
+    for secao in ['eletricos', 'mecanicos', 'operacionais', 'aplicacao', 'protecoes', 'comercial']:
+        print(f"\n📋 Consolidando seção: {secao}")
+
+        # Coleta todos os campos únicos de todos os documentos
+        todos_campos = set()
+        for req in lista_requisitos:
+            if secao in req['requisitos']:
+                todos_campos.update(req['requisitos'][secao].keys())
+
+        # Para cada campo, escolhe o melhor valor
+        for campo in todos_campos:
+            valores_encontrados = []
+
+            # Coleta valores de todos os documentos
+            for req in lista_requisitos:
+                if secao in req['requisitos']:
+                    valor = req['requisitos'][secao].get(campo)
+                    if valor is not None:
+                        valores_encontrados.append({
+                            'valor': valor,
+                            'documento': req['documento_origem'],
+                            'confianca': req['confianca_extracao'].get(secao, 0.0)
+                        })
+
+            # Escolhe o melhor valor
+            if valores_encontrados:
+                # Prioriza valor do documento com maior confiança
+                melhor = max(valores_encontrados, key=lambda x: x['confianca'])
+                consolidado['requisitos'][secao][campo] = melhor['valor']
+
+                # Se houver valores diferentes, registra
+                valores_unicos = set(str(v['valor']) for v in valores_encontrados)
+                if len(valores_unicos) > 1:
+                    print(f"   ⚠️  {campo}: valores diferentes encontrados")
+                    for v in valores_encontrados:
+                        print(f"      • {v['valor']} ({v['documento']})")
+                    print(f"      → Escolhido: {melhor['valor']} (maior confiança)")
+                else:
+                    print(f"   ✓ {campo}: {melhor['valor']}")
+            else:
+                # Nenhum documento tem esse campo
+                consolidado['requisitos'][secao][campo] = None
+
+    # Calcula confiança média por seção
+    for secao in ['eletricos', 'mecanicos', 'operacionais', 'aplicacao']:
+        confiancias = [r['confianca_extracao'].get(secao, 0.0) for r in lista_requisitos]
+        consolidado['confianca_extracao'][secao] = sum(confiancias) / len(confiancias) if confiancias else 0.0
+
+    # Identifica informações faltantes (campos null em TODOS os documentos)
+    for secao, campos in consolidado['requisitos'].items():
+        for campo, valor in campos.items():
+            if valor is None:
+                consolidado['informacoes_faltantes'].append(f"{secao}.{campo}")
+
+    print(f"\n✅ Consolidação concluída!")
+    print(f"   📊 {len(consolidado['informacoes_faltantes'])} informações faltantes")
+
+    return consolidado
+
+
+def gerar_documentos(quantidade, projetos, semente=42):
+    """Gera (projeto, requisitos) variando valores e confianças dos documentos reais"""
+    modelos = [
+        json.loads(caminho.read_text(encoding='utf-8'))
+        for caminho in sorted((RAIZ / "outputs").glob("*_requisitos.json"))
+    ]
+    if not modelos:
+        print("❌ Nenhum *_requisitos.json em outputs/ para usar como modelo")
+        sys.exit(1)
+
+    aleatorio = random.Random(semente)
+    documentos = []
+    for i in range(quantidade):
+        req = copy.deepcopy(aleatorio.choice(modelos))
+        req['documento_origem'] = f"doc_{i:06d}.pdf"
+        req['confianca_extracao'] = {
+            secao: round(aleatorio.uniform(0.5, 1.0), 2) for secao in req['confianca_extracao']
+        }
+        for campos in req['requisitos'].values():
+            for campo, valor in campos.items():
+                sorteio = aleatorio.random()
+                if sorteio < 0.1:
+                    campos[campo] = None
+                elif sorteio < 0.15 and isinstance(valor, (int, float)) and not isinstance(valor, bool):
+                    campos[campo] = valor * 2
+        documentos.append((f"projeto_{i % projetos:04d}", req))
+    return documentos
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    projetos = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    print(f"📦 Gerando {quantidade} documentos em {projetos} projetos...")
+    documentos = gerar_documentos(quantidade, projetos)
+
+    por_projeto = {}
+    for projeto, req in documentos:
+        por_projeto.setdefault(projeto, []).append(req)
+
+    # A implementação anterior imprime cada campo: a saída é descartada para medir só o cálculo
+    def legado():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return {projeto: consolidar_legado(lista) for projeto, lista in por_projeto.items()}
+
+    resultado_legado, tempo_legado = medir(legado)
+    resultado_novo, tempo_novo = medir(lambda: ConsolidadorRequisitos().consolidar_por_projeto(documentos))
+
+    divergencias = 0
+    for projeto, antigo in resultado_legado.items():
+        novo = resultado_novo[projeto]
+        if antigo['requisitos'] != novo['requisitos'] or set(antigo['informacoes_faltantes']) != set(novo['informacoes_faltantes']):
+            divergencias += 1
+
+    print(f"\n⏱️  Implementação anterior: {tempo_legado:.3f}s")
+    print(f"⏱️  ConsolidadorRequisitos:  {tempo_novo:.3f}s")
+    print(f"⚡ Ganho: {tempo_legado / tempo_novo:.1f}x")
+    print(f"{'✅' if divergencias == 0 else '❌'} Projetos com resultado diferente: {divergencias} de {len(por_projeto)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark da Leitura do Catálogo - Desafio Siemens Energy
+Compara json.load do arquivo inteiro (carregar_catalogo) com a leitura em fluxo
+de leitor_catalogo.py: tempo total, tempo até o primeiro produto e pico de memória
+(tracemalloc), em catálogos sintéticos gravados num arquivo temporário
+
+Uso: python benchmarks/benchmark_leitura_catalogo.py [tamanhos...]
+"""
+
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(RAIZ / "benchmarks"))
+
+import leitor_catalogo
+from benchmark_pontuacao import gerar_catalogo
+from leitor_catalogo import LeitorProdutos, ler_produtos
+
+
+def medir(funcao):
+    """(tempo total, tempo até o primeiro produto, pico de memória em MB)"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    primeiro = funcao(inicio)
+    total = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return total, primeiro, pico / 1e6
+
+
+def carregar_inteiro(caminho):
+    def executar(inicio):
+        with open(caminho, 'r', encoding='utf-8') as f:
+            produtos = json.load(f)['catalogo_motores']['produtos']
+        primeiro = time.perf_counter() - inicio
+        for _ in produtos:
+            pass
+        return primeiro
+    return executar
+
+
+def ler_em_fluxo(leitor):
+    def executar(inicio):
+        primeiro = None
+        for _ in leitor():
+            if primeiro is None:
+                primeiro = time.perf_counter() - inicio
+        return primeiro
+    return executar
+
+
+def ler_em_python(caminho):
+    with open(caminho, 'r', encoding='utf-8') as f:
+        yield from LeitorProdutos(f)
+
+
+def main():
+    tamanhos = [int(a) for a in sys.argv[1:]] or [1000, 10000, 50000]
+    print(f"ijson instalado: {'sim' if leitor_catalogo.ijson is not None else 'não (só o leitor em Python puro)'}\n")
+    print(f"{'motores':>8} | {'arquivo':>8} | {'leitura':<14} | {'total':>8} | {'1º produto':>10} | {'pico':>9}")
+
+    for tamanho in tamanhos:
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = Path(pasta) / "catalogo.json"
+            with open(caminho, 'w', encoding='utf-8') as f:
+                json.dump({"catalogo_motores": {"produtos": gerar_catalogo(tamanho)}}, f, ensure_ascii=False)
+            tamanho_mb = caminho.stat().st_size / 1e6
+
+            leituras = [("json.load", carregar_inteiro(caminho))]
+            if leitor_catalogo.ijson is not None:
+                leituras.append(("fluxo (ijson)", ler_em_fluxo(lambda: ler_produtos(caminho))))
+            leituras.append(("fluxo (Python)", ler_em_fluxo(lambda: ler_em_python(caminho))))
+
+            for nome, executar in leituras:
+                total, primeiro, pico = medir(executar)
+                print(f"{tamanho:>8} | {tamanho_mb:>6.1f}MB | {nome:<14} | {total:>7.2f}s | {primeiro * 1000:>8.1f}ms | {pico:>7.1f}MB")
+
+    print("\nNa leitura em fluxo o pico não cresce com o catálogo: só o produto atual e o pedaço lido ficam em memória.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark de Memória do Catálogo - Desafio Siemens Energy
+Bytes por motor: registros como dicts (json.loads, como em carregar_catalogo)
+contra o CatalogoCompacto de motor_compacto.py, em catálogos sintéticos
+
+Uso: python benchmarks/benchmark_memoria_catalogo.py [tamanhos...] [--limite-dicts N]
+
+Os dicts são medidos com tracemalloc até --limite-dicts motores (padrão 20000);
+acima disso o valor por motor é o medido no limite (marcado com *), porque um
+milhão de motores como dicts não cabe na memória de uma máquina comum. O
+catálogo compacto é sempre montado por inteiro, em fluxo, a partir do gerador.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(RAIZ / "benchmarks"))
+
+from benchmark_pontuacao import gerar_motores
+from motor_compacto import CatalogoCompacto
+
+
+def medir_dicts(quantidade):
+    """Bytes por motor dos registros carregados por json.loads (chaves compartilhadas como no json.load)"""
+    texto = json.dumps(list(gerar_motores(quantidade)), ensure_ascii=False)
+    tracemalloc.start()
+    produtos = json.loads(texto)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del produtos
+    return memoria / quantidade
+
+
+def conferir_ida_e_volta(catalogo, quantidade):
+    """Os primeiros registros voltam iguais, inclusive na ordem das chaves"""
+    for posicao, motor in enumerate(gerar_motores(quantidade)):
+        if json.dumps(catalogo.registro(posicao), ensure_ascii=False) != json.dumps(motor, ensure_ascii=False):
+            return False
+    return True
+
+
+def main():
+    argumentos = sys.argv[1:]
+    limite_dicts = 20000
+    if "--limite-dicts" in argumentos:
+        posicao = argumentos.index("--limite-dicts")
+        limite_dicts = int(argumentos[posicao + 1])
+        del argumentos[posicao:posicao + 2]
+    tamanhos = [int(a) for a in argumentos] or [10000, 100000, 1000000]
+
+    medidos = {}
+    print(f"{'motores':>9} | {'dict/motor':>11} | {'compacto/motor':>14} | {'redução':>8} | {'compacto total':>14} | {'montagem':>9}")
+    for tamanho in tamanhos:
+        amostra = min(tamanho, limite_dicts)
+        if amostra not in medidos:
+            medidos[amostra] = medir_dicts(amostra)
+        por_motor_dict = medidos[amostra]
+        estimado = "*" if amostra < tamanho else " "
+
+        inicio = time.perf_counter()
+        catalogo = CatalogoCompacto(gerar_motores(tamanho))
+        tempo = time.perf_counter() - inicio
+        por_motor = catalogo.bytes_ocupados() / tamanho
+        if not conferir_ida_e_volta(catalogo, min(tamanho, 1000)):
+            print(f"❌ Ida e volta divergente em {tamanho} motores")
+            return
+
+        print(
+            f"{tamanho:>9} | {por_motor_dict:>9,.0f} B{estimado}| {por_motor:>12,.0f} B | {por_motor_dict / por_motor:>7.1f}x | "
+            f"{catalogo.bytes_ocupados() / 1e6:>11.1f} MB | {tempo:>8.1f}s"
+        )
+        del catalogo
+
+    print("\n* dicts medidos em", limite_dicts, "motores; o custo por motor é constante.")
+    print("A montagem inclui gerar os motores sintéticos. Ida e volta conferida nos primeiros 1000 motores.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark da Pontuação - Desafio Siemens Energy
+Compara a pontuação motor a motor (CalculadoraPontuacao.avaliar + sort) com a
+vetorizada (CatalogoColunar + pontuar_colunas + top-K por argpartition), em
+catálogos sintéticos de tamanho crescente gerados a partir de motor_catalog.json
+
+Uso: python benchmarks/benchmark_pontuacao.py [tamanhos...] [--top K]
+"""
+
+import copy
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from catalogo_colunar import CatalogoColunar
+from pontuacao import CalculadoraPontuacao, selecionar_top_k
+
+TENSOES = [[380], [440], [380, 440], [220, 380], [220, 380, 440], [400], [460], [380, 660], None]
+GRAUS_PROTECAO = ["IP55", "IP56", "IP65", "IP66", "IP54", "IP44", "IP23", None]
+EFICIENCIAS = ["IE1", "IE2", "IE3", "IE4", None]
+DISPONIBILIDADES = ["em_estoque", "pronta_entrega", "sob_encomenda", "importacao", "consultar", None]
+
+
+def gerar_catalogo(quantidade, semente=42):
+    """Variações dos motores reais (potência, tensões, rotação, IP, IE, prazo, garantia...)"""
+    return list(gerar_motores(quantidade, semente))
+
+
+def gerar_motores(quantidade, semente=42):
+    """Mesmos motores de gerar_catalogo, um a um (para catálogos que não cabem em memória como dicts)"""
+    with open(RAIZ / "motor_catalog.json", 'r', encoding='utf-8') as f:
+        base = json.load(f)['catalogo_motores']['produtos']
+
+    rng = random.Random(semente)
+    for i in range(quantidade):
+        motor = copy.deepcopy(base[i % len(base)])
+        motor['codigo_produto'] = f"{motor['codigo_produto']}-{i:06d}"
+        especificacoes = motor['especificacoes']
+        especificacoes['eletricos']['potencia_kw'] = rng.choice([11.0, 13.5, 14.5, 15.0, 15.0, 15.5, 16.5, 18.5, None])
+        especificacoes['eletricos']['tensao_v'] = rng.choice(TENSOES)
+        especificacoes['mecanicos']['rotacao_nominal_rpm'] = rng.choice([1700, 1730, 1745, 1750, 1760, 1770, 1780, 1790, 1810, None])
+        especificacoes['operacionais']['grau_protecao'] = rng.choice(GRAUS_PROTECAO)
+        especificacoes['operacionais']['eficiencia_energetica'] = rng.choice(EFICIENCIAS)
+        especificacoes['aplicacao']['preparado_inversor'] = rng.choice([True, False, None])
+        motor['comercial']['prazo_entrega_dias'] = rng.choice([5, 15, 20, 30, 40, 45, 50, 60, 90, None])
+        motor['comercial']['garantia_meses'] = rng.choice([6, 12, 18, 24, 36, None])
+        motor['comercial']['disponibilidade'] = rng.choice(DISPONIBILIDADES)
+        motor['comercial']['preco_base_brl'] = round(rng.uniform(4000, 15000), 2)
+        yield motor
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    argumentos = sys.argv[1:]
+    top = 10
+    if "--top" in argumentos:
+        posicao = argumentos.index("--top")
+        top = int(argumentos[posicao + 1])
+        del argumentos[posicao:posicao + 2]
+    tamanhos = [int(a) for a in argumentos] or [1000, 10000, 100000]
+
+    with open(RAIZ / "outputs" / "requisitos_consolidados.json", 'r', encoding='utf-8') as f:
+        requisitos = json.load(f)
+    calculadora = CalculadoraPontuacao(requisitos)
+
+    print(f"{'motores':>9} | {'motor a motor':>13} | {'colunas':>9} | {'pontuação+top-K':>15} | {'ganho':>6} | resultado")
+    for quantidade in tamanhos:
+        catalogo = gerar_catalogo(quantidade)
+
+        def motor_a_motor():
+            avaliacoes = [calculadora.avaliar(motor) for motor in catalogo]
+            ordem = sorted(
+                range(len(catalogo)),
+                key=lambda i: (not avaliacoes[i]['eliminado'], avaliacoes[i]['score_adequacao']),
+                reverse=True
+            )
+            return avaliacoes, ordem[:top]
+
+        def vetorizado():
+            notas = calculadora.pontuar_colunas(colunas)
+            return notas, selecionar_top_k(notas['score_adequacao'], notas['eliminado'], top)
+
+        (avaliacoes, top_antigo), tempo_antigo = medir(motor_a_motor)
+        colunas, tempo_colunas = medir(lambda: CatalogoColunar(catalogo))
+        (notas, top_novo), tempo_novo = medir(vetorizado)
+
+        iguais = (
+            np.array_equal(notas['score_adequacao'], [a['score_adequacao'] for a in avaliacoes])
+            and np.array_equal(notas['eliminado'], [a['eliminado'] for a in avaliacoes])
+            and top_novo.tolist() == top_antigo
+        )
+
+        print(
+            f"{quantidade:>9} | {tempo_antigo:>12.3f}s | {tempo_colunas:>8.3f}s | {tempo_novo:>14.4f}s | "
+            f"{tempo_antigo / tempo_novo:>5.0f}x | {'✅ igual' if iguais else '❌ diferente'}"
+        )
+
+    print("\nA conversão para colunas é feita uma vez por catálogo; a pontuação se repete a cada conjunto de requisitos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark do Prompt de Análise - Desafio Siemens Energy
+Tamanho do prompt por motor: registro completo do catálogo (json indent=2) contra a
+projeção compacta de prompt_analise.py, e o total por catálogo com o prefixo fixo
+
+Uso: python benchmarks/benchmark_prompt.py [caminho_requisitos]
+"""
+
+import json
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from pontuacao import CalculadoraPontuacao
+from prompt_analise import PromptAnalise, codificar_motor
+from selecao_relevancia import estimar_tokens
+
+
+def main():
+    caminho_requisitos = sys.argv[1] if len(sys.argv) > 1 else RAIZ / "outputs" / "requisitos_consolidados.json"
+    with open(caminho_requisitos, 'r', encoding='utf-8') as f:
+        requisitos = json.load(f)
+    with open(RAIZ / "motor_catalog.json", 'r', encoding='utf-8') as f:
+        catalogo = json.load(f)['catalogo_motores']['produtos']
+
+    calculadora = CalculadoraPontuacao(requisitos)
+    prompt = PromptAnalise(requisitos)
+    prefixo = estimar_tokens(prompt.prefixo)
+
+    print(f"Prefixo fixo do projeto: {prefixo} tokens ({len(prompt.prefixo)} caracteres)\n")
+    print(f"{'motor':<32} | {'completo':>8} | {'compacto':>8} | {'bloco':>6} | redução")
+
+    total_completo = 0
+    total_bloco = 0
+    for motor in catalogo:
+        completo = estimar_tokens(json.dumps(motor, indent=2, ensure_ascii=False))
+        compacto = estimar_tokens(codificar_motor(motor))
+        bloco = estimar_tokens(prompt.bloco_motor(motor, calculadora.avaliar(motor)))
+        total_completo += completo
+        total_bloco += bloco
+        print(f"{motor['codigo_produto']:<32} | {completo:>8} | {compacto:>8} | {bloco:>6} | {1 - compacto / completo:>6.0%}")
+
+    n = len(catalogo)
+    antes = n * prefixo + total_completo
+    depois_individual = n * prefixo + total_bloco
+    depois_lote = prefixo + total_bloco
+    print(f"\nTokens de prompt para {n} motores (sem o system prompt):")
+    print(f"   registro completo, um por requisição: {antes}")
+    print(f"   projeção compacta, um por requisição: {depois_individual} ({1 - depois_individual / antes:.0%} menos)")
+    print(f"   projeção compacta, um lote:           {depois_lote} ({1 - depois_lote / antes:.0%} menos)")
+    print("\n'bloco' inclui o resumo da pontuação; o prefixo é idêntico em todas as requisições do projeto.")
+
+
+if __name__ == "__main__":
+    main()
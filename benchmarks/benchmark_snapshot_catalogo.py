@@ -0,0 +1,86 @@
+"""
+Benchmark do Snapshot do Catálogo - Desafio Siemens Energy
+Partida a frio: json.load + CatalogoPreparado (índice e colunas montados a cada
+execução) contra abrir o snapshot colunar de snapshot_catalogo.py com mmap, e o
+tempo de filtrar e pontuar sobre cada um, em catálogos sintéticos
+
+Uso: python benchmarks/benchmark_snapshot_catalogo.py [tamanhos...]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(RAIZ / "benchmarks"))
+
+from benchmark_pontuacao import gerar_catalogo
+from catalogo_preparado import CatalogoPreparado
+from pontuacao import CalculadoraPontuacao
+from snapshot_catalogo import SnapshotCatalogo, compilar_snapshot
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def carregar_json(caminho):
+    with open(caminho, 'r', encoding='utf-8') as f:
+        produtos = json.load(f)['catalogo_motores']['produtos']
+    return CatalogoPreparado(produtos)
+
+
+def consultar(preparado, requisitos):
+    """Filtro por restrições rígidas e pontuação vetorizada dos viáveis (como em processar_catalogo)"""
+    filtro = preparado.indice.filtrar(requisitos)
+    colunas = preparado.colunas.selecionar(filtro.viaveis)
+    return filtro.viaveis, CalculadoraPontuacao(requisitos).pontuar_colunas(colunas)
+
+
+def main():
+    tamanhos = [int(a) for a in sys.argv[1:]] or [1000, 10000, 50000]
+
+    with open(RAIZ / "outputs" / "requisitos_consolidados.json", 'r', encoding='utf-8') as f:
+        requisitos = json.load(f)
+
+    print(f"{'motores':>8} | {'JSON':>7} | {'snapshot':>8} | {'compilar':>8} | {'json.load+preparo':>17} | {'abrir snapshot':>14} | {'consulta (JSON/snap)':>20}")
+    for tamanho in tamanhos:
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = Path(pasta) / "catalogo.json"
+            destino = Path(pasta) / "catalogo.snapshot"
+            with open(caminho, 'w', encoding='utf-8') as f:
+                json.dump({"catalogo_motores": {"versao": "bench", "produtos": gerar_catalogo(tamanho)}}, f, ensure_ascii=False)
+
+            _, tempo_compilar = medir(lambda: compilar_snapshot(caminho, destino))
+            preparado_json, tempo_json = medir(lambda: carregar_json(caminho))
+            snapshot, tempo_abrir = medir(lambda: SnapshotCatalogo(destino, caminho))
+
+            (viaveis_json, pontos_json), consulta_json = medir(lambda: consultar(preparado_json, requisitos))
+            (viaveis_snap, pontos_snap), consulta_snap = medir(lambda: consultar(snapshot.preparado, requisitos))
+            iguais = np.array_equal(viaveis_json, viaveis_snap) and all(
+                np.array_equal(pontos_json[criterio], pontos_snap[criterio]) for criterio in pontos_json
+            ) and snapshot.produtos[tamanho - 1] == preparado_json.produtos[tamanho - 1]
+            if not iguais:
+                print(f"❌ Resultado divergente em {tamanho} motores")
+                return
+
+            print(
+                f"{tamanho:>8} | {caminho.stat().st_size / 1e6:>5.1f}MB | {destino.stat().st_size / 1e6:>6.1f}MB | "
+                f"{tempo_compilar:>7.2f}s | {tempo_json:>16.2f}s | {tempo_abrir * 1000:>12.1f}ms | "
+                f"{consulta_json * 1000:>8.1f} / {consulta_snap * 1000:>6.1f} ms"
+            )
+            del snapshot
+
+    print("\nO snapshot é compilado uma vez por versão do catálogo; cada execução seguinte só o abre.")
+    print("Filtro, pontuação e o último registro conferidos iguais nos dois caminhos.")
+
+
+if __name__ == "__main__":
+    main()
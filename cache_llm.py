@@ -0,0 +1,239 @@
+"""
+Cache de Respostas do LLM - Desafio Siemens Energy
+Reaproveita respostas de requisições idênticas (modelo + prompts + parâmetros)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+
+CAMINHO_SQLITE_PADRAO = Path(__file__).resolve().parent / ".cache" / "respostas_llm.sqlite"
+
+
+def chave_requisicao(modelo, system_prompt, prompt, parametros):
+    """
+    Gera a chave de cache de uma requisição
+    Os prompts precisam ser determinísticos: campos voláteis (data/hora de
+    processamento etc.) devem ficar fora deles, senão nenhuma chave se repete.
+    """
+    conteudo = json.dumps(
+        {
+            "modelo": modelo,
+            "system": system_prompt,
+            "prompt": prompt,
+            "parametros": parametros
+        },
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+class CacheRespostas(ABC):
+    """
+    Interface comum dos backends de cache
+    Subclasses implementam _ler, _escrever, _remover, tamanho e limpar (um
+    backend incompleto falha ao ser criado); os contadores ficam aqui.
+    """
+
+    def __init__(self, ttl_segundos=None):
+        self.ttl = ttl_segundos
+        self.acertos = 0
+        self.faltas = 0
+        self.expirados = 0
+        self.removidos = 0
+
+    def obter(self, chave):
+        """Retorna o valor em cache ou None (ausente ou expirado)"""
+        registro = self._ler(chave)
+        if registro is None:
+            self.faltas += 1
+            return None
+
+        valor, criado_em = registro
+        if self.ttl is not None and time.time() - criado_em > self.ttl:
+            self._remover(chave)
+            self.expirados += 1
+            self.faltas += 1
+            return None
+
+        self.acertos += 1
+        return valor
+
+    def gravar(self, chave, valor):
+        """Grava um valor (texto) no cache"""
+        self._escrever(chave, valor, time.time())
+
+    def estatisticas(self):
+        """Contadores de uso do cache"""
+        total = self.acertos + self.faltas
+        return {
+            "acertos": self.acertos,
+            "faltas": self.faltas,
+            "taxa_acerto": self.acertos / total if total else 0.0,
+            "expirados": self.expirados,
+            "removidos": self.removidos,
+            "entradas": self.tamanho()
+        }
+
+    @abstractmethod
+    def _ler(self, chave):
+        """(valor, criado_em) ou None"""
+
+    @abstractmethod
+    def _escrever(self, chave, valor, criado_em):
+        pass
+
+    @abstractmethod
+    def _remover(self, chave):
+        pass
+
+    @abstractmethod
+    def tamanho(self):
+        pass
+
+    @abstractmethod
+    def limpar(self):
+        pass
+
+
+class CacheMemoria(CacheRespostas):
+    """Cache LRU em memória (útil para testes e execuções isoladas)"""
+
+    def __init__(self, max_entradas=1000, ttl_segundos=None):
+        super().__init__(ttl_segundos)
+        self.max_entradas = max_entradas
+        self._dados = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _ler(self, chave):
+        with self._lock:
+            registro = self._dados.get(chave)
+            if registro is not None:
+                self._dados.move_to_end(chave)
+            return registro
+
+    def _escrever(self, chave, valor, criado_em):
+        with self._lock:
+            self._dados[chave] = (valor, criado_em)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.max_entradas:
+                self._dados.popitem(last=False)
+                self.removidos += 1
+
+    def _remover(self, chave):
+        with self._lock:
+            self._dados.pop(chave, None)
+
+    def tamanho(self):
+        return len(self._dados)
+
+    def limpar(self):
+        with self._lock:
+            self._dados.clear()
+
+
+class CacheSQLite(CacheRespostas):
+    """
+    Cache persistente em SQLite, compartilhado entre execuções e scripts
+    Remove as entradas menos usadas quando passa de max_entradas ou max_bytes.
+    """
+
+    def __init__(self, caminho=CAMINHO_SQLITE_PADRAO, max_entradas=5000, max_bytes=200 * 1024 * 1024, ttl_segundos=None):
+        super().__init__(ttl_segundos)
+        self.caminho = Path(caminho)
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._conexao = sqlite3.connect(str(self.caminho), timeout=30, check_same_thread=False)
+        with self._lock, self._conexao:
+            self._conexao.execute(
+                """CREATE TABLE IF NOT EXISTS respostas (
+                    chave TEXT PRIMARY KEY,
+                    valor TEXT NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    criado_em REAL NOT NULL,
+                    acessado_em REAL NOT NULL
+                )"""
+            )
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_acesso ON respostas (acessado_em)")
+
+    def _ler(self, chave):
+        with self._lock, self._conexao:
+            linha = self._conexao.execute(
+                "SELECT valor, criado_em FROM respostas WHERE chave = ?", (chave,)
+            ).fetchone()
+            if linha is not None:
+                self._conexao.execute(
+                    "UPDATE respostas SET acessado_em = ? WHERE chave = ?", (time.time(), chave)
+                )
+        return linha
+
+    def _escrever(self, chave, valor, criado_em):
+        with self._lock, self._conexao:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?)",
+                (chave, valor, len(valor.encode('utf-8')), criado_em, criado_em)
+            )
+            self._aplicar_limites()
+
+    def _aplicar_limites(self):
+        """Remove as entradas acessadas há mais tempo até caber nos limites"""
+        quantidade, total_bytes = self._conexao.execute(
+            "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM respostas"
+        ).fetchone()
+
+        if quantidade <= self.max_entradas and total_bytes <= self.max_bytes:
+            return
+
+        antigas = self._conexao.execute(
+            "SELECT chave, tamanho FROM respostas ORDER BY acessado_em"
+        )
+        remover = []
+        for chave, tamanho in antigas:
+            if quantidade <= self.max_entradas and total_bytes <= self.max_bytes:
+                break
+            remover.append((chave,))
+            quantidade -= 1
+            total_bytes -= tamanho
+
+        self._conexao.executemany("DELETE FROM respostas WHERE chave = ?", remover)
+        self.removidos += len(remover)
+
+    def _remover(self, chave):
+        with self._lock, self._conexao:
+            self._conexao.execute("DELETE FROM respostas WHERE chave = ?", (chave,))
+
+    def tamanho(self):
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM respostas").fetchone()[0]
+
+    def limpar(self):
+        with self._lock, self._conexao:
+            self._conexao.execute("DELETE FROM respostas")
+
+
+def criar_cache_padrao():
+    """
+    Cria o cache conforme as variáveis de ambiente
+    LLM_CACHE: sqlite (padrão) | memoria | desligado
+    LLM_CACHE_TTL_HORAS: validade das respostas (padrão 168h)
+    LLM_CACHE_MAX_ENTRADAS: limite de entradas (padrão 5000)
+    """
+    backend = os.getenv('LLM_CACHE', 'sqlite').lower()
+    ttl = float(os.getenv('LLM_CACHE_TTL_HORAS', '168')) * 3600
+    max_entradas = int(os.getenv('LLM_CACHE_MAX_ENTRADAS', '5000'))
+
+    if backend == 'desligado':
+        return None
+    if backend == 'memoria':
+        return CacheMemoria(max_entradas=max_entradas, ttl_segundos=ttl)
+    return CacheSQLite(max_entradas=max_entradas, ttl_segundos=ttl)
@@ -0,0 +1,200 @@
+"""
+Cache de Texto de PDFs - Desafio Siemens Energy
+Guarda em disco o texto extraído de cada PDF, endereçado pelo conteúdo do arquivo
+"""
+
+import PyPDF2
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+# Muda quando o parser muda: textos extraídos por outra versão não são reaproveitados
+VERSAO_PARSER = f"PyPDF2-{PyPDF2.__version__}"
+
+DIR_CACHE_PADRAO = Path(__file__).resolve().parent / ".cache" / "texto_pdf"
+
+
+class CachePDF:
+    """
+    Cache em disco do texto por página de cada PDF
+    A chave é o hash SHA-256 dos bytes do arquivo + versão do parser, então
+    renomear ou mover o PDF não invalida a entrada, mas editar o conteúdo sim.
+    Quando o tamanho total passa do limite, as entradas usadas há mais tempo saem primeiro.
+    """
+
+    def __init__(self, diretorio=DIR_CACHE_PADRAO, tamanho_maximo_mb=200):
+        self.diretorio = Path(diretorio)
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self.acertos = 0
+        self.faltas = 0
+
+    def chave(self, caminho_pdf):
+        """Calcula a chave de cache a partir do conteúdo do PDF"""
+        h = hashlib.sha256(VERSAO_PARSER.encode('utf-8'))
+        with open(caminho_pdf, 'rb') as f:
+            for bloco in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(bloco)
+        return h.hexdigest()
+
+    def _caminho(self, chave):
+        return self.diretorio / chave[:2] / f"{chave}.jsonl"
+
+    def iterar(self, chave):
+        """
+        Retorna um iterador lazy de (numero_pagina, texto) ou None se não houver entrada
+        O arquivo tem uma linha de cabeçalho e uma linha por página, então
+        a leitura não precisa carregar o documento inteiro.
+        """
+        caminho = self._caminho(chave)
+        try:
+            arquivo = open(caminho, 'r', encoding='utf-8')
+        except OSError:
+            self.faltas += 1
+            return None
+
+        # Atualiza o horário de acesso usado na remoção por tamanho
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+
+        self.acertos += 1
+        return self._ler_linhas(arquivo)
+
+    def _ler_linhas(self, arquivo):
+        with arquivo:
+            arquivo.readline()  # cabeçalho
+            for linha in arquivo:
+                pagina = json.loads(linha)
+                yield pagina['n'], pagina['texto']
+
+    def obter(self, chave):
+        """Retorna a lista de páginas em cache ou None"""
+        paginas = self.iterar(chave)
+        if paginas is None:
+            return None
+        return [texto for _, texto in paginas]
+
+    def escritor(self, chave, nome_arquivo=None):
+        """Abre uma entrada para gravação página a página (ver EscritorCachePDF)"""
+        return EscritorCachePDF(self, chave, nome_arquivo)
+
+    def gravar(self, chave, paginas, nome_arquivo=None):
+        """Grava as páginas extraídas e aplica o limite de tamanho"""
+        with self.escritor(chave, nome_arquivo) as escritor:
+            for numero, texto in enumerate(paginas, 1):
+                escritor.adicionar(numero, texto)
+
+    def invalidar(self, caminho_pdf=None):
+        """Remove a entrada de um PDF, ou o cache inteiro se nenhum for informado"""
+        if caminho_pdf is not None:
+            alvos = [self._caminho(self.chave(caminho_pdf))]
+        else:
+            alvos = self._entradas()
+
+        removidos = 0
+        for alvo in alvos:
+            try:
+                alvo.unlink()
+                removidos += 1
+            except FileNotFoundError:
+                pass
+        return removidos
+
+    def estatisticas(self):
+        """Resumo do uso do cache"""
+        entradas = self._entradas()
+        return {
+            "entradas": len(entradas),
+            "tamanho_bytes": sum(e.stat().st_size for e in entradas),
+            "tamanho_maximo_bytes": self.tamanho_maximo,
+            "acertos": self.acertos,
+            "faltas": self.faltas
+        }
+
+    def _entradas(self):
+        if not self.diretorio.exists():
+            return []
+        return list(self.diretorio.glob("*/*.jsonl"))
+
+    def _aplicar_limite(self):
+        """Remove as entradas menos usadas até caber no limite"""
+        entradas = []
+        total = 0
+        for caminho in self._entradas():
+            try:
+                info = caminho.stat()
+            except FileNotFoundError:
+                continue
+            entradas.append((info.st_mtime, info.st_size, caminho))
+            total += info.st_size
+
+        if total <= self.tamanho_maximo:
+            return
+
+        for _, tamanho, caminho in sorted(entradas, key=lambda e: e[0]):
+            try:
+                caminho.unlink()
+            except FileNotFoundError:
+                pass
+            total -= tamanho
+            if total <= self.tamanho_maximo:
+                break
+
+
+class EscritorCachePDF:
+    """
+    Grava uma entrada do cache à medida que as páginas são extraídas
+    A entrada só é publicada se o bloco `with` terminar sem erro; um documento
+    lido pela metade (erro ou leitura interrompida) não fica no cache.
+    """
+
+    def __init__(self, cache, chave, nome_arquivo=None):
+        self.cache = cache
+        self.destino = cache._caminho(chave)
+        self.temporario = self.destino.with_suffix(f".{os.getpid()}.{id(self)}.tmp")
+        self.nome_arquivo = nome_arquivo
+        self._arquivo = None
+
+    def __enter__(self):
+        self.destino.parent.mkdir(parents=True, exist_ok=True)
+        self._arquivo = open(self.temporario, 'w', encoding='utf-8')
+        cabecalho = {"versao_parser": VERSAO_PARSER, "arquivo": self.nome_arquivo}
+        self._arquivo.write(json.dumps(cabecalho, ensure_ascii=False) + "\n")
+        return self
+
+    def adicionar(self, numero, texto):
+        self._arquivo.write(json.dumps({"n": numero, "texto": texto}, ensure_ascii=False) + "\n")
+
+    def __exit__(self, tipo_erro, erro, traceback):
+        self._arquivo.close()
+
+        if tipo_erro is not None:
+            self.temporario.unlink(missing_ok=True)
+            return False
+
+        # Escrita atômica: CLI e Streamlit podem usar o mesmo diretório ao mesmo tempo
+        os.replace(self.temporario, self.destino)
+        self.cache._aplicar_limite()
+        return False
+
+
+def main():
+    """Mostra o estado do cache; com --limpar, esvazia"""
+    cache = CachePDF()
+
+    if '--limpar' in sys.argv[1:]:
+        removidos = cache.invalidar()
+        print(f"🗑️  Cache de PDFs limpo ({removidos} entradas removidas)")
+        return
+
+    stats = cache.estatisticas()
+    print(f"📂 Cache de PDFs: {cache.diretorio}")
+    print(f"   Entradas: {stats['entradas']}")
+    print(f"   Tamanho: {stats['tamanho_bytes'] / 1024:.1f} KB de {stats['tamanho_maximo_bytes'] / 1024 / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Catálogo Colunar - Desafio Siemens Energy
+Converte o catálogo de motores (lista de dicts aninhados) em colunas NumPy para pontuar milhares de SKUs de uma vez
+"""
+
+import numpy as np
+from pontuacao import PONTOS_DISPONIBILIDADE, booleano, codigo_ip, nivel_eficiencia, numero, numeros
+
+# Bitmask de tensões em int64
+MAX_TENSOES = 63
+
+_COLUNAS = (
+    "potencia_kw", "rotacao_rpm", "prazo_dias", "garantia_meses", "preco_brl",
+    "tensoes", "grau_protecao", "eficiencia", "preparado_inversor", "disponibilidade",
+    "frequencia_hz", "numero_polos", "rendimento_50", "rendimento_75", "rendimento_100"
+)
+
+
+class CatalogoColunar:
+    """
+    Uma coluna por especificação usada na rubrica, na ordem do catálogo
+
+    - potencia_kw, rotacao_rpm, prazo_dias, garantia_meses, preco_brl: float64 (NaN = não informado)
+    - tensoes: bitmask int64 sobre `valores_tensao` (bit i = motor disponível em valores_tensao[i])
+    - grau_protecao: ordinal 10*d1 + d2 (IP55 -> 55; -1 = não informado)
+    - eficiencia: ordinal IE (IE3 -> 3; -1 = não informado)
+    - preparado_inversor: bool
+    - disponibilidade: código em `valores_disponibilidade`
+    - frequencia_hz, numero_polos, rendimento_50/75/100 (% a 50/75/100% da
+      carga): float64 (NaN = não informado), para o custo de energia (custo_energia.py)
+    """
+
+    def __init__(self, produtos):
+        n = len(produtos)
+        self.codigos = [motor.get('codigo_produto') for motor in produtos]
+        self.potencia_kw = np.full(n, np.nan)
+        self.rotacao_rpm = np.full(n, np.nan)
+        self.prazo_dias = np.full(n, np.nan)
+        self.garantia_meses = np.full(n, np.nan)
+        self.preco_brl = np.full(n, np.nan)
+        self.tensoes = np.zeros(n, dtype=np.int64)
+        self.grau_protecao = np.full(n, -1, dtype=np.int16)
+        self.eficiencia = np.full(n, -1, dtype=np.int8)
+        self.preparado_inversor = np.zeros(n, dtype=bool)
+        self.disponibilidade = np.zeros(n, dtype=np.int32)
+        self.frequencia_hz = np.full(n, np.nan)
+        self.numero_polos = np.full(n, np.nan)
+        self.rendimento_50 = np.full(n, np.nan)
+        self.rendimento_75 = np.full(n, np.nan)
+        self.rendimento_100 = np.full(n, np.nan)
+
+        self.valores_tensao = []
+        self.valores_disponibilidade = [""]
+        bit_tensao = {}
+        codigo_disponibilidade = {"": 0}
+
+        for i, motor in enumerate(produtos):
+            especificacoes = motor.get('especificacoes') or {}
+            eletricos = especificacoes.get('eletricos') or {}
+            mecanicos = especificacoes.get('mecanicos') or {}
+            operacionais = especificacoes.get('operacionais') or {}
+            aplicacao = especificacoes.get('aplicacao') or {}
+            comercial = motor.get('comercial') or {}
+
+            self.potencia_kw[i] = _ou_nan(numero(eletricos.get('potencia_kw')))
+            self.rotacao_rpm[i] = _ou_nan(numero(mecanicos.get('rotacao_nominal_rpm')))
+            self.prazo_dias[i] = _ou_nan(numero(comercial.get('prazo_entrega_dias')))
+            self.garantia_meses[i] = _ou_nan(numero(comercial.get('garantia_meses')))
+            self.preco_brl[i] = _ou_nan(numero(comercial.get('preco_base_brl')))
+            self.frequencia_hz[i] = _ou_nan(numero(eletricos.get('frequencia_hz')))
+            self.numero_polos[i] = _ou_nan(numero(mecanicos.get('numero_polos')))
+            self.rendimento_50[i] = _ou_nan(numero(eletricos.get('rendimento_50_carga_percent')))
+            self.rendimento_75[i] = _ou_nan(numero(eletricos.get('rendimento_75_carga_percent')))
+            self.rendimento_100[i] = _ou_nan(numero(eletricos.get('rendimento_100_carga_percent')))
+
+            mascara = 0
+            for tensao in numeros(eletricos.get('tensao_v')):
+                bit = bit_tensao.get(tensao)
+                if bit is None:
+                    if len(self.valores_tensao) == MAX_TENSOES:
+                        raise ValueError(f"Catálogo com mais de {MAX_TENSOES} tensões distintas")
+                    bit = bit_tensao[tensao] = len(self.valores_tensao)
+                    self.valores_tensao.append(tensao)
+                mascara |= 1 << bit
+            self.tensoes[i] = mascara
+
+            ip = codigo_ip(operacionais.get('grau_protecao'))
+            if ip is not None:
+                self.grau_protecao[i] = ip[0] * 10 + ip[1]
+            ie = nivel_eficiencia(operacionais.get('eficiencia_energetica'))
+            if ie is not None:
+                self.eficiencia[i] = ie
+            self.preparado_inversor[i] = bool(booleano(aplicacao.get('preparado_inversor')))
+
+            chave = str(comercial.get('disponibilidade') or "").strip().lower()
+            codigo = codigo_disponibilidade.get(chave)
+            if codigo is None:
+                codigo = codigo_disponibilidade[chave] = len(self.valores_disponibilidade)
+                self.valores_disponibilidade.append(chave)
+            self.disponibilidade[i] = codigo
+
+    @classmethod
+    def de_colunas(cls, codigos, colunas, valores_tensao, valores_disponibilidade):
+        """CatalogoColunar com colunas já prontas (nomes de _COLUNAS), sem copiá-las"""
+        catalogo = object.__new__(cls)
+        catalogo.codigos = codigos
+        for coluna in _COLUNAS:
+            setattr(catalogo, coluna, colunas[coluna])
+        catalogo.valores_tensao = valores_tensao
+        catalogo.valores_disponibilidade = valores_disponibilidade
+        return catalogo
+
+    def colunas(self):
+        """Colunas NumPy por nome (o inverso de de_colunas)"""
+        return {coluna: getattr(self, coluna) for coluna in _COLUNAS}
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def selecionar(self, indices):
+        """Novo CatalogoColunar só com os motores `indices` (na ordem dada), sem reler o catálogo"""
+        indices = np.asarray(indices, dtype=np.intp)
+        if isinstance(self.codigos, list):
+            codigos = [self.codigos[i] for i in indices.tolist()]
+        else:
+            # Códigos de um snapshot: selecionados sem decodificar
+            codigos = self.codigos.selecionar(indices)
+        return CatalogoColunar.de_colunas(
+            codigos,
+            {coluna: getattr(self, coluna)[indices] for coluna in _COLUNAS},
+            self.valores_tensao,
+            self.valores_disponibilidade
+        )
+
+    def mascara_tensao(self, tensao):
+        """Bits das tensões do catálogo iguais a `tensao` (mesma tolerância da rubrica)"""
+        mascara = 0
+        for bit, valor in enumerate(self.valores_tensao):
+            if abs(valor - tensao) <= 1e-3 * max(abs(valor), abs(tensao)):
+                mascara |= 1 << bit
+        return mascara
+
+    def pontos_disponibilidade(self):
+        """Pontos de cada código de disponibilidade (tabela para indexar a coluna)"""
+        return np.array(
+            [PONTOS_DISPONIBILIDADE.get(chave, 1 if chave else 0) for chave in self.valores_disponibilidade],
+            dtype=np.int64
+        )
+
+
+def _ou_nan(valor):
+    return np.nan if valor is None else valor
@@ -0,0 +1,79 @@
+"""
+Catálogo Preparado - Desafio Siemens Energy
+Trabalho do lado do catálogo (índice, colunas, projeções e resumos) feito uma vez e compartilhado entre projetos
+"""
+
+from catalogo_colunar import CatalogoColunar
+from custo_energia import PrecosReferenciaIE2
+from indice_catalogo import IndiceCatalogo
+from memo_analises import resumo
+from prompt_analise import codificar_motor
+
+
+class CatalogoPreparado:
+    """
+    Estruturas derivadas de um catálogo, independentes dos requisitos
+
+    - indice: IndiceCatalogo (restrições rígidas)
+    - colunas: CatalogoColunar do catálogo inteiro (a pontuação usa um subconjunto)
+    - projecao(motor): JSON compacto usado nos prompts
+    - resumo(motor): hash do registro usado na memória de análises
+    - referencias_ie2: PrecosReferenciaIE2 do catálogo inteiro (base do payback)
+
+    Projeções e resumos são calculados na primeira vez que cada motor é usado,
+    então só os motores que chegam ao LLM pagam por eles. São guardados pelo
+    codigo_produto (que identifica o motor no catálogo, como no relatório):
+    registros lidos sob demanda de um snapshot são objetos novos a cada
+    leitura, e a tabela guarda só o valor calculado, não o registro. Um código
+    que se repete no catálogo (outro fabricante, outra revisão do registro)
+    não identifica o motor: esses são calculados a cada uso, senão o segundo
+    herdaria a projeção e o resumo (e a análise memorizada) do primeiro.
+    """
+
+    def __init__(self, produtos, indice=None, colunas=None):
+        self.produtos = produtos
+        # Índice e colunas podem vir prontos (ex: de um snapshot mapeado em memória)
+        self.indice = indice if indice is not None else IndiceCatalogo(produtos)
+        self.colunas = colunas if colunas is not None else CatalogoColunar(produtos)
+        self._projecoes = {}
+        self._resumos = {}
+        self._repetidos = None
+        self._referencias_ie2 = None
+
+    def __len__(self):
+        return len(self.produtos)
+
+    @property
+    def referencias_ie2(self):
+        """IE2 mais barato por potência e polos, no catálogo inteiro (calculado no primeiro uso)"""
+        if self._referencias_ie2 is None:
+            self._referencias_ie2 = PrecosReferenciaIE2(self.colunas)
+        return self._referencias_ie2
+
+    def projecao(self, motor):
+        """Projeção compacta do motor (ver prompt_analise.codificar_motor)"""
+        return self._memorizar(self._projecoes, motor, codificar_motor)
+
+    def resumo(self, motor):
+        """Resumo (SHA-256) do registro normalizado do motor"""
+        return self._memorizar(self._resumos, motor, resumo)
+
+    def _memorizar(self, tabela, motor, calcular):
+        # Duas threads podem calcular o mesmo valor ao mesmo tempo; o resultado é igual
+        codigo = motor.get('codigo_produto')
+        if codigo is None or codigo in self._codigos_repetidos():
+            return calcular(motor)
+        valor = tabela.get(codigo)
+        if valor is None:
+            valor = tabela[codigo] = calcular(motor)
+        return valor
+
+    def _codigos_repetidos(self):
+        """Códigos de produto que aparecem em mais de um registro (lidos das colunas, no primeiro uso)"""
+        if self._repetidos is None:
+            vistos = set()
+            repetidos = set()
+            for codigo in self.colunas.codigos:
+                (repetidos if codigo in vistos else vistos).add(codigo)
+            self._repetidos = repetidos
+        return self._repetidos
@@ -0,0 +1,209 @@
+"""
+Cliente LLM - Desafio Siemens Energy
+Chamada ao Groq usada pelo extrator e pelo analisador (completa ou em streaming), com cache de respostas e controle de cota
+"""
+
+from groq import Groq
+import json
+import os
+from agendador_llm import agendador_padrao
+from cache_llm import chave_requisicao
+from json_incremental import ParserJSONIncremental
+from selecao_relevancia import estimar_tokens
+
+
+class RequisicaoCancelada(Exception):
+    """A requisição foi cancelada (tempo esgotado ou pedido do usuário)"""
+
+
+def limpar_markdown(resposta_texto):
+    """Remove cercas de markdown (```json ... ```) que o modelo às vezes adiciona"""
+    if '```json' in resposta_texto:
+        resposta_texto = resposta_texto.split('```json')[1].split('```')[0]
+    elif '```' in resposta_texto:
+        resposta_texto = resposta_texto.split('```')[1].split('```')[0]
+    return resposta_texto.strip()
+
+
+class ClienteLLM:
+    """
+    Envia prompts ao LLM e devolve a resposta JSON já decodificada
+    Se houver cache, requisições idênticas (modelo, prompts e parâmetros) não voltam ao Groq.
+    As que vão passam pelo agendador (cotas, concorrência adaptativa e retentativas).
+    """
+
+    def __init__(self, modelo, cache=None, agendador=None):
+        # Sem retentativas no SDK: quem repete (e desacelera) é o agendador
+        self.client = Groq(api_key=os.getenv('GROQ_API_KEY'), max_retries=0)
+        self.modelo = modelo
+        self.cache = cache
+        self.agendador = agendador if agendador is not None else agendador_padrao()
+        # LLM_STREAMING=0 volta às respostas completas
+        self.streaming = os.getenv('LLM_STREAMING', '1') != '0'
+
+    def completar_json(self, system_prompt, prompt, temperature, max_tokens, cancelar=None, timeout=None):
+        """
+        Executa a requisição (ou reaproveita do cache) e retorna o JSON como dict
+        cancelar: threading.Event que, ligado, impede novas tentativas (RequisicaoCancelada)
+        timeout: limite em segundos de cada tentativa
+        """
+        parametros = {
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": {"type": "json_object"}
+        }
+
+        chave = chave_requisicao(self.modelo, system_prompt, prompt, parametros)
+
+        if self.cache is not None:
+            resposta_texto = self.cache.obter(chave)
+            if resposta_texto is not None:
+                return json.loads(limpar_markdown(resposta_texto))
+
+        # Reserva o prompt e metade da resposta máxima; o uso real corrige depois
+        tokens_reservados = estimar_tokens(system_prompt) + estimar_tokens(prompt) + max_tokens // 2
+
+        def requisitar():
+            self._verificar_cancelamento(cancelar)
+            return self.client.chat.completions.create(
+                messages=self._mensagens(system_prompt, prompt),
+                model=self.modelo,
+                **parametros,
+                **self._opcoes_requisicao(timeout)
+            )
+        
+        response = self.agendador.executar(requisitar, tokens_reservados)
+
+        uso = getattr(response, 'usage', None)
+        self.agendador.ajustar_tokens(tokens_reservados, getattr(uso, 'total_tokens', None))
+
+        resposta_texto = response.choices[0].message.content.strip()
+        resultado = json.loads(limpar_markdown(resposta_texto))
+
+        # Só grava depois de validar o JSON, para não eternizar respostas quebradas
+        if self.cache is not None:
+            self.cache.gravar(chave, resposta_texto)
+
+        return resultado
+
+    def completar_json_stream(self, system_prompt, prompt, temperature, max_tokens, ao_campo=None, profundidade=1,
+                              cancelar=None, timeout=None):
+        """
+        Como completar_json, mas recebe a resposta em streaming e chama
+        ao_campo(caminho, valor) a cada campo concluído (até `profundidade` níveis)
+
+        Se ao_campo retornar True a geração é interrompida: a conexão é fechada
+        e volta um dict só com os campos de primeiro nível já recebidos (que não
+        vai para o cache). Numa resposta do cache os campos são repassados do
+        mesmo jeito; a entrada é a mesma de completar_json, então uma resposta
+        gravada num modo é reaproveitada no outro. O modo JSON (response_format)
+        vale também no streaming; cercas de markdown, se vierem, são ignoradas
+        pelo parser.
+        Se `cancelar` (threading.Event) for ligado, o streaming é fechado no
+        pedaço seguinte e sobe RequisicaoCancelada.
+        """
+        # Sem "stream": a resposta é a mesma, então a entrada do cache vale para os dois modos
+        parametros = {
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": {"type": "json_object"}
+        }
+
+        chave = chave_requisicao(self.modelo, system_prompt, prompt, parametros)
+
+        if self.cache is not None:
+            resposta_texto = self.cache.obter(chave)
+            if resposta_texto is not None:
+                parser = ParserJSONIncremental(ao_campo, profundidade)
+                parser.alimentar(resposta_texto)
+                return parser.parcial() if parser.interrompido else parser.resultado()
+
+        tokens_reservados = estimar_tokens(system_prompt) + estimar_tokens(prompt) + max_tokens // 2
+
+        # O consumo inteiro fica dentro do agendador: queda no meio do streaming também é retentada
+        return self.agendador.executar(
+            lambda: self._consumir_stream(
+                system_prompt, prompt, parametros, chave, tokens_reservados, ao_campo, profundidade, cancelar, timeout
+            ),
+            tokens_reservados
+        )
+
+    def _consumir_stream(self, system_prompt, prompt, parametros, chave, tokens_reservados, ao_campo, profundidade,
+                         cancelar=None, timeout=None):
+        """Lê os pedaços do streaming alimentando o parser incremental"""
+        self._verificar_cancelamento(cancelar)
+        parser = ParserJSONIncremental(ao_campo, profundidade)
+        partes = []
+        usados = None
+
+        stream = self.client.chat.completions.create(
+            messages=self._mensagens(system_prompt, prompt),
+            model=self.modelo,
+            stream=True,
+            **parametros,
+            **self._opcoes_requisicao(timeout)
+        )
+        try:
+            for chunk in stream:
+                self._verificar_cancelamento(cancelar)
+
+                if chunk.choices:
+                    pedaco = chunk.choices[0].delta.content
+                    if pedaco:
+                        partes.append(pedaco)
+                        parser.alimentar(pedaco)
+
+                # O Groq informa o uso no último pedaço
+                x_groq = getattr(chunk, 'x_groq', None)
+                uso = getattr(x_groq, 'usage', None)
+                if uso is not None:
+                    usados = uso.total_tokens
+
+                if parser.interrompido:
+                    break
+        finally:
+            fechar = getattr(stream, 'close', None)
+            if fechar is not None:
+                fechar()
+
+        if parser.interrompido:
+            # Sem o uso real, mantém a reserva (estimativa conservadora)
+            return parser.parcial()
+
+        self.agendador.ajustar_tokens(tokens_reservados, usados)
+
+        resposta_texto = "".join(partes).strip()
+        resultado = parser.resultado()
+
+        if self.cache is not None:
+            self.cache.gravar(chave, resposta_texto)
+
+        return resultado
+
+    def _verificar_cancelamento(self, cancelar):
+        if cancelar is not None and cancelar.is_set():
+            raise RequisicaoCancelada("requisição cancelada")
+
+    def _opcoes_requisicao(self, timeout):
+        # O timeout não entra na chave do cache: não muda a resposta
+        return {"timeout": timeout} if timeout else {}
+
+    def _mensagens(self, system_prompt, prompt):
+        return [
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+    def estatisticas_cache(self):
+        """Contadores do cache (ou None se desligado)"""
+        return self.cache.estatisticas() if self.cache is not None else None
+
+    def estatisticas_agendador(self):
+        """Contadores de requisições, retentativas e falhas"""
+        return self.agendador.estatisticas()
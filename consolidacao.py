@@ -0,0 +1,290 @@
+"""
+Consolidação de Requisitos - Desafio Siemens Energy
+Junta os requisitos extraídos de vários documentos (por projeto) em um único JSON
+"""
+
+import contextlib
+import gc
+import json
+from datetime import datetime
+import numpy as np
+
+SECOES_CONSOLIDACAO = ['eletricos', 'mecanicos', 'operacionais', 'aplicacao', 'protecoes', 'comercial']
+SECOES_CONFIANCA = ['eletricos', 'mecanicos', 'operacionais', 'aplicacao']
+
+# Confiança das células sem valor (campo ausente ou null): perde de qualquer valor presente
+SEM_VALOR = -1.0
+
+
+@contextlib.contextmanager
+def _sem_coleta_de_lixo():
+    """
+    Pausa o coletor de ciclos enquanto o resultado é montado
+    Em lotes grandes ele percorre repetidamente todos os documentos já
+    carregados; as estruturas criadas aqui não formam ciclos.
+    """
+    ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ativo:
+            gc.enable()
+
+
+class ConsolidadorRequisitos:
+    """
+    Consolida documentos montando uma matriz campo × documento
+
+    Cada célula guarda a confiança da seção no documento (ou SEM_VALOR) e um
+    código do valor. Para cada projeto, o valor escolhido é o do documento com
+    maior confiança (empate: o primeiro, na ordem de entrada), e há conflito
+    quando os códigos divergem; tudo isso é calculado de uma vez com reduceat
+    sobre as colunas agrupadas por projeto. A origem de cada valor e os
+    conflitos ficam no próprio JSON ("proveniencia" e "conflitos").
+    """
+
+    def consolidar(self, lista_requisitos):
+        """Consolida documentos de um mesmo projeto (um documento é devolvido como está)"""
+        if not lista_requisitos:
+            return None
+        return self.consolidar_por_projeto((None, req) for req in lista_requisitos)[None]
+
+    def consolidar_por_projeto(self, documentos):
+        """
+        Consolida vários projetos em um único lote
+        documentos: iterável de (projeto, requisitos)
+        Retorna {projeto: consolidado}, na ordem em que os projetos aparecem
+        """
+        projetos = []
+        codigo_projeto = {}
+        lista = []
+        codigos = []
+        for projeto, requisitos in documentos:
+            if projeto not in codigo_projeto:
+                codigo_projeto[projeto] = len(projetos)
+                projetos.append(projeto)
+            codigos.append(codigo_projeto[projeto])
+            lista.append(requisitos)
+
+        if not lista:
+            return {}
+
+        # Colunas agrupadas por projeto, mantendo a ordem de entrada dentro de cada um
+        ordem = np.argsort(np.array(codigos), kind='stable')
+        lista = [lista[i] for i in ordem]
+        codigos_ordenados = np.array(codigos)[ordem]
+        inicios = np.flatnonzero(np.r_[True, codigos_ordenados[1:] != codigos_ordenados[:-1]])
+        tamanhos = np.diff(np.r_[inicios, len(lista)])
+
+        data = datetime.now().isoformat()
+        resultado = {}
+
+        with _sem_coleta_de_lixo():
+            matriz = self._montar_matriz(lista)
+            escolha = self._resolver(matriz, inicios, tamanhos)
+
+            for p, (inicio, tamanho) in enumerate(zip(inicios.tolist(), tamanhos.tolist())):
+                projeto = projetos[codigos_ordenados[inicio]]
+                documentos_projeto = lista[inicio:inicio + tamanho]
+
+                if tamanho == 1:
+                    resultado[projeto] = documentos_projeto[0]
+                else:
+                    resultado[projeto] = self._montar_consolidado(matriz, escolha, p, inicio, documentos_projeto, data)
+
+        return {projeto: resultado[projeto] for projeto in projetos}
+
+    def _montar_matriz(self, lista):
+        """
+        Lê os documentos uma única vez e monta as matrizes campo × documento
+        Documentos do mesmo schema repetem as chaves de cada seção, então a
+        posição dos campos é calculada uma vez por formato de seção e os valores
+        são codificados em bloco (map sobre o dicionário de códigos)
+        """
+        n = len(lista)
+        indice_campo = {}
+        campos = []
+        formatos = {}
+        codigo_valor = {None: -1}
+        linhas, colunas, codigos = [], [], []
+        confianca_secoes = np.zeros((len(SECOES_CONSOLIDACAO), n), dtype=np.float64)
+
+        for d, req in enumerate(lista):
+            confianca = req.get('confianca_extracao') or {}
+            for s, secao in enumerate(SECOES_CONSOLIDACAO):
+                confianca_secoes[s, d] = confianca.get(secao, 0.0)
+
+            secoes = req.get('requisitos') or {}
+            for secao in SECOES_CONSOLIDACAO:
+                valores_secao = secoes.get(secao)
+                if not valores_secao:
+                    continue
+
+                formato = (secao, tuple(valores_secao))
+                posicoes = formatos.get(formato)
+                if posicoes is None:
+                    posicoes = formatos[formato] = [
+                        indice_campo.setdefault((secao, campo), len(indice_campo)) for campo in formato[1]
+                    ]
+                    campos = list(indice_campo)
+
+                try:
+                    codigos_secao = list(map(codigo_valor.get, valores_secao.values()))
+                except TypeError:
+                    # Listas/dicionários não são hasheáveis: vão pela forma canônica
+                    codigos_secao = [
+                        self._codificar(valor, codigo_valor) if isinstance(valor, (list, dict)) else codigo_valor.get(valor)
+                        for valor in valores_secao.values()
+                    ]
+                if None in codigos_secao:
+                    codigos_secao = [
+                        c if c is not None else self._codificar(valor, codigo_valor)
+                        for c, valor in zip(codigos_secao, valores_secao.values())
+                    ]
+
+                linhas.extend(posicoes)
+                colunas.extend([d] * len(posicoes))
+                codigos.extend(codigos_secao)
+
+        secao_do_campo = np.array([SECOES_CONSOLIDACAO.index(secao) for secao, _ in campos], dtype=np.intp)
+        linhas = np.array(linhas, dtype=np.intp)
+        colunas = np.array(colunas, dtype=np.intp)
+        codigos = np.array(codigos, dtype=np.int64)
+
+        presente = np.zeros((len(campos), n), dtype=bool)
+        presente[linhas, colunas] = True
+
+        com_valor = codigos >= 0
+        linhas = linhas[com_valor]
+        colunas = colunas[com_valor]
+
+        confianca = np.full((len(campos), n), SEM_VALOR, dtype=np.float64)
+        confianca[linhas, colunas] = confianca_secoes[secao_do_campo[linhas], colunas]
+
+        codigo = np.full((len(campos), n), -1, dtype=np.int64)
+        codigo[linhas, colunas] = codigos[com_valor]
+
+        return {
+            "campos": campos,
+            "confianca": confianca,
+            "codigo": codigo,
+            "presente": presente,
+            "confianca_secoes": confianca_secoes
+        }
+
+    def _codificar(self, valor, codigo_valor):
+        """
+        Código de um valor novo (ou não hasheável)
+        Valores iguais em Python (15 e 15.0) recebem o mesmo código e não contam como conflito
+        """
+        if isinstance(valor, dict):
+            chave = ('json', json.dumps(valor, sort_keys=True, ensure_ascii=False))
+        elif isinstance(valor, list):
+            try:
+                chave = ('lista',) + tuple(valor)
+            except TypeError:
+                chave = ('json', json.dumps(valor, sort_keys=True, ensure_ascii=False))
+        else:
+            chave = valor
+        codigo = codigo_valor.get(chave)
+        if codigo is None:
+            codigo = codigo_valor[chave] = len(codigo_valor) - 1
+        return codigo
+
+    def _resolver(self, matriz, inicios, tamanhos):
+        """Escolhe, para cada campo × projeto, o documento vencedor e detecta conflitos"""
+        confianca = matriz['confianca']
+        codigo = matriz['codigo']
+        n = confianca.shape[1]
+
+        melhor = np.maximum.reduceat(confianca, inicios, axis=1)
+        com_valor = melhor > SEM_VALOR
+
+        # Primeiro documento do projeto que atinge a maior confiança
+        colunas = np.broadcast_to(np.arange(n), confianca.shape)
+        empatados = confianca == np.repeat(melhor, tamanhos, axis=1)
+        vencedor = np.minimum.reduceat(np.where(empatados, colunas, n), inicios, axis=1)
+
+        tem = confianca > SEM_VALOR
+        menor_codigo = np.minimum.reduceat(np.where(tem, codigo, np.iinfo(np.int64).max), inicios, axis=1)
+        maior_codigo = np.maximum.reduceat(np.where(tem, codigo, -1), inicios, axis=1)
+
+        secoes = matriz['confianca_secoes'][[SECOES_CONSOLIDACAO.index(s) for s in SECOES_CONFIANCA]]
+
+        return {
+            "com_valor": com_valor,
+            "vencedor": vencedor,
+            "melhor": melhor,
+            "conflito": com_valor & (menor_codigo != maior_codigo),
+            "no_projeto": np.logical_or.reduceat(matriz['presente'], inicios, axis=1),
+            "confianca_media": np.add.reduceat(secoes, inicios, axis=1) / tamanhos
+        }
+
+    def _montar_consolidado(self, matriz, escolha, p, inicio, documentos, data):
+        """Monta o JSON consolidado de um projeto a partir da coluna p das escolhas"""
+        campos = matriz['campos']
+        nomes = [req.get('documento_origem') for req in documentos]
+
+        consolidado = {
+            "documentos_origem": nomes,
+            "data_extracao": data,
+            "requisitos": {secao: {} for secao in SECOES_CONSOLIDACAO},
+            "informacoes_faltantes": [],
+            "confianca_extracao": {
+                secao: float(escolha['confianca_media'][s, p]) for s, secao in enumerate(SECOES_CONFIANCA)
+            },
+            "observacoes": [f"Requisitos consolidados de {len(documentos)} documentos"],
+            "proveniencia": {},
+            "conflitos": []
+        }
+
+        # Colunas do projeto como listas Python: indexar numpy célula a célula é lento
+        com_valor = escolha['com_valor'][:, p].tolist()
+        vencedor = escolha['vencedor'][:, p].tolist()
+        melhor = escolha['melhor'][:, p].tolist()
+        linhas_conflito = np.flatnonzero(escolha['conflito'][:, p])
+        codigos_conflito = dict(zip(
+            linhas_conflito.tolist(),
+            matriz['codigo'][linhas_conflito, inicio:inicio + len(documentos)].tolist()
+        ))
+
+        for j in np.flatnonzero(escolha['no_projeto'][:, p]).tolist():
+            secao, campo = campos[j]
+            nome_campo = f"{secao}.{campo}"
+
+            if not com_valor[j]:
+                consolidado['requisitos'][secao][campo] = None
+                consolidado['informacoes_faltantes'].append(nome_campo)
+                continue
+
+            d = vencedor[j] - inicio
+            valor = documentos[d]['requisitos'][secao][campo]
+            consolidado['requisitos'][secao][campo] = valor
+            consolidado['proveniencia'][nome_campo] = {"documento": nomes[d], "confianca": melhor[j]}
+
+            if j in codigos_conflito:
+                consolidado['conflitos'].append(
+                    self._descrever_conflito(codigos_conflito[j], documentos, nomes, secao, campo, valor)
+                )
+
+        return consolidado
+
+    def _descrever_conflito(self, codigos, documentos, nomes, secao, campo, escolhido):
+        """Lista os valores divergentes de um campo e os documentos de cada um"""
+        valores = []
+        for codigo in dict.fromkeys(codigos):
+            if codigo < 0:
+                continue
+            posicoes = [i for i, c in enumerate(codigos) if c == codigo]
+            valores.append({
+                "valor": documentos[posicoes[0]]['requisitos'][secao][campo],
+                "documentos": [nomes[i] for i in posicoes]
+            })
+
+        return {
+            "campo": f"{secao}.{campo}",
+            "escolhido": escolhido,
+            "criterio": "maior confiança",
+            "valores": valores
+        }
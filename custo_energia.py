@@ -0,0 +1,277 @@
+"""
+Custo de Energia - Desafio Siemens Energy
+Custo anual de energia, TCO e payback contra a referência IE2, calculados de uma
+vez para todos os motores de um CatalogoColunar a partir das curvas de rendimento
+do catálogo (50, 75 e 100% da carga nominal)
+"""
+
+import os
+
+import numpy as np
+
+# Cenário padrão (configurável no .env)
+TARIFA_PADRAO_BRL_KWH = 0.70
+HORIZONTE_PADRAO_ANOS = 5
+# Horas por ano em cada fração da carga nominal (bomba em regime contínuo S1, 8000 h/ano)
+PERFIL_PADRAO = "0.5:2000,0.75:4000,1.0:2000"
+
+# Cargas em que o catálogo publica o rendimento (rendimento_50/75/100_carga_percent)
+_CARGAS_PUBLICADAS = np.array([0.5, 0.75, 1.0])
+
+# Rendimento nominal mínimo IE2 a 60 Hz (IEC 60034-30-1, tabela de 60 Hz) por número de polos,
+# nas potências de _POTENCIAS_IE2_KW. Potências intermediárias: interpolação no logaritmo da potência.
+_POTENCIAS_IE2_KW = np.array([0.75, 1.1, 1.5, 2.2, 3.7, 5.5, 7.5, 11, 15, 18.5, 22, 30, 37, 45, 55, 75, 90, 110, 150])
+RENDIMENTO_IE2_60HZ = {
+    2: (75.5, 82.5, 84.0, 85.5, 87.5, 88.5, 89.5, 90.2, 90.2, 91.0, 91.0, 91.7, 92.4, 93.0, 93.0, 93.6, 94.5, 94.5, 95.0),
+    4: (82.5, 84.0, 84.0, 87.5, 87.5, 89.5, 89.5, 91.0, 91.0, 92.4, 92.4, 93.0, 93.0, 93.6, 94.1, 94.5, 94.5, 95.0, 95.0),
+    6: (80.0, 85.5, 86.5, 87.5, 87.5, 89.5, 89.5, 90.2, 90.2, 91.7, 91.7, 93.0, 93.0, 93.6, 93.6, 94.1, 94.1, 95.0, 95.0)
+}
+
+_IE2 = 2
+
+
+def ler_perfil(texto):
+    """Perfil de carga "0.5:2000,0.75:4000,1.0:2000" -> {0.5: 2000.0, 0.75: 4000.0, 1.0: 2000.0}"""
+    perfil = {}
+    for item in str(texto).split(','):
+        if not item.strip():
+            continue
+        try:
+            fracao, horas = (float(parte) for parte in item.split(':'))
+        except ValueError:
+            raise ValueError(f"perfil de carga inválido: {item!r} (use fração:horas, ex: 0.75:4000)")
+        perfil[fracao] = perfil.get(fracao, 0.0) + horas
+    return perfil
+
+
+class CenarioEnergia:
+    """Tarifa (R$/kWh), horizonte do TCO (anos) e perfil de carga {fração da carga nominal: horas por ano}"""
+
+    def __init__(self, tarifa_brl_kwh=TARIFA_PADRAO_BRL_KWH, horizonte_anos=HORIZONTE_PADRAO_ANOS, perfil=None):
+        self.tarifa_brl_kwh = float(tarifa_brl_kwh)
+        self.horizonte_anos = float(horizonte_anos)
+        self.perfil = dict(perfil if perfil is not None else ler_perfil(PERFIL_PADRAO))
+        if self.tarifa_brl_kwh < 0 or self.horizonte_anos <= 0:
+            raise ValueError("tarifa deve ser >= 0 e horizonte > 0")
+        if not self.perfil or any(fracao <= 0 or horas < 0 for fracao, horas in self.perfil.items()):
+            raise ValueError("perfil de carga deve ter frações > 0 e horas >= 0")
+
+    @property
+    def horas_ano(self):
+        return sum(self.perfil.values())
+
+    def resumo(self):
+        """Cenário para o relatório"""
+        return {
+            "tarifa_brl_kwh": self.tarifa_brl_kwh,
+            "horizonte_anos": self.horizonte_anos,
+            "horas_ano": self.horas_ano,
+            "perfil_carga": [
+                {"carga_percent": round(fracao * 100, 1), "horas_ano": horas} for fracao, horas in sorted(self.perfil.items())
+            ]
+        }
+
+
+def cenario_padrao():
+    """Cenário do .env (ENERGIA_TARIFA_BRL_KWH, ENERGIA_HORIZONTE_ANOS, ENERGIA_PERFIL_CARGA)"""
+    return CenarioEnergia(
+        float(os.getenv('ENERGIA_TARIFA_BRL_KWH') or TARIFA_PADRAO_BRL_KWH),
+        float(os.getenv('ENERGIA_HORIZONTE_ANOS') or HORIZONTE_PADRAO_ANOS),
+        ler_perfil(os.getenv('ENERGIA_PERFIL_CARGA') or PERFIL_PADRAO)
+    )
+
+
+def curva_rendimento(colunas):
+    """
+    Rendimentos (%) de cada motor a 50, 75 e 100% da carga, matriz (n, 3)
+    Pontos ausentes são completados pelos vizinhos (só o de 100%: curva
+    plana); valores fora de (0, 100] contam como ausentes.
+    """
+    r50, r75, r100 = (
+        np.where((r > 0) & (r <= 100), r, np.nan)
+        for r in (colunas.rendimento_50, colunas.rendimento_75, colunas.rendimento_100)
+    )
+    r100 = np.where(np.isnan(r100), np.where(np.isnan(r75), r50, r75), r100)
+    r50 = np.where(np.isnan(r50), np.where(np.isnan(r75), r100, r75), r50)
+    r75 = np.where(np.isnan(r75), (r50 + r100) / 2, r75)
+    return np.column_stack((r50, r75, r100))
+
+
+def rendimento_em_carga(curva, fracao):
+    """
+    Rendimento (%) de cada motor numa fração da carga nominal
+    Interpolação linear entre os pontos publicados; abaixo de 50% e acima de
+    100% vale o ponto mais próximo.
+    """
+    fracao = min(max(fracao, _CARGAS_PUBLICADAS[0]), _CARGAS_PUBLICADAS[-1])
+    j = min(int(np.searchsorted(_CARGAS_PUBLICADAS, fracao, side='right')) - 1, len(_CARGAS_PUBLICADAS) - 2)
+    t = (fracao - _CARGAS_PUBLICADAS[j]) / (_CARGAS_PUBLICADAS[j + 1] - _CARGAS_PUBLICADAS[j])
+    return curva[:, j] * (1 - t) + curva[:, j + 1] * t
+
+
+def numero_polos(colunas):
+    """Polos informados ou, na falta, estimados pela rotação nominal e frequência (1760 rpm a 60 Hz -> 4)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        estimados = 2 * np.round(60 * colunas.frequencia_hz / colunas.rotacao_rpm)
+    return np.where(np.isnan(colunas.numero_polos), estimados, colunas.numero_polos)
+
+
+def rendimento_referencia_ie2(colunas):
+    """Rendimento mínimo IE2 (%) para a potência e os polos de cada motor (NaN fora da tabela de 60 Hz)"""
+    referencia = np.full(len(colunas), np.nan)
+    polos = numero_polos(colunas)
+    potencia = colunas.potencia_kw
+    em_60hz = np.abs(colunas.frequencia_hz - 60) < 0.5
+    for polos_tabela, rendimentos in RENDIMENTO_IE2_60HZ.items():
+        mascara = em_60hz & (polos == polos_tabela) & (potencia > 0)
+        referencia[mascara] = np.interp(np.log(potencia[mascara]), np.log(_POTENCIAS_IE2_KW), rendimentos)
+    return referencia
+
+
+def _chaves_potencia_polos(colunas):
+    """Potência (centésimos de kW) e polos numa chave int64; -1 quando falta um deles"""
+    potencia = np.round(colunas.potencia_kw * 100)
+    polos = numero_polos(colunas)
+    validas = ~np.isnan(potencia) & ~np.isnan(polos) & (potencia >= 0) & (polos > 0) & (polos < 100)
+    chaves = np.full(len(colunas), -1, dtype=np.int64)
+    chaves[validas] = potencia[validas].astype(np.int64) * 100 + polos[validas].astype(np.int64)
+    return chaves
+
+
+class PrecosReferenciaIE2:
+    """
+    Menor preço de motor IE2 do catálogo por potência e número de polos
+
+    É a base do payback: quanto um motor custa a mais que o IE2 equivalente
+    mais barato. acrescentar() pode ser chamado bloco a bloco (catálogo em
+    fluxo); a referência não depende da ordem nem do tamanho dos blocos.
+    """
+
+    def __init__(self, colunas=None):
+        self._chaves = np.empty(0, dtype=np.int64)
+        self._precos = np.empty(0)
+        if colunas is not None:
+            self.acrescentar(colunas)
+
+    def __len__(self):
+        return len(self._chaves)
+
+    def acrescentar(self, colunas):
+        chaves = _chaves_potencia_polos(colunas)
+        validos = (colunas.eficiencia == _IE2) & ~np.isnan(colunas.preco_brl) & (chaves >= 0)
+        chaves = np.concatenate((self._chaves, chaves[validos]))
+        precos = np.concatenate((self._precos, colunas.preco_brl[validos]))
+        self._chaves, grupos = np.unique(chaves, return_inverse=True)
+        self._precos = np.full(len(self._chaves), np.inf)
+        np.minimum.at(self._precos, grupos, precos)
+
+    def consultar(self, colunas):
+        """Preço de referência de cada motor (NaN se o catálogo não tem IE2 equivalente)"""
+        chaves = _chaves_potencia_polos(colunas)
+        if not len(self._chaves):
+            return np.full(len(chaves), np.nan)
+        posicoes = np.minimum(np.searchsorted(self._chaves, chaves), len(self._chaves) - 1)
+        encontradas = (self._chaves[posicoes] == chaves) & (chaves >= 0)
+        return np.where(encontradas, self._precos[posicoes], np.nan)
+
+
+def financeiro(custo_aquisicao, preco_referencia, energia_kwh, energia_referencia_kwh, tarifa_brl_kwh, horizonte_anos):
+    """
+    Custo anual de energia, economia e payback contra a referência IE2 e TCO, elemento a elemento
+    TCO = aquisição + horizonte x energia anual (sem desconto). Payback 0
+    quando o motor não custa mais que a referência; NaN quando a economia
+    anual não é positiva (não se paga) ou falta dado. tco_5anos_brl mantém
+    o campo dos relatórios anteriores: o TCO em 5 anos, qualquer que seja o horizonte.
+    """
+    custo_aquisicao = np.asarray(custo_aquisicao, dtype=float)
+    custo_energia = np.asarray(energia_kwh, dtype=float) * tarifa_brl_kwh
+    economia = (np.asarray(energia_referencia_kwh, dtype=float) - np.asarray(energia_kwh, dtype=float)) * tarifa_brl_kwh
+    sobrecusto = custo_aquisicao - np.asarray(preco_referencia, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payback = np.where(sobrecusto <= 0, 0.0, np.where(economia > 0, sobrecusto / economia, np.nan))
+    payback[np.isnan(sobrecusto) | np.isnan(economia)] = np.nan
+    return {
+        "custo_energia_anual_estimado_brl": custo_energia,
+        "economia_vs_ie2_anual_brl": economia,
+        "payback_vs_ie2_anos": payback,
+        "tco_brl": custo_aquisicao + horizonte_anos * custo_energia,
+        "tco_5anos_brl": custo_aquisicao + 5 * custo_energia
+    }
+
+
+def aplicar_cenario(custos, tarifa_brl_kwh, horizonte_anos):
+    """
+    Refaz o financeiro de várias analise_custo_beneficio do relatório para outra tarifa e horizonte
+    A energia (kWh) não depende deles, então o resultado é o mesmo que
+    recalcular o catálogo (usado na varredura de cenários do Streamlit).
+    """
+    def coluna(campo):
+        return np.array([(custo or {}).get(campo) for custo in custos], dtype=float)
+
+    return financeiro(
+        coluna('custo_aquisicao_brl'), coluna('preco_referencia_ie2_brl'),
+        coluna('energia_anual_kwh'), coluna('energia_anual_referencia_ie2_kwh'),
+        tarifa_brl_kwh, horizonte_anos
+    )
+
+
+class CalculadoraEnergia:
+    """Custo de energia, TCO e payback de todos os motores de um CatalogoColunar, num único passe vetorizado"""
+
+    def __init__(self, cenario=None):
+        self.cenario = cenario or cenario_padrao()
+
+    def energia_anual(self, colunas):
+        """(kWh/ano de cada motor, kWh/ano do IE2 de referência, rendimento médio ponderado %)"""
+        curva = curva_rendimento(colunas)
+        referencia = rendimento_referencia_ie2(colunas)
+        energia = np.zeros(len(colunas))
+        energia_referencia = np.zeros(len(colunas))
+        util = np.zeros(len(colunas))
+        for fracao, horas in sorted(self.cenario.perfil.items()):
+            entregue = colunas.potencia_kw * fracao * horas
+            energia += entregue / (rendimento_em_carga(curva, fracao) / 100)
+            energia_referencia += entregue / (referencia / 100)
+            util += entregue
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rendimento_medio = util / energia * 100
+        return energia, energia_referencia, rendimento_medio
+
+    def calcular(self, colunas, referencias=None):
+        """Vetores por motor (NaN onde falta dado) com energia, preços de referência e financeiro"""
+        energia, energia_referencia, rendimento_medio = self.energia_anual(colunas)
+        preco_referencia = referencias.consultar(colunas) if referencias is not None else np.full(len(colunas), np.nan)
+        calculo = {
+            "custo_aquisicao_brl": colunas.preco_brl,
+            "energia_anual_kwh": energia,
+            "rendimento_medio_percent": rendimento_medio,
+            "energia_anual_referencia_ie2_kwh": energia_referencia,
+            "preco_referencia_ie2_brl": preco_referencia
+        }
+        calculo.update(financeiro(
+            colunas.preco_brl, preco_referencia, energia, energia_referencia,
+            self.cenario.tarifa_brl_kwh, self.cenario.horizonte_anos
+        ))
+        return calculo
+
+    def analises(self, colunas, referencias=None):
+        """analise_custo_beneficio de cada motor para o relatório (None onde falta dado)"""
+        calculo = self.calcular(colunas, referencias)
+        # Energia sem arredondar: aplicar_cenario parte dela e precisa reproduzir os valores em R$
+        exatos = ("energia_anual_kwh", "energia_anual_referencia_ie2_kwh")
+        analises = []
+        for i in range(len(colunas)):
+            analise = {
+                "tarifa_brl_kwh": self.cenario.tarifa_brl_kwh,
+                "horizonte_anos": self.cenario.horizonte_anos,
+                "horas_ano": self.cenario.horas_ano
+            }
+            for campo, valores in calculo.items():
+                valor = float(valores[i])
+                if not np.isfinite(valor):
+                    valor = None
+                elif campo not in exatos:
+                    valor = round(valor, 2)
+                analise[campo] = valor
+            analises.append(analise)
+        return analises
@@ -0,0 +1,152 @@
+"""
+Etapa de Parsing de PDFs - Desafio Siemens Energy
+Lê os PDFs em processos separados (o PyPDF2 é CPU-bound e segura o GIL) e entrega as páginas por uma fila
+"""
+
+import PyPDF2
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Fim da fila
+_FIM = object()
+
+
+def contar_paginas(caminho_pdf):
+    with open(caminho_pdf, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def extrair_paginas(caminho_pdf, inicio, fim):
+    """
+    Extrai o texto das páginas [inicio, fim) (executa no processo de parsing)
+    Retorna (textos, segundos de CPU gastos)
+    """
+    relogio = time.process_time()
+    with open(caminho_pdf, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        textos = [pdf_reader.pages[i].extract_text() for i in range(inicio, fim)]
+    return textos, time.process_time() - relogio
+
+
+class EtapaParsing:
+    """
+    Produz (posicao, paginas, erro) para cada PDF, na ordem em que ficam prontos
+
+    PDFs já no cache saem imediatamente; os demais são divididos em tarefas de
+    paginas_por_tarefa páginas distribuídas entre `processos` processos. Quando
+    todas as tarefas de um documento terminam, o texto é gravado no cache e o
+    documento entra na fila, sem esperar pelos outros. `paginas` é uma lista de
+    (numero_pagina, texto); em caso de falha vem None com o erro.
+    """
+
+    def __init__(self, cache_pdf, processos=None, paginas_por_tarefa=8):
+        self.cache_pdf = cache_pdf
+        self.processos = processos or os.cpu_count() or 1
+        self.paginas_por_tarefa = paginas_por_tarefa
+        self.documentos = 0
+        self.do_cache = 0
+        self.paginas_lidas = 0
+        self.tempo_cpu = 0.0
+        self.tempo_parede = 0.0
+
+    def executar(self, lista_pdfs):
+        """Gera os documentos à medida que ficam prontos (o parsing roda em segundo plano)"""
+        fila = queue.Queue()
+        produtor = threading.Thread(target=self._produzir, args=(lista_pdfs, fila), daemon=True)
+        produtor.start()
+
+        while True:
+            item = fila.get()
+            if item is _FIM:
+                break
+            yield item
+
+        produtor.join()
+
+    def _produzir(self, lista_pdfs, fila):
+        inicio = time.perf_counter()
+        executor = None
+        documentos = {}
+        futuros = {}
+
+        try:
+            for posicao, caminho_pdf in enumerate(lista_pdfs):
+                self.documentos += 1
+                try:
+                    chave = self.cache_pdf.chave(caminho_pdf)
+                    paginas = self.cache_pdf.iterar(chave)
+                    if paginas is not None:
+                        self.do_cache += 1
+                        fila.put((posicao, list(paginas), None))
+                        continue
+                    total = contar_paginas(caminho_pdf)
+                except Exception as e:
+                    fila.put((posicao, None, e))
+                    continue
+
+                if total == 0:
+                    fila.put((posicao, [], None))
+                    continue
+
+                # O pool só é criado se algum PDF precisar ser lido
+                if executor is None:
+                    executor = ProcessPoolExecutor(
+                        max_workers=self.processos,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+
+                partes = list(range(0, total, self.paginas_por_tarefa))
+                documentos[posicao] = {"caminho": caminho_pdf, "chave": chave, "textos": [None] * len(partes), "faltam": len(partes)}
+                for indice, pagina in enumerate(partes):
+                    futuro = executor.submit(
+                        extrair_paginas, caminho_pdf, pagina, min(pagina + self.paginas_por_tarefa, total)
+                    )
+                    futuros[futuro] = (posicao, indice)
+
+            for futuro in as_completed(futuros):
+                posicao, indice = futuros[futuro]
+                doc = documentos.get(posicao)
+                if doc is None:
+                    continue  # já falhou por outra tarefa
+
+                try:
+                    textos, cpu = futuro.result()
+                except Exception as e:
+                    del documentos[posicao]
+                    fila.put((posicao, None, e))
+                    continue
+
+                self.tempo_cpu += cpu
+                self.paginas_lidas += len(textos)
+                doc['textos'][indice] = textos
+                doc['faltam'] -= 1
+
+                if doc['faltam'] == 0:
+                    del documentos[posicao]
+                    textos_doc = [texto for parte in doc['textos'] for texto in parte]
+                    try:
+                        self.cache_pdf.gravar(doc['chave'], textos_doc, Path(doc['caminho']).name)
+                    except OSError:
+                        pass  # sem cache o documento ainda pode ser extraído
+                    fila.put((posicao, list(enumerate(textos_doc, 1)), None))
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            self.tempo_parede = time.perf_counter() - inicio
+            fila.put(_FIM)
+
+    def estatisticas(self):
+        """Contadores e tempos da etapa"""
+        return {
+            "processos": self.processos,
+            "documentos": self.documentos,
+            "do_cache": self.do_cache,
+            "paginas_lidas": self.paginas_lidas,
+            "tempo_cpu": self.tempo_cpu,
+            "tempo_parede": self.tempo_parede
+        }
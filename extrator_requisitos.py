@@ -3,17 +3,89 @@ Extrator de Requisitos de Motores Elétricos - Desafio Siemens Energy
 Extrai especificações técnicas de documentos PDF usando LLM
 """
 
-from groq import Groq
 import PyPDF2
+import io
+import itertools
 import json
 import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dotenv import load_dotenv
 from pathlib import Path
 from datetime import datetime
+from cache_pdf import CachePDF
+from cache_llm import criar_cache_padrao
+from cliente_llm import ClienteLLM
+from selecao_relevancia import dividir_em_secoes, perfil_secao, selecionar_secoes
+from pre_extrator import PreExtrator
+from consolidacao import ConsolidadorRequisitos
+from etapa_parsing import EtapaParsing, contar_paginas
+from manifesto_extracao import ManifestoExtracao, dir_saida_projeto, listar_pdfs
 
 # Carrega variáveis de ambiente
 load_dotenv()
 
+# Campos extraídos de cada documento, por seção (define o formato de saída pedido ao LLM)
+SCHEMA_REQUISITOS = {
+    "eletricos": [
+        "potencia_kw", "potencia_cv", "potencia_hp", "tensao_v", "tensao_tolerancia",
+        "corrente_nominal_a", "frequencia_hz", "numero_fases", "fator_potencia",
+        "fator_potencia_desejado", "classe_isolamento", "elevacao_temperatura_classe",
+        "eficiencia_minima", "eficiencia_desejada", "categoria_partida", "tipo_partida",
+        "preparado_inversor", "resistencia_isolamento_min_mohm"
+    ],
+    "mecanicos": [
+        "rotacao_rpm", "rotacao_tolerancia_rpm", "rotacao_tolerancia_percentual", "numero_polos",
+        "torque_nominal_nm", "torque_partida_percentual", "torque_maximo_percentual",
+        "tipo_montagem", "forma_construtiva_iec", "tipo_acoplamento", "sentido_rotacao",
+        "altura_eixo_mm", "carcaca_iec", "tipo_eixo", "tipo_rolamento", "peso_kg", "dimensoes_mm"
+    ],
+    "operacionais": [
+        "grau_protecao", "eficiencia", "regime_trabalho", "temp_ambiente_min_c",
+        "temp_ambiente_max_c", "temp_ambiente_nominal_c", "umidade_relativa_max_percent",
+        "umidade_condensante", "altitude_max_m", "tipo_refrigeracao", "classe_vibracao",
+        "classe_vibracao_norma", "nivel_ruido_max_dba", "nivel_ruido_referencia"
+    ],
+    "aplicacao": [
+        "tipo_bomba", "fabricante_bomba", "modelo_bomba", "fluido", "fluido_descricao",
+        "vazao_m3h", "altura_manometrica_m", "pressao_recalque_bar", "temperatura_fluido_min_c",
+        "temperatura_fluido_max_c", "regime_operacao", "ambiente", "ambiente_descricao",
+        "condicoes_especiais", "normas"
+    ],
+    "protecoes": [
+        "protecao_termica_tipo", "protecao_termica_quantidade", "protecao_termica_localizacao",
+        "caixa_ligacao_posicionamento", "caixa_ligacao_grau_protecao", "terminal_aterramento"
+    ],
+    "comercial": [
+        "garantia_minima_meses", "garantia_desejada_meses", "prazo_entrega_maximo_dias",
+        "prazo_entrega_desejado_dias", "orcamento_disponivel_brl", "certificacao_inmetro"
+    ]
+}
+
+CAMPOS_LISTA = {"normas"}
+SECOES_CONFIANCA = ["eletricos", "mecanicos", "operacionais", "aplicacao"]
+
+# Campos que, encontrados pelas regras com alta confiança, permitem dispensar o LLM em datasheets simples
+CAMPOS_ESSENCIAIS = [
+    ("eletricos", "potencia_kw"), ("eletricos", "tensao_v"), ("eletricos", "frequencia_hz"),
+    ("mecanicos", "rotacao_rpm"), ("mecanicos", "numero_polos"), ("operacionais", "grau_protecao")
+]
+
+
+def _concluido(valor):
+    """Futuro já resolvido com `valor` (mesma interface dos enviados ao pool)"""
+    futuro = Future()
+    futuro.set_result(valor)
+    return futuro
+
+
+def _como_lista(valor):
+    if valor is None:
+        return []
+    return valor if isinstance(valor, list) else [valor]
+
 
 class ExtratorRequisitos:
     """
@@ -22,81 +94,435 @@ class ExtratorRequisitos:
     """
     
     def __init__(self):
-        self.client = Groq(api_key=os.getenv('GROQ_API_KEY'))
         self.model = "llama-3.3-70b-versatile"
+        self.llm = ClienteLLM(self.model, cache=criar_cache_padrao())
+        self.cache_pdf = CachePDF()
+        self.max_caracteres_bloco = 24000  # ~6k tokens de documento por requisição
+        self.max_blocos_em_voo = 2
+        self.selecao_relevancia = True  # documentos longos: só as seções relevantes vão ao LLM
+        self.confianca_minima_regras = 0.75  # campos das regras acima disso não são pedidos ao LLM
+        self.dispensar_llm_simples = True
+        self.max_caracteres_simples = 2500
+        self.empacotar_pequenos = True  # documentos curtos dividem uma requisição
+        self.max_caracteres_pequeno = 8000  # ~2 páginas
+        self.max_caracteres_pacote = 24000
+        self.max_documentos_pacote = 5
+        # Leitura dos PDFs em processos: None = todos os núcleos a partir de min_pdfs_processos
+        # PDFs ou min_paginas_processos páginas no lote; 1 = nas threads do LLM (EXTRATOR_PROCESSOS)
+        self.processos_parsing = None
+        self.min_pdfs_processos = 4
+        self.min_paginas_processos = 32
+        self.paginas_por_tarefa = 8
+    
+    def iterar_paginas_pdf(self, caminho_pdf, saida=None):
+        """
+        Gera (numero_pagina, texto) página a página, sem montar o documento inteiro
+        Usa o cache quando o arquivo não mudou; senão lê com PyPDF2 e grava o
+        cache à medida que avança.
+        """
+        chave = self.cache_pdf.chave(caminho_pdf)
+        paginas = self.cache_pdf.iterar(chave)
+        
+        if paginas is not None:
+            print("♻️  Texto reaproveitado do cache", file=saida)
+            yield from paginas
+            return
+        
+        with open(caminho_pdf, 'rb') as file, self.cache_pdf.escritor(chave, Path(caminho_pdf).name) as escritor:
+            pdf_reader = PyPDF2.PdfReader(file)
+            
+            for numero, pagina in enumerate(pdf_reader.pages, 1):
+                texto = pagina.extract_text()
+                escritor.adicionar(numero, texto)
+                yield numero, texto
     
-    def extrair_texto_pdf(self, caminho_pdf):
-        """Extrai texto completo do PDF"""
+    def extrair_texto_pdf(self, caminho_pdf, saida=None):
+        """Extrai texto completo do PDF (reaproveita o cache se o arquivo não mudou)"""
         try:
-            with open(caminho_pdf, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                texto_completo = ""
+            return "".join(texto + "\n" for _, texto in self.iterar_paginas_pdf(caminho_pdf, saida))
+        except Exception as e:
+            print(f"❌ Erro ao ler PDF {caminho_pdf}: {e}", file=saida)
+            return None
+    
+    def extrair_requisitos(self, caminho_pdf, saida=None, paginas=None):
+        """
+        Extrai requisitos técnicos do PDF usando regras locais + LLM
+        Mensagens de progresso vão para `saida` (padrão: console); `paginas`
+        são as páginas já lidas, como (numero, texto), quando o PDF passou
+        pela etapa de parsing em processos
+        
+        Campos de padrão fixo (potência, tensão, IP, rpm, normas...) são
+        preenchidos por PreExtrator; o LLM recebe só os campos restantes, e em
+        datasheets curtos com todos os CAMPOS_ESSENCIAIS nem é chamado.
+        
+        O texto é consumido página a página em blocos de até max_caracteres_bloco.
+        Documentos que cabem em um bloco geram uma única requisição. Nos maiores,
+        as seções são pontuadas por relevância e só as relevantes seguem (ver
+        _extrair_selecionando); sem seleção, são extraídos bloco a bloco (cada
+        bloco vai ao LLM assim que fica pronto) e os resultados parciais são mesclados.
+        """
+        nome_arquivo = Path(caminho_pdf).name
+        
+        self._imprimir_inicio(nome_arquivo, saida)
+        
+        # As regras locais acompanham o fluxo de páginas
+        pre_extrator = PreExtrator()
+        
+        try:
+            fonte = iter(paginas) if paginas is not None else self.iterar_paginas_pdf(caminho_pdf, saida)
+            paginas_pdf = pre_extrator.observar(fonte)
+            blocos = self._agrupar_em_blocos(paginas_pdf)
+            primeiro = next(blocos, None)
+            segundo = next(blocos, None) if primeiro else None
+        except Exception as e:
+            print(f"❌ Erro ao ler PDF {caminho_pdf}: {e}", file=saida)
+            return None
+        
+        if not primeiro or not self._texto_bloco(primeiro).strip():
+            return None
+        
+        try:
+            if segundo is None:
+                texto_pdf = self._texto_bloco(primeiro)
+                print(f"✅ Texto extraído ({len(texto_pdf)} caracteres)", file=saida)
                 
-                for pagina in pdf_reader.pages:
-                    texto_completo += pagina.extract_text() + "\n"
+                pre_extraidos = self._pre_extraidos_confiaveis(pre_extrator, saida)
                 
-                return texto_completo
+                if self._dispensa_llm(texto_pdf, pre_extraidos):
+                    print("⏭️  Datasheet simples: LLM dispensado", file=saida)
+                    requisitos = self._requisitos_pre_extraidos(pre_extraidos)
+                else:
+                    # Analisa com LLM
+                    print("🤖 Analisando com LLM (Groq - Llama 3.3)...", file=saida)
+                    
+                    prompt = self._criar_prompt_extracao(texto_pdf, nome_arquivo, pre_extraidos=pre_extraidos)
+                    requisitos = self._chamar_llm_extracao(prompt, saida=saida, progresso=True)
+            else:
+                todas_paginas = itertools.chain.from_iterable(itertools.chain([primeiro, segundo], blocos))
+                
+                if self.selecao_relevancia:
+                    requisitos = self._extrair_selecionando(caminho_pdf, nome_arquivo, todas_paginas, saida)
+                else:
+                    blocos_texto = (
+                        (self._texto_bloco(bloco), (bloco[0][0], bloco[-1][0]))
+                        for bloco in self._agrupar_em_blocos(todas_paginas)
+                    )
+                    requisitos = self._extrair_em_blocos(nome_arquivo, blocos_texto, saida)
+                
+                # Só agora as regras viram o documento inteiro
+                pre_extraidos = self._pre_extraidos_confiaveis(pre_extrator, saida)
+            
+            return self._finalizar_requisitos(requisitos, nome_arquivo, pre_extrator, pre_extraidos, saida)
+            
         except Exception as e:
-            print(f"❌ Erro ao ler PDF {caminho_pdf}: {e}")
+            print(f"❌ Erro ao processar com LLM: {e}", file=saida)
             return None
     
-    def extrair_requisitos(self, caminho_pdf):
+    def _finalizar_requisitos(self, requisitos, nome_arquivo, pre_extrator, pre_extraidos, saida=None):
+        """Aplica a pré-extração e acrescenta origem e data ao resultado do LLM"""
+        requisitos = self._aplicar_pre_extracao(requisitos, pre_extrator.campos(), pre_extraidos)
+        
+        # A data fica fora do prompt para que ele seja determinístico (e cacheável)
+        requisitos = {
+            "documento_origem": nome_arquivo,
+            "data_extracao": None,
+            **requisitos
+        }
+        requisitos['documento_origem'] = nome_arquivo
+        requisitos['data_extracao'] = datetime.now().isoformat()
+        
+        print("✅ Requisitos extraídos com sucesso!", file=saida)
+        
+        return requisitos
+    
+    def _imprimir_inicio(self, nome_arquivo, saida=None):
+        print(f"\n{'='*80}", file=saida)
+        print(f"📄 Processando: {nome_arquivo}", file=saida)
+        print(f"{'='*80}\n", file=saida)
+        
+        # Extrai texto do PDF
+        print("🔍 Extraindo texto do PDF...", file=saida)
+    
+    def _pre_extraidos_confiaveis(self, pre_extrator, saida=None):
+        """Campos das regras locais com confiança suficiente para dispensar o LLM"""
+        confiaveis = {
+            chave: info for chave, info in pre_extrator.campos().items()
+            if info['confianca'] >= self.confianca_minima_regras
+        }
+        if confiaveis:
+            print(f"⚡ Pré-extração por regras: {len(confiaveis)} campos preenchidos localmente", file=saida)
+        return confiaveis
+    
+    def _dispensa_llm(self, texto_pdf, pre_extraidos):
+        """Datasheet curto com todos os campos essenciais encontrados pelas regras"""
+        return (
+            self.dispensar_llm_simples
+            and len(texto_pdf) <= self.max_caracteres_simples
+            and all(
+                chave in pre_extraidos and pre_extraidos[chave]['confianca'] >= 0.9
+                for chave in CAMPOS_ESSENCIAIS
+            )
+        )
+    
+    def _requisitos_pre_extraidos(self, pre_extraidos):
+        """Monta o resultado apenas com as regras locais (sem LLM)"""
+        confianca = {}
+        for secao in SECOES_CONFIANCA:
+            valores = [info['confianca'] for (s, _), info in pre_extraidos.items() if s == secao]
+            confianca[secao] = sum(valores) / len(valores) if valores else 0.0
+        
+        requisitos = {
+            "requisitos": {},
+            "informacoes_faltantes": [],
+            "confianca_extracao": confianca,
+            "observacoes": ["Extraído apenas por regras locais (datasheet simples, LLM dispensado)"]
+        }
+        
+        for secao, campos in SCHEMA_REQUISITOS.items():
+            for campo in campos:
+                if (secao, campo) not in pre_extraidos:
+                    requisitos['informacoes_faltantes'].append(f"{secao}.{campo}")
+        
+        return requisitos
+    
+    def _aplicar_pre_extracao(self, requisitos, todos_campos, pre_extraidos):
         """
-        Extrai requisitos técnicos do PDF usando LLM
+        Completa a resposta do LLM com os campos das regras locais
+        Os campos confiáveis das regras prevalecem; as seções seguem a ordem do
+        schema e a confiança de cada campo pré-extraído fica em "pre_extracao"
         """
-        print(f"\n{'='*80}")
-        print(f"📄 Processando: {Path(caminho_pdf).name}")
-        print(f"{'='*80}\n")
+        resposta = requisitos.get('requisitos', {})
         
-        # Extrai texto do PDF
-        print("🔍 Extraindo texto do PDF...")
-        texto_pdf = self.extrair_texto_pdf(caminho_pdf)
+        secoes = {}
+        for secao, campos in SCHEMA_REQUISITOS.items():
+            recebidos = resposta.get(secao) or {}
+            secoes[secao] = {}
+            for campo in campos:
+                if (secao, campo) in pre_extraidos:
+                    secoes[secao][campo] = pre_extraidos[(secao, campo)]['valor']
+                else:
+                    secoes[secao][campo] = recebidos.get(campo, [] if campo in CAMPOS_LISTA else None)
+            
+            # Campos extras que o LLM tenha devolvido
+            for campo, valor in recebidos.items():
+                secoes[secao].setdefault(campo, valor)
         
-        if not texto_pdf:
-            return None
+        for secao, campos in resposta.items():
+            secoes.setdefault(secao, campos)
         
-        print(f"✅ Texto extraído ({len(texto_pdf)} caracteres)")
+        requisitos['requisitos'] = secoes
         
-        # Analisa com LLM
-        print("🤖 Analisando com LLM (Groq - Llama 3.3)...")
+        preenchidos = {f"{secao}.{campo}" for secao, campo in pre_extraidos} | {campo for _, campo in pre_extraidos}
+        requisitos['informacoes_faltantes'] = [
+            info for info in requisitos.get('informacoes_faltantes', []) if info not in preenchidos
+        ]
         
-        prompt = self._criar_prompt_extracao(texto_pdf, Path(caminho_pdf).name)
+        requisitos['pre_extracao'] = {
+            f"{secao}.{campo}": info for (secao, campo), info in todos_campos.items()
+        }
         
-        try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt()
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
+        return requisitos
+    
+    def _chamar_llm_extracao(self, prompt, max_tokens=4096, saida=None, progresso=False):
+        """
+        Envia um prompt de extração e retorna o JSON
+        Com progresso=True (e streaming ligado) cada seção é anunciada em `saida` assim que chega
+        """
+        if not self.llm.streaming:
+            return self.llm.completar_json(
+                self._get_system_prompt(),
+                prompt,
                 temperature=0.1,  # Baixa para maior precisão
-                max_tokens=4096,
-                response_format={"type": "json_object"}
+                max_tokens=max_tokens
             )
+        
+        def ao_campo(campo, valor):
+            if progresso and campo.startswith('requisitos.'):
+                preenchidos = sum(1 for v in valor.values() if v is not None) if isinstance(valor, dict) else 0
+                print(f"   ↳ {campo.split('.', 1)[1]}: {preenchidos} campos", file=saida)
+        
+        return self.llm.completar_json_stream(
+            self._get_system_prompt(),
+            prompt,
+            temperature=0.1,
+            max_tokens=max_tokens,
+            ao_campo=ao_campo,
+            profundidade=2
+        )
+    
+    def _agrupar_em_blocos(self, paginas):
+        """Agrupa o fluxo de páginas em blocos de até max_caracteres_bloco"""
+        bloco = []
+        tamanho = 0
+        
+        for numero, texto in paginas:
+            if bloco and tamanho + len(texto) + 1 > self.max_caracteres_bloco:
+                yield bloco
+                bloco = []
+                tamanho = 0
+            bloco.append((numero, texto))
+            tamanho += len(texto) + 1
+        
+        if bloco:
+            yield bloco
+    
+    def _texto_bloco(self, bloco):
+        return "".join(texto + "\n" for _, texto in bloco)
+    
+    def _extrair_selecionando(self, caminho_pdf, nome_arquivo, paginas, saida=None):
+        """
+        Extração de documentos longos com seleção de relevância
+        1ª passada: divide em seções e guarda só o perfil de termos de cada uma.
+        2ª passada (do cache): recupera o texto das seções escolhidas. Se
+        couberem no orçamento vai uma requisição; senão, map-reduce por lotes.
+        """
+        perfis = [perfil_secao(secao) for secao in dividir_em_secoes(paginas)]
+        orcamento_tokens = self.max_caracteres_bloco // 4
+        lotes, resumo = selecionar_secoes(perfis, orcamento_tokens)
+        
+        print(
+            f"🎯 Relevância: {resumo['secoes_selecionadas']}/{resumo['secoes_total']} seções "
+            f"({resumo['tokens_selecionados']}/{resumo['tokens_total']} tokens estimados)",
+            file=saida
+        )
+        
+        textos_lotes = self._textos_dos_lotes(caminho_pdf, lotes)
+        
+        if len(lotes) == 1:
+            texto, faixa = next(textos_lotes)
+            print(f"🤖 Analisando seções selecionadas com LLM (páginas {faixa[0]}-{faixa[1]})...", file=saida)
+            nota = (
+                f"Conteúdo: {resumo['secoes_selecionadas']} de {resumo['secoes_total']} seções do documento, "
+                f"selecionadas por relevância técnica (seções administrativas foram omitidas)"
+            )
+            return self._chamar_llm_extracao(self._criar_prompt_extracao(texto, nome_arquivo, nota=nota), saida=saida, progresso=True)
+        
+        return self._extrair_em_blocos(nome_arquivo, textos_lotes, saida)
+    
+    def _textos_dos_lotes(self, caminho_pdf, lotes):
+        """Relê as páginas e gera (texto, faixa_paginas) de cada lote, um de cada vez"""
+        lote_de = {indice: n for n, lote in enumerate(lotes) for indice in lote}
+        ultimo_do_lote = {lote[-1]: n for n, lote in enumerate(lotes)}
+        
+        # Releitura silenciosa: o aviso de cache já apareceu na primeira passada
+        paginas = self.iterar_paginas_pdf(caminho_pdf, saida=io.StringIO())
+        
+        partes = []
+        inicio = None
+        for secao in dividir_em_secoes(paginas):
+            indice = secao['indice']
+            if indice not in lote_de:
+                continue
             
-            resposta_texto = response.choices[0].message.content.strip()
-            
-            # Limpa markdown se houver
-            if '```json' in resposta_texto:
-                resposta_texto = resposta_texto.split('```json')[1].split('```')[0]
-            elif '```' in resposta_texto:
-                resposta_texto = resposta_texto.split('```')[1].split('```')[0]
+            if inicio is None:
+                inicio = secao['paginas'][0]
+            partes.append(secao['texto'])
             
-            requisitos = json.loads(resposta_texto.strip())
+            if indice in ultimo_do_lote:
+                yield "".join(partes), (inicio, secao['paginas'][1])
+                partes = []
+                inicio = None
+    
+    def _extrair_em_blocos(self, nome_arquivo, blocos, saida=None):
+        """
+        Map-reduce sobre blocos de (texto, (pagina_inicio, pagina_fim)): cada
+        bloco é enviado ao LLM enquanto os seguintes ainda estão sendo lidos;
+        no máximo max_blocos_em_voo ficam pendentes, o que limita a memória
+        usada por documentos muito longos
+        """
+        parciais = []
+        pendentes = deque()
+        total_caracteres = 0
+        
+        with ThreadPoolExecutor(max_workers=self.max_blocos_em_voo) as executor:
+            for i, (texto, faixa) in enumerate(blocos, 1):
+                total_caracteres += len(texto)
+                
+                print(f"🤖 Bloco {i} (páginas {faixa[0]}-{faixa[1]}, {len(texto)} caracteres) enviado ao LLM...", file=saida)
+                nota = (
+                    f"Trecho: páginas {faixa[0]} a {faixa[1]} (o restante do documento é enviado em outras partes; "
+                    f"use null para o que não aparece neste trecho)"
+                )
+                prompt = self._criar_prompt_extracao(texto, nome_arquivo, nota=nota)
+                pendentes.append((i, executor.submit(self._chamar_llm_extracao, prompt)))
+                
+                while len(pendentes) >= self.max_blocos_em_voo:
+                    self._coletar_parcial(pendentes.popleft(), parciais, saida)
             
-            print("✅ Requisitos extraídos com sucesso!")
+            while pendentes:
+                self._coletar_parcial(pendentes.popleft(), parciais, saida)
+        
+        print(f"✅ Texto extraído ({total_caracteres} caracteres em {len(parciais)} blocos)", file=saida)
+        
+        if not any(parcial is not None for parcial in parciais):
+            raise ValueError("nenhum bloco foi extraído com sucesso")
+        
+        return self._mesclar_parciais(parciais)
+    
+    def _coletar_parcial(self, pendente, parciais, saida=None):
+        i, futuro = pendente
+        try:
+            parciais.append(futuro.result())
+        except Exception as e:
+            print(f"   ⚠️  Bloco {i} falhou: {e}", file=saida)
+            parciais.append(None)
+    
+    def _mesclar_parciais(self, parciais):
+        """
+        Junta as extrações parciais de um mesmo documento
+        Mesma regra da consolidação: para cada campo vale o valor do bloco com
+        maior confiança na seção; listas (ex: normas) são unidas, e um valor
+        único de outro bloco entra como mais um item da lista.
+        """
+        validos = [p for p in parciais if p is not None]
+        
+        mesclado = {
+            "requisitos": {},
+            "informacoes_faltantes": [],
+            "confianca_extracao": {},
+            "observacoes": []
+        }
+        confianca_escolhida = {}
+        
+        for parcial in validos:
+            for secao, campos in parcial.get('requisitos', {}).items():
+                destino = mesclado['requisitos'].setdefault(secao, {})
+                confianca = parcial.get('confianca_extracao', {}).get(secao, 0.0)
+                
+                for campo, valor in campos.items():
+                    atual = destino.get(campo)
+                    
+                    if isinstance(valor, list) or isinstance(atual, list):
+                        # Lista num bloco e valor único em outro (ex: tensao_v [380, 440] e 380): tudo vira lista
+                        atual = _como_lista(atual)
+                        destino[campo] = atual + [v for v in _como_lista(valor) if v not in atual]
+                        confianca_escolhida[(secao, campo)] = max(confianca, confianca_escolhida.get((secao, campo), 0.0))
+                    elif valor is not None and (atual is None or confianca > confianca_escolhida.get((secao, campo), 0.0)):
+                        destino[campo] = valor
+                        confianca_escolhida[(secao, campo)] = confianca
+                    else:
+                        destino.setdefault(campo, None)
             
-            return requisitos
+            for secao, valor in parcial.get('confianca_extracao', {}).items():
+                mesclado['confianca_extracao'][secao] = max(valor, mesclado['confianca_extracao'].get(secao, 0.0))
             
-        except Exception as e:
-            print(f"❌ Erro ao processar com LLM: {e}")
-            return None
+            for obs in parcial.get('observacoes', []):
+                if obs not in mesclado['observacoes']:
+                    mesclado['observacoes'].append(obs)
+        
+        # Faltante no documento = faltante em todos os blocos
+        faltantes = [set(p.get('informacoes_faltantes', [])) for p in validos]
+        mesclado['informacoes_faltantes'] = [
+            info for info in validos[0].get('informacoes_faltantes', [])
+            if all(info in f for f in faltantes)
+        ]
+        
+        falhas = len(parciais) - len(validos)
+        if falhas:
+            mesclado['observacoes'].append(f"{falhas} de {len(parciais)} blocos do documento não puderam ser extraídos")
+        mesclado['observacoes'].append(f"Documento extraído em {len(parciais)} blocos")
+        
+        return mesclado
     
     def _get_system_prompt(self):
         """Define a persona do LLM"""
@@ -115,21 +541,43 @@ Você deve:
 
 SEMPRE retorne JSON válido, estruturado e completo."""
     
-    def _criar_prompt_extracao(self, texto_pdf, nome_arquivo):
-        """Cria o prompt detalhado para extração"""
+    def _criar_prompt_extracao(self, texto_pdf, nome_arquivo, nota=None, pre_extraidos=None):
+        """
+        Cria o prompt detalhado para extração
+        nota descreve trechos parciais/selecionados; pre_extraidos são campos já
+        preenchidos pelas regras locais, que saem do formato pedido ao LLM
+        """
+        
+        trecho = f"{nota}\n" if nota else ""
+        
+        ja_extraidos = ""
+        if pre_extraidos:
+            linhas = "\n".join(
+                f"- {secao}.{campo}: {json.dumps(info['valor'], ensure_ascii=False)}"
+                for (secao, campo), info in pre_extraidos.items()
+            )
+            ja_extraidos = f"""
+═══════════════════════════════════════════════════════════════════════════
+DADOS JÁ EXTRAÍDOS AUTOMATICAMENTE (não inclua no JSON)
+═══════════════════════════════════════════════════════════════════════════
+
+{linhas}
+
+O formato abaixo contém apenas os campos que ainda faltam.
+Use os dados acima como referência para conversões e consistência.
+"""
         
         return f"""
 DOCUMENTO TÉCNICO A ANALISAR:
 
 Nome do arquivo: {nome_arquivo}
-Data de processamento: {datetime.now().isoformat()}
-
+{trecho}
 ═══════════════════════════════════════════════════════════════════════════
 CONTEÚDO DO DOCUMENTO
 ═══════════════════════════════════════════════════════════════════════════
 
 {texto_pdf}
-
+{ja_extraidos}
 ═══════════════════════════════════════════════════════════════════════════
 TAREFA: EXTRAÇÃO DE REQUISITOS
 ═══════════════════════════════════════════════════════════════════════════
@@ -147,110 +595,80 @@ ATENÇÃO:
 FORMATO DE SAÍDA (JSON)
 ═══════════════════════════════════════════════════════════════════════════
 
-{{
-  "documento_origem": "{nome_arquivo}",
-  "data_extracao": "{datetime.now().isoformat()}",
-  "requisitos": {{
-    "eletricos": {{
-      "potencia_kw": null,
-      "potencia_cv": null,
-      "potencia_hp": null,
-      "tensao_v": null,
-      "tensao_tolerancia": null,
-      "corrente_nominal_a": null,
-      "frequencia_hz": null,
-      "numero_fases": null,
-      "fator_potencia": null,
-      "fator_potencia_desejado": null,
-      "classe_isolamento": null,
-      "elevacao_temperatura_classe": null,
-      "eficiencia_minima": null,
-      "eficiencia_desejada": null,
-      "categoria_partida": null,
-      "tipo_partida": null,
-      "preparado_inversor": null,
-      "resistencia_isolamento_min_mohm": null
-    }},
-    "mecanicos": {{
-      "rotacao_rpm": null,
-      "rotacao_tolerancia_rpm": null,
-      "rotacao_tolerancia_percentual": null,
-      "numero_polos": null,
-      "torque_nominal_nm": null,
-      "torque_partida_percentual": null,
-      "torque_maximo_percentual": null,
-      "tipo_montagem": null,
-      "forma_construtiva_iec": null,
-      "tipo_acoplamento": null,
-      "sentido_rotacao": null,
-      "altura_eixo_mm": null,
-      "carcaca_iec": null,
-      "tipo_eixo": null,
-      "tipo_rolamento": null,
-      "peso_kg": null,
-      "dimensoes_mm": null
-    }},
-    "operacionais": {{
-      "grau_protecao": null,
-      "eficiencia": null,
-      "regime_trabalho": null,
-      "temp_ambiente_min_c": null,
-      "temp_ambiente_max_c": null,
-      "temp_ambiente_nominal_c": null,
-      "umidade_relativa_max_percent": null,
-      "umidade_condensante": null,
-      "altitude_max_m": null,
-      "tipo_refrigeracao": null,
-      "classe_vibracao": null,
-      "classe_vibracao_norma": null,
-      "nivel_ruido_max_dba": null,
-      "nivel_ruido_referencia": null
-    }},
-    "aplicacao": {{
-      "tipo_bomba": null,
-      "fabricante_bomba": null,
-      "modelo_bomba": null,
-      "fluido": null,
-      "fluido_descricao": null,
-      "vazao_m3h": null,
-      "altura_manometrica_m": null,
-      "pressao_recalque_bar": null,
-      "temperatura_fluido_min_c": null,
-      "temperatura_fluido_max_c": null,
-      "regime_operacao": null,
-      "ambiente": null,
-      "ambiente_descricao": null,
-      "condicoes_especiais": null,
-      "normas": []
-    }},
-    "protecoes": {{
-      "protecao_termica_tipo": null,
-      "protecao_termica_quantidade": null,
-      "protecao_termica_localizacao": null,
-      "caixa_ligacao_posicionamento": null,
-      "caixa_ligacao_grau_protecao": null,
-      "terminal_aterramento": null
-    }},
-    "comercial": {{
-      "garantia_minima_meses": null,
-      "garantia_desejada_meses": null,
-      "prazo_entrega_maximo_dias": null,
-      "prazo_entrega_desejado_dias": null,
-      "orcamento_disponivel_brl": null,
-      "certificacao_inmetro": null
-    }}
-  }},
-  "informacoes_faltantes": [],
-  "confianca_extracao": {{
-    "eletricos": 0.0,
-    "mecanicos": 0.0,
-    "operacionais": 0.0,
-    "aplicacao": 0.0
-  }},
-  "observacoes": []
-}}
+{self._formato_saida(nome_arquivo, pre_extraidos)}
+
+{self._instrucoes_extracao()}
+
+═══════════════════════════════════════════════════════════════════════════
+
+IMPORTANTE: Retorne APENAS o JSON, sem texto adicional antes ou depois.
+"""
+    
+    def _criar_prompt_pacote(self, pacote):
+        """
+        Prompt com vários documentos curtos: o conteúdo de cada um vem em
+        sequência e o formato de saída (comum a todos) aparece uma única vez
+        """
+        conteudos = []
+        for i, doc in enumerate(pacote, 1):
+            ja_extraidos = ""
+            if doc['pre_extraidos']:
+                linhas = "\n".join(
+                    f"- {secao}.{campo}: {json.dumps(info['valor'], ensure_ascii=False)}"
+                    for (secao, campo), info in doc['pre_extraidos'].items()
+                )
+                ja_extraidos = f"\nDados já extraídos automaticamente deste documento (não inclua no JSON):\n{linhas}\n"
+            
+            conteudos.append(f"""
+═══════════════════════════════════════════════════════════════════════════
+DOCUMENTO {i} de {len(pacote)} - Nome do arquivo: {doc['nome']}
+═══════════════════════════════════════════════════════════════════════════
+
+{doc['texto']}{ja_extraidos}""")
+        
+        # Só saem do formato os campos já extraídos em todos os documentos do pacote
+        comuns = set.intersection(*(set(doc['pre_extraidos']) for doc in pacote))
+        formato = self._formato_saida("<nome do arquivo do documento>", {chave: None for chave in comuns})
+        
+        return f"""
+DOCUMENTOS TÉCNICOS A ANALISAR: {len(pacote)} documentos independentes
+{"".join(conteudos)}
+
+═══════════════════════════════════════════════════════════════════════════
+TAREFA: EXTRAÇÃO DE REQUISITOS (UM RESULTADO POR DOCUMENTO)
+═══════════════════════════════════════════════════════════════════════════
+
+Extraia as informações técnicas de CADA documento separadamente, sem misturar
+dados entre eles. Retorne um objeto JSON no formato:
+
+{{"documentos": [<resultado do documento 1>, <resultado do documento 2>, ...]}}
+
+com exatamente {len(pacote)} resultados, na ordem acima, e "documento_origem"
+igual ao nome do arquivo de cada documento.
+
+ATENÇÃO:
+- Use null para campos NÃO encontrados (não invente dados)
+- Converta unidades quando necessário
+- Seja preciso nos valores numéricos
+- Normalize nomenclaturas técnicas
+- Identifique todas as normas mencionadas
+
+═══════════════════════════════════════════════════════════════════════════
+FORMATO DE CADA RESULTADO (JSON)
+═══════════════════════════════════════════════════════════════════════════
+
+{formato}
+
+{self._instrucoes_extracao()}
 
 ═══════════════════════════════════════════════════════════════════════════
+
+IMPORTANTE: Retorne APENAS o JSON, sem texto adicional antes ou depois.
+"""
+    
+    def _instrucoes_extracao(self):
+        """Instruções comuns aos prompts de extração (um documento ou pacote)"""
+        return """═══════════════════════════════════════════════════════════════════════════
 INSTRUÇÕES DETALHADAS
 ═══════════════════════════════════════════════════════════════════════════
 
@@ -283,47 +701,506 @@ INSTRUÇÕES DETALHADAS
 6. OBSERVAÇÕES:
    - Adicione notas relevantes sobre peculiaridades do documento
    - Mencione se há informações contraditórias
-   - Indique se há dados em formatos não padrão
-
-═══════════════════════════════════════════════════════════════════════════
-
-IMPORTANTE: Retorne APENAS o JSON, sem texto adicional antes ou depois.
-"""
+   - Indique se há dados em formatos não padrão"""
     
-    def processar_pdfs(self, lista_pdfs):
-        """Processa múltiplos PDFs e retorna lista de requisitos"""
+    def _formato_saida(self, nome_arquivo, pre_extraidos=None):
+        """Gera o JSON de exemplo do prompt, sem os campos já pré-extraídos"""
+        preenchidos = pre_extraidos or {}
         
-        print(f"\n{'='*80}")
-        print(f"🚀 EXTRATOR DE REQUISITOS DE MOTORES ELÉTRICOS")
-        print(f"{'='*80}")
-        print(f"\n📦 Total de documentos: {len(lista_pdfs)}")
+        formato = {
+            "documento_origem": nome_arquivo,
+            "requisitos": {
+                secao: {
+                    campo: [] if campo in CAMPOS_LISTA else None
+                    for campo in campos
+                    if (secao, campo) not in preenchidos
+                }
+                for secao, campos in SCHEMA_REQUISITOS.items()
+            },
+            "informacoes_faltantes": [],
+            "confianca_extracao": {secao: 0.0 for secao in SECOES_CONFIANCA},
+            "observacoes": []
+        }
+        
+        return json.dumps(formato, indent=2, ensure_ascii=False)
+    
+    def processar_pdfs(self, lista_pdfs, concorrencia=1):
+        """
+        Processa múltiplos PDFs e retorna lista de requisitos
+        Com concorrencia > 1 os documentos são extraídos em paralelo, mas o
+        console, os arquivos salvos e a lista retornada seguem a ordem de entrada
+        """
+        
+        self._imprimir_cabecalho(len(lista_pdfs), concorrencia)
         
         resultados = []
         
-        for i, pdf_path in enumerate(lista_pdfs, 1):
-            print(f"\n[{i}/{len(lista_pdfs)}] Processando: {pdf_path}")
-            
-            requisitos = self.extrair_requisitos(pdf_path)
-            
+        for pdf_path, requisitos in self._extrair_em_ordem(lista_pdfs, concorrencia):
             if requisitos:
                 resultados.append(requisitos)
                 
                 # Salva individual
                 nome_base = Path(pdf_path).stem
-                output_path = f"outputs/{nome_base}_requisitos.json"
+                self._salvar_individual(requisitos, f"outputs/{nome_base}_requisitos.json")
+        
+        return resultados
+    
+    def processar_diretorio(self, dir_pdfs="pdfs", concorrencia=1, forcar=False, dir_saida="outputs"):
+        """
+        Extração incremental de todos os PDFs de `dir_pdfs` (recursivo)
+        Cada subpasta de primeiro nível é um projeto, com JSONs e consolidado
+        próprios em outputs/<projeto>/; PDFs soltos na raiz continuam em outputs/.
+        O manifesto (outputs/manifesto_extracao.json) guarda o hash de cada PDF:
+        só documentos novos ou alterados são extraídos, e só os projetos afetados
+        são consolidados de novo. forcar=True reprocessa tudo.
+        
+        Retorna um resumo da execução ou None se não houver PDFs.
+        """
+        pdfs = list(listar_pdfs(dir_pdfs))
+        
+        if not pdfs:
+            print(f"❌ Nenhum PDF encontrado na pasta {dir_pdfs}/")
+            print(f"   Certifique-se de que os PDFs estão em: {dir_pdfs}/")
+            return None
+        
+        manifesto = ManifestoExtracao(Path(dir_saida) / "manifesto_extracao.json")
+        if forcar:
+            manifesto.documentos.clear()
+        
+        estado = manifesto.verificar(pdfs, self.cache_pdf.chave)
+        projetos_afetados = set()
+        
+        print(f"✅ {len(pdfs)} PDFs encontrados em {dir_pdfs}/")
+        print(
+            f"🗂️  Manifesto: {len(estado['pendentes'])} novos/alterados, "
+            f"{len(estado['inalterados'])} inalterados, {len(estado['removidos'])} removidos"
+        )
+        
+        # PDFs que saíram da pasta levam junto o JSON gerado
+        for chave in estado['removidos']:
+            registro = manifesto.remover(chave)
+            Path(registro['saida']).unlink(missing_ok=True)
+            projetos_afetados.add(registro.get('projeto'))
+            print(f"🗑️  Removido: {chave}")
+        
+        extraidos = 0
+        falhas = 0
+        
+        try:
+            if estado['pendentes']:
+                self._imprimir_cabecalho(len(estado['pendentes']), concorrencia)
                 
-                Path("outputs").mkdir(exist_ok=True)
+                pendentes = {caminho: (projeto, hash_pdf) for caminho, projeto, hash_pdf in estado['pendentes']}
                 
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(requisitos, f, indent=2, ensure_ascii=False)
+                for pdf_path, requisitos in self._extrair_em_ordem(list(pendentes), concorrencia):
+                    projeto, hash_pdf = pendentes[pdf_path]
+                    
+                    if not requisitos:
+                        # Fica fora do manifesto e é tentado de novo na próxima execução
+                        falhas += 1
+                        continue
+                    
+                    relativo = Path(pdf_path).relative_to(dir_pdfs)
+                    if projeto is not None:
+                        relativo = relativo.relative_to(projeto)
+                    output_path = dir_saida_projeto(projeto, dir_saida) / relativo.parent / f"{relativo.stem}_requisitos.json"
+                    
+                    self._salvar_individual(requisitos, output_path)
+                    manifesto.registrar(pdf_path, projeto, hash_pdf, output_path)
+                    projetos_afetados.add(projeto)
+                    extraidos += 1
+        finally:
+            # Mesmo interrompida, a execução não perde o que já foi extraído
+            manifesto.salvar()
+        
+        consolidados = []
+        afetados = sorted(projetos_afetados, key=lambda p: (p is not None, p or ""))
+        documentos = []
+        for projeto in afetados:
+            for saida in manifesto.saidas_do_projeto(projeto):
+                with open(saida, 'r', encoding='utf-8') as f:
+                    documentos.append((projeto, json.load(f)))
+        
+        # Todos os projetos afetados em um único lote
+        if documentos:
+            print(f"\n🔄 Consolidando {len(documentos)} documentos de {len(afetados)} projetos...")
+        por_projeto = ConsolidadorRequisitos().consolidar_por_projeto(documentos)
+        
+        for projeto in afetados:
+            caminho_consolidado = dir_saida_projeto(projeto, dir_saida) / "requisitos_consolidados.json"
+            
+            if projeto not in por_projeto:
+                caminho_consolidado.unlink(missing_ok=True)
+                continue
+            
+            consolidado = por_projeto[projeto]
+            if projeto is not None:
+                print(f"\n📁 Projeto: {projeto}")
+            if consolidado.get('conflitos') is not None:
+                self._mostrar_resumo_consolidacao(consolidado)
+            self.salvar_consolidado(consolidado, caminho_consolidado)
+            consolidados.append(caminho_consolidado)
+        
+        if not projetos_afetados:
+            print("\n✨ Nada mudou desde a última execução: consolidados mantidos")
+        
+        return {
+            "extraidos": extraidos,
+            "falhas": falhas,
+            "inalterados": len(estado['inalterados']),
+            "removidos": len(estado['removidos']),
+            "consolidados": consolidados
+        }
+    
+    def _imprimir_cabecalho(self, total, concorrencia):
+        print(f"\n{'='*80}")
+        print(f"🚀 EXTRATOR DE REQUISITOS DE MOTORES ELÉTRICOS")
+        print(f"{'='*80}")
+        print(f"\n📦 Total de documentos: {total}")
+        if concorrencia > 1:
+            print(f"⚡ Modo concorrente: até {concorrencia} documentos em paralelo")
+    
+    def _salvar_individual(self, requisitos, output_path):
+        """Salva o JSON de um documento e mostra o resumo"""
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(requisitos, f, indent=2, ensure_ascii=False)
+        
+        print(f"💾 Salvo: {Path(output_path).as_posix()}")
+        
+        # Mostra resumo
+        self._mostrar_resumo(requisitos)
+    
+    def _extrair_em_ordem(self, lista_pdfs, concorrencia):
+        """
+        Gera (pdf, requisitos) na ordem de entrada
+        No modo concorrente cada documento escreve seu log em um buffer próprio,
+        que só é impresso quando chega a vez dele
+        """
+        total = len(lista_pdfs)
+        
+        processos = self._processos_do_lote(lista_pdfs)
+        if processos > 1:
+            yield from self._extrair_em_pipeline(lista_pdfs, concorrencia, processos)
+            return
+        
+        if self.empacotar_pequenos and total > 1:
+            yield from self._extrair_empacotando(lista_pdfs, concorrencia)
+            return
+        
+        if concorrencia <= 1:
+            for i, pdf_path in enumerate(lista_pdfs, 1):
+                print(f"\n[{i}/{total}] Processando: {pdf_path}")
+                yield pdf_path, self.extrair_requisitos(pdf_path)
+            return
+        
+        with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+            futuros = [executor.submit(self._extrair_com_log, pdf_path) for pdf_path in lista_pdfs]
+            
+            for i, (pdf_path, futuro) in enumerate(zip(lista_pdfs, futuros), 1):
+                requisitos, log = futuro.result()
+                print(f"\n[{i}/{total}] Processando: {pdf_path}")
+                print(log, end='')
+                yield pdf_path, requisitos
+    
+    def _processos_do_lote(self, lista_pdfs):
+        """
+        Quantos processos leem os PDFs do lote
+        processos_parsing, se definido; senão todos os núcleos quando o lote tem
+        ao menos min_pdfs_processos PDFs ou min_paginas_processos páginas (em
+        lotes menores iniciar os processos custa mais do que ler nas threads).
+        """
+        if self.processos_parsing is not None:
+            return self.processos_parsing
+        
+        nucleos = os.cpu_count() or 1
+        if nucleos <= 1 or len(lista_pdfs) >= self.min_pdfs_processos:
+            return nucleos
+        
+        paginas = 0
+        for pdf_path in lista_pdfs:
+            try:
+                paginas += contar_paginas(pdf_path)
+            except Exception:
+                continue  # a extração tenta de novo e reporta a falha
+        return nucleos if paginas >= self.min_paginas_processos else 1
+    
+    def _extrair_com_log(self, pdf_path, paginas=None):
+        """Executa a extração capturando as mensagens em um buffer"""
+        buffer = io.StringIO()
+        requisitos = self.extrair_requisitos(pdf_path, saida=buffer, paginas=paginas)
+        return requisitos, buffer.getvalue()
+    
+    def _extrair_empacotando(self, lista_pdfs, concorrencia):
+        """
+        Variante de _extrair_em_ordem que junta documentos curtos em pacotes
+        Cada pacote vai ao LLM em uma única requisição (ver _extrair_pacote);
+        os demais documentos seguem o caminho normal, continuando da página em
+        que a leitura parou (ver _preparar_ou_extrair). A saída mantém a ordem de entrada.
+        """
+        total = len(lista_pdfs)
+        
+        with ThreadPoolExecutor(max_workers=max(concorrencia, 1)) as executor:
+            preparos = [
+                executor.submit(self._preparar_ou_extrair, pdf_path, posicao)
+                for posicao, pdf_path in enumerate(lista_pdfs)
+            ]
+            
+            # Para cada posição: (futuro, índice dentro do pacote ou None)
+            tarefas = [None] * total
+            pacote = []
+            tamanho_pacote = 0
+            pacotes = 0
+            empacotados = 0
+            for posicao, preparo in enumerate(preparos):
+                doc, extraido = preparo.result()
+                if doc is None:
+                    tarefas[posicao] = (_concluido(extraido), None)
+                    continue
                 
-                print(f"💾 Salvo: {output_path}")
+                if pacote and (
+                    tamanho_pacote + len(doc['texto']) > self.max_caracteres_pacote
+                    or len(pacote) >= self.max_documentos_pacote
+                ):
+                    self._enviar_pacote(executor, pacote, tarefas)
+                    pacotes += 1
+                    pacote = []
+                    tamanho_pacote = 0
+                pacote.append(doc)
+                tamanho_pacote += len(doc['texto'])
+                empacotados += 1
+            
+            if pacote:
+                self._enviar_pacote(executor, pacote, tarefas)
+                pacotes += 1
+            
+            if pacotes:
+                print(f"📦 {empacotados} documentos curtos em {pacotes} requisições")
+            
+            for posicao in range(total):
+                yield self._emitir_resultado(posicao, lista_pdfs, tarefas)
+    
+    def _extrair_em_pipeline(self, lista_pdfs, concorrencia, processos):
+        """
+        Extração em duas etapas ligadas por uma fila
+        1. Parsing: EtapaParsing lê os PDFs em `processos` processos
+           (tarefas de paginas_por_tarefa páginas), usando todos os núcleos.
+        2. LLM: cada documento lido vai para o pool de threads (ou para um
+           pacote de documentos curtos) enquanto os seguintes ainda são lidos.
+        A saída segue a ordem de entrada e os tempos de cada etapa são mostrados no fim.
+        """
+        total = len(lista_pdfs)
+        etapa = EtapaParsing(self.cache_pdf, processos, self.paginas_por_tarefa)
+        tarefas = [None] * total
+        pacote = []
+        tamanho_pacote = 0
+        proximo = 0
+        inicio = time.perf_counter()
+        
+        print(f"⚙️  Parsing em até {etapa.processos} processos ({self.paginas_por_tarefa} páginas por tarefa)")
+        
+        with ThreadPoolExecutor(max_workers=max(concorrencia, 1)) as executor:
+            for posicao, paginas, erro in etapa.executar(lista_pdfs):
+                pdf_path = lista_pdfs[posicao]
+                doc = None
+                if self.empacotar_pequenos and paginas is not None:
+                    doc, paginas = self._preparar_pequeno(pdf_path, posicao, paginas)
+                
+                if doc is None:
+                    # Com erro de leitura, a extração normal tenta de novo e reporta a falha
+                    tarefas[posicao] = (executor.submit(self._extrair_com_log, pdf_path, paginas), None)
+                else:
+                    if pacote and (
+                        tamanho_pacote + len(doc['texto']) > self.max_caracteres_pacote
+                        or len(pacote) >= self.max_documentos_pacote
+                    ):
+                        self._enviar_pacote(executor, pacote, tarefas)
+                        pacote = []
+                        tamanho_pacote = 0
+                    pacote.append(doc)
+                    tamanho_pacote += len(doc['texto'])
+                
+                # Mostra os documentos já concluídos, sem quebrar a ordem de entrada
+                while proximo < total and tarefas[proximo] is not None and tarefas[proximo][0].done():
+                    yield self._emitir_resultado(proximo, lista_pdfs, tarefas)
+                    proximo += 1
+            
+            if pacote:
+                self._enviar_pacote(executor, pacote, tarefas)
+            
+            for posicao in range(total):
+                if tarefas[posicao] is None:
+                    tarefas[posicao] = (executor.submit(self._extrair_com_log, lista_pdfs[posicao]), None)
+            
+            while proximo < total:
+                yield self._emitir_resultado(proximo, lista_pdfs, tarefas)
+                proximo += 1
+        
+        stats = etapa.estatisticas()
+        print(f"\n⏱️  Tempo por etapa:")
+        print(
+            f"   Parsing ({stats['processos']} processos): {stats['tempo_parede']:.1f}s - "
+            f"{stats['paginas_lidas']} páginas lidas, {stats['do_cache']}/{stats['documentos']} documentos do cache, "
+            f"{stats['tempo_cpu']:.1f}s de CPU"
+        )
+        print(f"   Extração/LLM (até {max(concorrencia, 1)} em paralelo): {time.perf_counter() - inicio:.1f}s no total")
+    
+    def _enviar_pacote(self, executor, pacote, tarefas):
+        futuro = executor.submit(self._extrair_pacote, pacote)
+        for j, doc in enumerate(pacote):
+            tarefas[doc['posicao']] = (futuro, j)
+    
+    def _emitir_resultado(self, posicao, lista_pdfs, tarefas):
+        """Imprime o log de um documento concluído e retorna (pdf, requisitos)"""
+        futuro, j = tarefas[posicao]
+        resultado = futuro.result()
+        requisitos, log = resultado[j] if j is not None else resultado
+        print(f"\n[{posicao + 1}/{len(lista_pdfs)}] Processando: {lista_pdfs[posicao]}")
+        print(log, end='')
+        return lista_pdfs[posicao], requisitos
+    
+    def _preparar_ou_extrair(self, caminho_pdf, posicao):
+        """
+        Prepara o documento para um pacote ou, se ele não couber, já o extrai
+        Retorna (doc, None) ou (None, (requisitos, log)). A extração continua
+        a leitura do ponto em que o preparo parou, na mesma thread (o PDF
+        não fica aberto esperando vaga no pool).
+        """
+        doc, paginas = self._preparar_pequeno(caminho_pdf, posicao)
+        if doc is not None:
+            return doc, None
+        return None, self._extrair_com_log(caminho_pdf, paginas)
+    
+    def _preparar_pequeno(self, caminho_pdf, posicao, paginas=None):
+        """
+        Lê um documento e, se for curto, devolve-o pronto para empacotamento
+        Retorna (doc, None) ou, para documentos longos, vazios ou que
+        dispensam o LLM, (None, paginas): as páginas já lidas seguidas das que
+        faltam ler, para extrair_requisitos continuar sem reler o início.
+        Ilegíveis retornam (None, None) e são relidos por extrair_requisitos,
+        que reporta o erro.
+        """
+        saida = io.StringIO()
+        nome_arquivo = Path(caminho_pdf).name
+        self._imprimir_inicio(nome_arquivo, saida)
+        
+        pre_extrator = PreExtrator()
+        lidas = []
+        tamanho = 0
+        
+        try:
+            fonte = iter(paginas) if paginas is not None else self.iterar_paginas_pdf(caminho_pdf, saida)
+            for numero, texto in pre_extrator.observar(fonte):
+                lidas.append((numero, texto))
+                tamanho += len(texto) + 1
+                if tamanho > self.max_caracteres_pequeno:
+                    return None, itertools.chain(lidas, fonte)
+        except Exception:
+            return None, None
+        
+        texto_pdf = "".join(texto + "\n" for _, texto in lidas)
+        if not texto_pdf.strip():
+            return None, lidas
+        
+        print(f"✅ Texto extraído ({len(texto_pdf)} caracteres)", file=saida)
+        pre_extraidos = self._pre_extraidos_confiaveis(pre_extrator, saida)
+        
+        if self._dispensa_llm(texto_pdf, pre_extraidos):
+            return None, lidas
+        
+        return {
+            "posicao": posicao,
+            "caminho": caminho_pdf,
+            "nome": nome_arquivo,
+            "texto": texto_pdf,
+            "pre_extrator": pre_extrator,
+            "pre_extraidos": pre_extraidos,
+            "saida": saida
+        }, None
+    
+    def _extrair_pacote(self, pacote):
+        """
+        Extrai um pacote de documentos curtos em uma requisição
+        A resposta traz um objeto por documento; os que faltarem ou não passarem
+        na validação são refeitos em requisições individuais.
+        Retorna [(requisitos, log)] na ordem do pacote.
+        """
+        entradas = {}
+        
+        if len(pacote) > 1:
+            for doc in pacote:
+                print(f"🤖 Analisando com LLM em pacote com {len(pacote) - 1} outros documentos...", file=doc['saida'])
+            
+            try:
+                resposta = self._chamar_llm_extracao(
+                    self._criar_prompt_pacote(pacote),
+                    max_tokens=min(4096 * len(pacote), 16384)
+                )
+                entradas = self._distribuir_respostas(pacote, resposta.get('documentos'))
+            except Exception as e:
+                for doc in pacote:
+                    print(f"   ⚠️  Requisição do pacote falhou: {e}", file=doc['saida'])
+        
+        resultados = []
+        for j, doc in enumerate(pacote):
+            saida = doc['saida']
+            try:
+                requisitos = entradas.get(j)
+                if requisitos is None:
+                    if len(pacote) > 1:
+                        print("↩️  Sem resposta válida do pacote para este documento: requisição individual", file=saida)
+                    else:
+                        print("🤖 Analisando com LLM (Groq - Llama 3.3)...", file=saida)
+                    prompt = self._criar_prompt_extracao(doc['texto'], doc['nome'], pre_extraidos=doc['pre_extraidos'])
+                    requisitos = self._chamar_llm_extracao(prompt, saida=saida, progresso=True)
                 
-                # Mostra resumo
-                self._mostrar_resumo(requisitos)
+                requisitos = self._finalizar_requisitos(
+                    requisitos, doc['nome'], doc['pre_extrator'], doc['pre_extraidos'], saida
+                )
+            except Exception as e:
+                print(f"❌ Erro ao processar com LLM: {e}", file=saida)
+                requisitos = None
+            
+            resultados.append((requisitos, saida.getvalue()))
         
         return resultados
     
+    def _distribuir_respostas(self, pacote, documentos):
+        """
+        Associa cada objeto da resposta ao seu documento pelo documento_origem
+        (nomes repetidos são atribuídos na ordem). Retorna {indice_no_pacote: resposta}
+        só com as respostas válidas.
+        """
+        if not isinstance(documentos, list):
+            return {}
+        
+        por_nome = {}
+        for entrada in documentos:
+            if isinstance(entrada, dict):
+                por_nome.setdefault(entrada.get('documento_origem'), []).append(entrada)
+        
+        entradas = {}
+        for j, doc in enumerate(pacote):
+            candidatas = por_nome.get(doc['nome'])
+            if candidatas:
+                entrada = candidatas.pop(0)
+                if self._resposta_valida(entrada):
+                    entradas[j] = entrada
+        return entradas
+    
+    def _resposta_valida(self, resposta):
+        """Confere a estrutura mínima de uma resposta de extração"""
+        confianca = resposta.get('confianca_extracao')
+        return (
+            isinstance(resposta.get('requisitos'), dict)
+            and all(isinstance(campos, dict) for campos in resposta['requisitos'].values())
+            and isinstance(confianca, dict)
+            and bool(confianca)
+            and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in confianca.values())
+            and isinstance(resposta.get('informacoes_faltantes', []), list)
+        )
+    
     def _mostrar_resumo(self, requisitos):
         """Mostra resumo dos requisitos extraídos"""
         print(f"\n📊 Resumo da Extração:")
@@ -346,7 +1223,8 @@ IMPORTANTE: Retorne APENAS o JSON, sem texto adicional antes ou depois.
     def consolidar_requisitos(self, lista_requisitos):
         """
         Consolida múltiplos documentos em um único JSON de requisitos
-        Mescla valores de todos os PDFs, priorizando informações mais completas
+        Para cada campo vale o valor do documento com maior confiança; a origem
+        de cada valor e os conflitos ficam em "proveniencia" e "conflitos"
         """
         if not lista_requisitos:
             return None
@@ -358,87 +1236,19 @@ IMPORTANTE: Retorne APENAS o JSON, sem texto adicional antes ou depois.
         print(f"🔄 Consolidando {len(lista_requisitos)} documentos...")
         print(f"{'='*80}\n")
         
-        # Inicializa estrutura consolidada
-        consolidado = {
-            "documentos_origem": [r['documento_origem'] for r in lista_requisitos],
-            "data_extracao": datetime.now().isoformat(),
-            "requisitos": {
-                "eletricos": {},
-                "mecanicos": {},
-                "operacionais": {},
-                "aplicacao": {},
-                "protecoes": {},
-                "comercial": {}
-            },
-            "informacoes_faltantes": [],
-            "confianca_extracao": {
-                "eletricos": 0.0,
-                "mecanicos": 0.0,
-                "operacionais": 0.0,
-                "aplicacao": 0.0
-            },
-            "observacoes": [f"Requisitos consolidados de {len(lista_requisitos)} documentos"]
-        }
-        
-        # Consolida cada seção
-        for secao in ['eletricos', 'mecanicos', 'operacionais', 'aplicacao', 'protecoes', 'comercial']:
-            print(f"\n📋 Consolidando seção: {secao}")
-            
-            # Coleta todos os campos únicos de todos os documentos
-            todos_campos = set()
-            for req in lista_requisitos:
-                if secao in req['requisitos']:
-                    todos_campos.update(req['requisitos'][secao].keys())
-            
-            # Para cada campo, escolhe o melhor valor
-            for campo in todos_campos:
-                valores_encontrados = []
-                
-                # Coleta valores de todos os documentos
-                for req in lista_requisitos:
-                    if secao in req['requisitos']:
-                        valor = req['requisitos'][secao].get(campo)
-                        if valor is not None:
-                            valores_encontrados.append({
-                                'valor': valor,
-                                'documento': req['documento_origem'],
-                                'confianca': req['confianca_extracao'].get(secao, 0.0)
-                            })
-                
-                # Escolhe o melhor valor
-                if valores_encontrados:
-                    # Prioriza valor do documento com maior confiança
-                    melhor = max(valores_encontrados, key=lambda x: x['confianca'])
-                    consolidado['requisitos'][secao][campo] = melhor['valor']
-                    
-                    # Se houver valores diferentes, registra
-                    valores_unicos = set(str(v['valor']) for v in valores_encontrados)
-                    if len(valores_unicos) > 1:
-                        print(f"   ⚠️  {campo}: valores diferentes encontrados")
-                        for v in valores_encontrados:
-                            print(f"      • {v['valor']} ({v['documento']})")
-                        print(f"      → Escolhido: {melhor['valor']} (maior confiança)")
-                    else:
-                        print(f"   ✓ {campo}: {melhor['valor']}")
-                else:
-                    # Nenhum documento tem esse campo
-                    consolidado['requisitos'][secao][campo] = None
-        
-        # Calcula confiança média por seção
-        for secao in ['eletricos', 'mecanicos', 'operacionais', 'aplicacao']:
-            confiancias = [r['confianca_extracao'].get(secao, 0.0) for r in lista_requisitos]
-            consolidado['confianca_extracao'][secao] = sum(confiancias) / len(confiancias) if confiancias else 0.0
+        consolidado = ConsolidadorRequisitos().consolidar(lista_requisitos)
+        self._mostrar_resumo_consolidacao(consolidado)
         
-        # Identifica informações faltantes (campos null em TODOS os documentos)
-        for secao, campos in consolidado['requisitos'].items():
-            for campo, valor in campos.items():
-                if valor is None:
-                    consolidado['informacoes_faltantes'].append(f"{secao}.{campo}")
+        return consolidado
+    
+    def _mostrar_resumo_consolidacao(self, consolidado):
+        if consolidado.get('conflitos'):
+            print(f"⚠️  {len(consolidado['conflitos'])} campos com valores diferentes entre documentos (ver \"conflitos\"):")
+            for conflito in consolidado['conflitos'][:5]:  # Mostra até 5
+                print(f"      - {conflito['campo']} → {conflito['escolhido']} (maior confiança)")
         
         print(f"\n✅ Consolidação concluída!")
         print(f"   📊 {len(consolidado['informacoes_faltantes'])} informações faltantes")
-        
-        return consolidado
     
     def salvar_consolidado(self, requisitos_consolidados, caminho='outputs/requisitos_consolidados.json'):
         """Salva requisitos consolidados"""
@@ -451,44 +1261,44 @@ IMPORTANTE: Retorne APENAS o JSON, sem texto adicional antes ou depois.
 
 
 def main():
-    """Função principal"""
+    """
+    Função principal
+    Processa a pasta pdfs/ de forma incremental; use --tudo para reprocessar todos os PDFs
+    """
     
     # Inicializa extrator
     extrator = ExtratorRequisitos()
     
-    # Lista de PDFs para processar
-    pdfs = [
-        "pdfs/Memorial Descritivo - Motor Bomba Industrial.pdf",
-        "pdfs/Datasheet - Motor Industrial.pdf",
-        "pdfs/Especificação Técnica - Motor Bomba Centrífuga.pdf"
-    ]
+    # Processa PDFs (EXTRATOR_CONCORRENCIA define quantos em paralelo no LLM;
+    # EXTRATOR_PROCESSOS e EXTRATOR_PAGINAS_POR_TAREFA configuram a leitura dos PDFs)
+    concorrencia = int(os.getenv('EXTRATOR_CONCORRENCIA', '4'))
+    extrator.processos_parsing = int(os.getenv('EXTRATOR_PROCESSOS') or 0) or None  # vazio ou 0: automático
+    extrator.paginas_por_tarefa = int(os.getenv('EXTRATOR_PAGINAS_POR_TAREFA') or extrator.paginas_por_tarefa)
+    resultado = extrator.processar_diretorio("pdfs", concorrencia=concorrencia, forcar='--tudo' in sys.argv[1:])
     
-    # Verifica se PDFs existem
-    pdfs_existentes = [p for p in pdfs if Path(p).exists()]
-    
-    if not pdfs_existentes:
-        print("❌ Nenhum PDF encontrado na pasta pdfs/")
-        print("   Certifique-se de que os PDFs estão em: pdfs/")
+    if resultado is None:
         return
     
-    print(f"✅ {len(pdfs_existentes)} PDFs encontrados")
+    print(f"\n{'='*80}")
+    print(f"✅ EXTRAÇÃO CONCLUÍDA COM SUCESSO!")
+    print(f"{'='*80}")
+    print(f"\n📊 {resultado['extraidos']} extraídos, {resultado['inalterados']} inalterados, {resultado['removidos']} removidos")
+    if resultado['falhas']:
+        print(f"⚠️  {resultado['falhas']} documentos falharam (serão tentados de novo na próxima execução)")
+    print(f"\n📂 Arquivos gerados:")
+    print(f"   - outputs/*_requisitos.json (individual por PDF; outputs/<projeto>/ para subpastas de pdfs/)")
+    for caminho in resultado['consolidados']:
+        print(f"   - {caminho.as_posix()} (consolidado)")
     
-    # Processa PDFs
-    requisitos_lista = extrator.processar_pdfs(pdfs_existentes)
+    stats_cache = extrator.llm.estatisticas_cache()
+    if stats_cache:
+        print(f"\n🧠 Cache LLM: {stats_cache['acertos']} reaproveitadas, {stats_cache['faltas']} novas")
     
-    # Consolida
-    if requisitos_lista:
-        consolidado = extrator.consolidar_requisitos(requisitos_lista)
-        extrator.salvar_consolidado(consolidado)
-        
-        print(f"\n{'='*80}")
-        print(f"✅ EXTRAÇÃO CONCLUÍDA COM SUCESSO!")
-        print(f"{'='*80}")
-        print(f"\n📂 Arquivos gerados:")
-        print(f"   - outputs/*_requisitos.json (individual por PDF)")
-        print(f"   - outputs/requisitos_consolidados.json (consolidado)")
-        print(f"\n💡 Próximo passo: python analisador_motores.py")
-        print(f"{'='*80}\n")
+    stats_agendador = extrator.llm.estatisticas_agendador()
+    print(f"🚦 Requisições ao LLM: {stats_agendador['requisicoes']} enviadas, {stats_agendador['retentativas']} retentativas, {stats_agendador['falhas']} falhas")
+    
+    print(f"\n💡 Próximo passo: python analisador_motores.py")
+    print(f"{'='*80}\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,267 @@
+"""
+Índice do Catálogo - Desafio Siemens Energy
+Restrições rígidas (potência, tensão, frequência, grau de proteção, montagem) respondidas por índice, antes de qualquer pontuação ou chamada ao LLM
+"""
+
+import bisect
+import re
+import numpy as np
+from pontuacao import CalculadoraPontuacao, codigo_ip, nivel_eficiencia, numero, numeros
+
+# Restrições aplicadas por padrão; "eficiencia" (IE abaixo do mínimo) é opcional
+RESTRICOES_PADRAO = ("potencia", "tensao", "frequencia", "grau_protecao", "montagem")
+
+# Desvio de potência acima do qual a rubrica elimina o motor
+DESVIO_POTENCIA_MAXIMO = 10
+
+_SEM_VALOR = -1
+
+# Estruturas do índice: vetores sobre o catálogo e grupos valor -> máscara (ver estruturas())
+_VETORES = ("potencias", "potencias_ordenadas", "posicao_potencia", "sem_potencia", "sem_montagem")
+_GRUPOS = ("por_tensao", "por_frequencia", "por_ip", "por_ie", "por_montagem")
+
+
+def codigos_montagem(valor):
+    """Formas construtivas IEC citadas ("B3 (IM 1001)" -> {"B3"}; listas aceitas)"""
+    if isinstance(valor, (list, tuple)):
+        return {codigo for item in valor for codigo in codigos_montagem(item)}
+    return {m.upper() for m in re.findall(r"\b([BV]\d{1,2})\b", str(valor or ""), re.IGNORECASE)}
+
+
+class IndiceCatalogo:
+    """
+    Índice das restrições rígidas do catálogo, montado uma vez
+
+    - potência: valores ordenados, consultados por bisect (faixa ±10%)
+    - tensão e frequência: listas invertidas valor -> motores (um motor
+      380/440 V ou 50/60 Hz entra em cada valor)
+    - grau de proteção e eficiência: baldes por ordinal (IP55 -> 55, IE3 -> 3)
+    - montagem: conjunto de formas construtivas -> motores
+
+    Cada lista é guardada já como máscara booleana sobre o catálogo, então a
+    consulta só faz OR/AND de vetores (menos de 1 ms com 100 mil motores).
+    Motores sem a informação não são eliminados por ela (a rubrica também não).
+    """
+
+    def __init__(self, produtos):
+        self.produtos = produtos
+        n = len(produtos)
+        self.total = n
+
+        potencias = np.full(n, np.nan)
+        por_tensao = {}
+        por_frequencia = {}
+        por_ip = {}
+        por_ie = {}
+        por_montagem = {}
+        sem_montagem = []
+
+        for i, motor in enumerate(produtos):
+            especificacoes = motor.get('especificacoes') or {}
+            eletricos = especificacoes.get('eletricos') or {}
+            mecanicos = especificacoes.get('mecanicos') or {}
+            operacionais = especificacoes.get('operacionais') or {}
+
+            potencia = numero(eletricos.get('potencia_kw'))
+            if potencia is not None:
+                potencias[i] = potencia
+
+            tensoes = numeros(eletricos.get('tensao_v')) or [_SEM_VALOR]
+            for tensao in set(tensoes):
+                por_tensao.setdefault(tensao, []).append(i)
+
+            # Motores 50/60 Hz entram nas duas listas
+            frequencias = numeros(eletricos.get('frequencia_hz')) or [_SEM_VALOR]
+            for frequencia in set(frequencias):
+                por_frequencia.setdefault(frequencia, []).append(i)
+
+            ip = codigo_ip(operacionais.get('grau_protecao'))
+            por_ip.setdefault(_SEM_VALOR if ip is None else ip[0] * 10 + ip[1], []).append(i)
+
+            ie = nivel_eficiencia(operacionais.get('eficiencia_energetica'))
+            por_ie.setdefault(_SEM_VALOR if ie is None else ie, []).append(i)
+
+            montagens = codigos_montagem(mecanicos.get('tipo_montagem_disponiveis'))
+            if not montagens:
+                sem_montagem.append(i)
+            for codigo in montagens:
+                por_montagem.setdefault(codigo, []).append(i)
+
+        self.potencias = potencias
+        com_potencia = np.flatnonzero(~np.isnan(potencias))
+        ordem = com_potencia[np.argsort(potencias[com_potencia], kind='stable')]
+        self.potencias_ordenadas = potencias[ordem].tolist()
+        # Posição de cada motor na ordem de potência (sem potência: depois de todos)
+        self.posicao_potencia = np.full(n, n, dtype=np.intp)
+        self.posicao_potencia[ordem] = np.arange(len(ordem))
+        self.sem_potencia = np.isnan(potencias)
+
+        def indices(grupos):
+            return {chave: self._mascara(lista) for chave, lista in grupos.items()}
+
+        self.por_tensao = indices(por_tensao)
+        self.por_frequencia = indices(por_frequencia)
+        self.por_ip = indices(por_ip)
+        self.por_ie = indices(por_ie)
+        self.por_montagem = indices(por_montagem)
+        self.sem_montagem = self._mascara(sem_montagem)
+
+    @classmethod
+    def de_estruturas(cls, produtos, estruturas):
+        """Índice a partir de estruturas já montadas (ex: lidas de um snapshot), sem percorrer os produtos"""
+        indice = object.__new__(cls)
+        indice.produtos = produtos
+        indice.total = len(produtos)
+        for nome in _VETORES + _GRUPOS:
+            setattr(indice, nome, estruturas[nome])
+        return indice
+
+    def estruturas(self):
+        """Vetores NumPy e grupos {valor: máscara} do índice (o inverso de de_estruturas)"""
+        estruturas = {nome: getattr(self, nome) for nome in _VETORES}
+        estruturas["potencias_ordenadas"] = np.asarray(self.potencias_ordenadas, dtype=np.float64)
+        estruturas.update({nome: getattr(self, nome) for nome in _GRUPOS})
+        return estruturas
+
+    def filtrar(self, requisitos, restricoes=RESTRICOES_PADRAO):
+        """
+        Separa os motores viáveis dos eliminados por restrição rígida
+        Retorna um ResultadoFiltro (índices viáveis, eliminados e o motivo de cada um)
+        """
+        limites = CalculadoraPontuacao(requisitos)
+        req = requisitos.get('requisitos', requisitos)
+        eletricos = req.get('eletricos') or {}
+        mecanicos = req.get('mecanicos') or {}
+
+        exigencias = {
+            "potencia": limites.potencia_kw,
+            "tensao": limites.tensao_v,
+            "frequencia": numeros(eletricos.get('frequencia_hz')) or None,
+            "grau_protecao": limites.grau_protecao,
+            "eficiencia": limites.eficiencia_minima,
+            "montagem": codigos_montagem(mecanicos.get('tipo_montagem')) or None
+        }
+
+        atende = {}
+        for restricao in restricoes:
+            exigido = exigencias[restricao]
+            if exigido is not None:
+                atende[restricao] = getattr(self, f"_atende_{restricao}")(exigido)
+
+        viavel = np.ones(self.total, dtype=bool)
+        for mascara in atende.values():
+            viavel &= mascara
+
+        return ResultadoFiltro(self, exigencias, atende, viavel)
+
+    def _mascara(self, indices):
+        mascara = np.zeros(self.total, dtype=bool)
+        mascara[np.asarray(indices, dtype=np.intp)] = True
+        return mascara
+
+    def _uniao(self, mascaras):
+        uniao = np.zeros(self.total, dtype=bool)
+        for mascara in mascaras:
+            uniao |= mascara
+        return uniao
+
+    def _atende_potencia(self, potencia):
+        ordenadas = self.potencias_ordenadas
+
+        def dentro(valor):
+            # Mesma conta da rubrica, para não divergir dela nas bordas da faixa
+            exata = abs(valor - potencia) <= 1e-3 * max(abs(valor), abs(potencia))
+            return exata or abs(valor - potencia) / potencia * 100 <= DESVIO_POTENCIA_MAXIMO
+
+        # Faixa um pouco mais larga no bisect, ajustada nas bordas
+        inicio = bisect.bisect_left(ordenadas, potencia * (1 - DESVIO_POTENCIA_MAXIMO / 100) * (1 - 1e-9))
+        fim = bisect.bisect_right(ordenadas, potencia * (1 + DESVIO_POTENCIA_MAXIMO / 100) * (1 + 1e-9))
+        while inicio < fim and not dentro(ordenadas[inicio]):
+            inicio += 1
+        while fim > inicio and not dentro(ordenadas[fim - 1]):
+            fim -= 1
+
+        posicao = self.posicao_potencia
+        return ((posicao >= inicio) & (posicao < fim)) | self.sem_potencia
+
+    def _atende_tensao(self, tensao):
+        return self._uniao(
+            mascara for valor, mascara in self.por_tensao.items()
+            if valor == _SEM_VALOR or abs(valor - tensao) <= 1e-3 * max(abs(valor), abs(tensao))
+        )
+
+    def _atende_frequencia(self, frequencias):
+        # Projeto "50/60 Hz": basta o motor operar numa delas
+        return self._uniao(
+            mascara for valor, mascara in self.por_frequencia.items()
+            if valor == _SEM_VALOR or any(abs(valor - frequencia) < 0.5 for frequencia in frequencias)
+        )
+
+    def _atende_grau_protecao(self, exigido):
+        # A rubrica aceita até um nível abaixo contra água (IP54 para IP55, com pontuação menor)
+        return self._uniao(
+            mascara for valor, mascara in self.por_ip.items()
+            if valor == _SEM_VALOR or (valor // 10 >= exigido[0] and valor % 10 >= exigido[1] - 1)
+        )
+
+    def _atende_eficiencia(self, minima):
+        return self._uniao(mascara for valor, mascara in self.por_ie.items() if valor == _SEM_VALOR or valor >= minima)
+
+    def _atende_montagem(self, exigidas):
+        return self._uniao([self.sem_montagem] + [self.por_montagem[codigo] for codigo in exigidas if codigo in self.por_montagem])
+
+
+class ResultadoFiltro:
+    """Motores viáveis e eliminados de uma consulta ao IndiceCatalogo"""
+
+    def __init__(self, indice, exigencias, atende, viavel):
+        self.indice = indice
+        self.exigencias = exigencias
+        self.atende = atende
+        self.viavel = viavel
+        self.viaveis = np.flatnonzero(viavel)
+        self.eliminados = np.flatnonzero(~viavel)
+
+    def motivos(self, i, motor=None):
+        """Restrições que eliminaram o motor i, em texto"""
+        if motor is None:
+            motor = self.indice.produtos[i]
+        especificacoes = motor.get('especificacoes') or {}
+        eletricos = especificacoes.get('eletricos') or {}
+        mecanicos = especificacoes.get('mecanicos') or {}
+        operacionais = especificacoes.get('operacionais') or {}
+        exigencias = self.exigencias
+
+        descricoes = {
+            "potencia": lambda: f"potência {eletricos.get('potencia_kw')} kW fora de {exigencias['potencia']:g} kW ±{DESVIO_POTENCIA_MAXIMO}%",
+            "tensao": lambda: f"tensão {exigencias['tensao']:g}V não disponível ({eletricos.get('tensao_v')})",
+            "frequencia": lambda: (
+                f"frequência {eletricos.get('frequencia_hz')} Hz, "
+                f"especificada {'/'.join(f'{frequencia:g}' for frequencia in exigencias['frequencia'])} Hz"
+            ),
+            "grau_protecao": lambda: (
+                f"{operacionais.get('grau_protecao')} abaixo de "
+                f"IP{exigencias['grau_protecao'][0]}{exigencias['grau_protecao'][1]}"
+            ),
+            "eficiencia": lambda: f"{operacionais.get('eficiencia_energetica')} abaixo do mínimo IE{exigencias['eficiencia']}",
+            "montagem": lambda: (
+                f"montagem {'/'.join(sorted(exigencias['montagem']))} não disponível "
+                f"({', '.join(mecanicos.get('tipo_montagem_disponiveis') or [])})"
+            )
+        }
+
+        return [descricoes[restricao]() for restricao, mascara in self.atende.items() if not mascara[i]]
+
+    def relatorio_eliminados(self):
+        """Lista de {codigo_produto, fabricante, motivos} dos eliminados"""
+        produtos = self.indice.produtos
+        relatorio = []
+        for i in self.eliminados.tolist():
+            # Um acesso por motor: os produtos podem ser decodificados sob demanda (snapshot)
+            motor = produtos[i]
+            relatorio.append({
+                "codigo_produto": motor.get('codigo_produto'),
+                "fabricante": motor.get('fabricante'),
+                "motivos": self.motivos(i, motor)
+            })
+        return relatorio
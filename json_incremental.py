@@ -0,0 +1,151 @@
+"""
+Parser JSON Incremental - Desafio Siemens Energy
+Lê uma resposta JSON em pedaços (streaming do LLM) e entrega cada campo assim que ele termina de chegar
+"""
+
+import json
+
+_ESPACOS = " \t\r\n"
+
+
+class ParserJSONIncremental:
+    """
+    Parser incremental do objeto JSON raiz de uma resposta
+
+    Cada valor concluído até `profundidade` níveis é entregue a
+    ao_campo(caminho, valor), com caminho no formato "a.b.0". Se ao_campo
+    retornar True o parser para de emitir e marca `interrompido`, para que
+    quem consome o streaming possa fechar a conexão. Texto antes do primeiro
+    "{" e depois do fecho do objeto (ex: cercas ```json) é ignorado.
+    """
+
+    def __init__(self, ao_campo=None, profundidade=1):
+        self.ao_campo = ao_campo
+        self.profundidade = profundidade
+        self.interrompido = False
+        self.completo = False
+        self._resultado = None
+        self._buffer = ""
+        self._pos = 0
+        self._pilha = []
+        self._raiz = None
+        self._em_string = False
+        self._escape = False
+        self._inicio_string = None
+        self._string_e_chave = False
+        self._campos = {}
+
+    def alimentar(self, pedaco):
+        """Processa mais um pedaço do texto; retorna os (caminho, valor) concluídos nele"""
+        if self.completo or self.interrompido:
+            return []
+
+        self._buffer += pedaco
+        eventos = []
+        buffer = self._buffer
+        i = self._pos
+
+        while i < len(buffer) and not self.completo:
+            c = buffer[i]
+
+            if self._em_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._em_string = False
+                    texto = json.loads(buffer[self._inicio_string:i + 1])
+                    quadro = self._pilha[-1]
+                    if self._string_e_chave:
+                        quadro['chave'] = texto
+                    else:
+                        self._concluir(quadro, texto, eventos)
+                i += 1
+                continue
+
+            if self._raiz is None:
+                if c == '{':
+                    self._raiz = i
+                    self._pilha.append({"tipo": '{', "chave": None, "esperando_chave": True, "inicio": None})
+                i += 1
+                continue
+
+            quadro = self._pilha[-1]
+
+            if c == '"':
+                self._em_string = True
+                self._inicio_string = i
+                self._string_e_chave = quadro['tipo'] == '{' and quadro['esperando_chave']
+                if not self._string_e_chave:
+                    quadro['inicio'] = i
+            elif c in '{[':
+                quadro['inicio'] = i
+                self._pilha.append({
+                    "tipo": c,
+                    "chave": None if c == '{' else 0,
+                    "esperando_chave": c == '{',
+                    "inicio": None
+                })
+            elif c in '}]':
+                self._concluir_escalar(quadro, i, eventos)
+                self._pilha.pop()
+                if not self._pilha:
+                    self.completo = True
+                    self._resultado = json.loads(buffer[self._raiz:i + 1])
+                else:
+                    pai = self._pilha[-1]
+                    self._concluir(pai, lambda inicio=pai['inicio'], fim=i + 1: json.loads(buffer[inicio:fim]), eventos)
+            elif c == ',':
+                self._concluir_escalar(quadro, i, eventos)
+                if quadro['tipo'] == '{':
+                    quadro['esperando_chave'] = True
+                else:
+                    quadro['chave'] += 1
+            elif c == ':':
+                quadro['esperando_chave'] = False
+            elif c not in _ESPACOS and quadro['inicio'] is None:
+                # Início de número, true, false ou null
+                quadro['inicio'] = i
+
+            i += 1
+
+        self._pos = i
+        return eventos
+
+    def _concluir_escalar(self, quadro, fim, eventos):
+        """Fecha um número/literal pendente (terminado por , } ou ])"""
+        if quadro['inicio'] is not None:
+            self._concluir(quadro, json.loads(self._buffer[quadro['inicio']:fim]), eventos)
+
+    def _concluir(self, quadro, valor, eventos):
+        """Registra o valor concluído na posição atual de `quadro`"""
+        quadro['inicio'] = None
+        caminho = [q['chave'] for q in self._pilha]
+        if len(caminho) > max(self.profundidade, 1):
+            return
+
+        # Containers chegam como função para só decodificar quando interessa
+        if callable(valor):
+            valor = valor()
+
+        if len(caminho) == 1:
+            self._campos[caminho[0]] = valor
+
+        if self.interrompido or len(caminho) > self.profundidade:
+            return
+
+        nome = ".".join(str(parte) for parte in caminho)
+        eventos.append((nome, valor))
+        if self.ao_campo is not None and self.ao_campo(nome, valor):
+            self.interrompido = True
+
+    def parcial(self):
+        """Campos de primeiro nível recebidos até agora"""
+        return dict(self._campos)
+
+    def resultado(self):
+        """Objeto completo; ValueError se a resposta terminou antes de fechar o JSON"""
+        if not self.completo:
+            raise ValueError("resposta JSON incompleta")
+        return self._resultado
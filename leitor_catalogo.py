@@ -0,0 +1,221 @@
+"""
+Leitor de Catálogo em Fluxo - Desafio Siemens Energy
+Lê os produtos de catalogo_motores.produtos um a um, sem carregar o arquivo inteiro
+"""
+
+import json
+import queue
+import threading
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_ESPACOS = " \t\r\n"
+_DELIMITADORES = _ESPACOS + ",:]}"
+_CAMINHO_PRODUTOS = ("catalogo_motores", "produtos")
+
+
+def ler_produtos(caminho_arquivo, tamanho_pedaco=1 << 16):
+    """
+    Gera os produtos do catálogo um a um, na ordem do arquivo
+    Usa o ijson (parser em C) quando instalado; sem ele, o leitor em Python
+    puro de LeitorProdutos. Em ambos, a memória fica limitada ao produto atual.
+    """
+    if ijson is not None:
+        with open(caminho_arquivo, 'rb') as f:
+            yield from ijson.items(f, '.'.join(_CAMINHO_PRODUTOS) + '.item', use_float=True)
+        return
+
+    with open(caminho_arquivo, 'r', encoding='utf-8', newline='') as f:
+        yield from LeitorProdutos(f, tamanho_pedaco)
+
+
+class LeitorProdutos:
+    """
+    Leitor em Python puro dos itens de catalogo_motores.produtos
+
+    Percorre o objeto raiz chave a chave: valores fora do caminho até
+    `produtos` são decodificados e descartados, e cada item do array é
+    decodificado com JSONDecoder.raw_decode assim que está inteiro no buffer.
+    O buffer guarda só o trecho ainda não consumido (um produto, em geral).
+
+    Os demais campos de catalogo_motores (versao, data_atualizacao...) ficam
+    em `cabecalho` ao fim da leitura. com_posicoes() dá também a posição em
+    bytes de cada produto no arquivo, que deve ser aberto com newline=''.
+    """
+
+    def __init__(self, arquivo, tamanho_pedaco=1 << 16):
+        self.arquivo = arquivo
+        self.tamanho_pedaco = tamanho_pedaco
+        self.cabecalho = {}
+        self._decodificador = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._fim = False
+        # Posição no buffer cuja posição em bytes no arquivo já é conhecida
+        self._marca = 0
+        self._marca_bytes = 0
+
+    def __iter__(self):
+        for _, _, produto in self.com_posicoes():
+            yield produto
+
+    def com_posicoes(self):
+        """Gera (inicio, fim, produto), com o trecho em bytes de cada produto no arquivo"""
+        self._esperar('{')
+        for nivel, chave in enumerate(_CAMINHO_PRODUTOS):
+            if not self._procurar_chave(chave, guardar=nivel > 0):
+                return
+            if nivel < len(_CAMINHO_PRODUTOS) - 1:
+                self._esperar('{')
+
+        self._esperar('[')
+        if self._proximo_caractere() != ']':
+            while True:
+                self._proximo_caractere()
+                inicio = self._bytes_ate(self._pos)
+                produto = self._valor()
+                yield inicio, self._bytes_ate(self._pos), produto
+                separador = self._proximo_caractere()
+                self._pos += 1
+                if separador == ']':
+                    break
+                if separador != ',':
+                    raise ValueError(f"catálogo malformado: esperado ',' ou ']' entre produtos, encontrado {separador!r}")
+        else:
+            self._pos += 1
+
+        # Campos de catalogo_motores depois de produtos
+        if self._proximo_caractere() == ',':
+            self._pos += 1
+            self._procurar_chave(None, guardar=True)
+
+    def _procurar_chave(self, procurada, guardar=False):
+        """
+        Avança pelas chaves do objeto atual até `procurada` (False se o objeto termina antes)
+        Com `guardar`, os valores pulados vão para `cabecalho`.
+        """
+        if self._proximo_caractere() == '}':
+            return False
+        while True:
+            chave = self._valor()
+            self._esperar(':')
+            if chave == procurada:
+                return True
+            valor = self._valor()
+            if guardar:
+                self.cabecalho[chave] = valor
+            separador = self._proximo_caractere()
+            self._pos += 1
+            if separador == '}':
+                return False
+            if separador != ',':
+                raise ValueError(f"catálogo malformado: esperado ',' ou '}}' após a chave {chave!r}")
+
+    def _valor(self):
+        """Decodifica o próximo valor JSON, lendo mais pedaços enquanto ele estiver incompleto"""
+        self._proximo_caractere()
+        while True:
+            try:
+                valor, fim = self._decodificador.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fim:
+                    raise
+                self._ler()
+                continue
+            # Um número cortado no fim do pedaço ("2." ou "1e") decodifica só o começo: lê mais e refaz
+            if not self._fim and (fim == len(self._buffer) or self._buffer[fim] not in _DELIMITADORES):
+                self._ler()
+                continue
+            self._pos = fim
+            return valor
+
+    def _esperar(self, caractere):
+        encontrado = self._proximo_caractere()
+        if encontrado != caractere:
+            raise ValueError(f"catálogo malformado: esperado {caractere!r}, encontrado {encontrado!r}")
+        self._pos += 1
+
+    def _proximo_caractere(self):
+        """Pula espaços e retorna o próximo caractere sem consumi-lo ('' no fim do arquivo)"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _ESPACOS:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._fim:
+                return ''
+            self._ler()
+
+    def _bytes_ate(self, posicao):
+        """Posição em bytes no arquivo de uma posição do buffer (chamadas em ordem crescente)"""
+        self._marca_bytes += len(self._buffer[self._marca:posicao].encode('utf-8'))
+        self._marca = posicao
+        return self._marca_bytes
+
+    def _ler(self):
+        # Descarta o que já foi consumido antes de acrescentar o próximo pedaço
+        pedaco = self.arquivo.read(self.tamanho_pedaco)
+        self._bytes_ate(self._pos)
+        self._marca = 0
+        self._buffer = self._buffer[self._pos:] + pedaco
+        self._pos = 0
+        self._fim = not pedaco
+
+
+def em_blocos(produtos, tamanho):
+    """Agrupa um iterável de produtos em listas de até `tamanho` itens"""
+    bloco = []
+    for produto in produtos:
+        bloco.append(produto)
+        if len(bloco) >= tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def antecipar(iteravel, itens=2):
+    """
+    Consome `iteravel` numa thread à parte, mantendo até `itens` prontos numa fila
+    Enquanto quem consome trabalha num item (ex: análises do LLM), o próximo já
+    está sendo lido. Erros da leitura são relançados no consumidor; fechar o
+    gerador antes do fim encerra a thread.
+    """
+    fila = queue.Queue(maxsize=max(itens, 1))
+    parar = threading.Event()
+    fim = object()
+
+    def colocar(item, erro=None):
+        # Espera vaga na fila, desistindo se o consumidor já parou
+        while not parar.is_set():
+            try:
+                fila.put((item, erro), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produzir():
+        try:
+            for item in iteravel:
+                if not colocar(item):
+                    return
+            colocar(fim)
+        except Exception as e:
+            colocar(fim, e)
+
+    thread = threading.Thread(target=produzir, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, erro = fila.get()
+            if item is fim:
+                if erro is not None:
+                    raise erro
+                return
+            yield item
+    finally:
+        parar.set()
@@ -0,0 +1,137 @@
+"""
+Manifesto de Extração - Desafio Siemens Energy
+Registra quais PDFs já foram extraídos (hash do conteúdo → JSON gerado) para reprocessar só o que mudou
+"""
+
+import json
+import os
+from pathlib import Path
+
+VERSAO_MANIFESTO = 1
+CAMINHO_MANIFESTO_PADRAO = "outputs/manifesto_extracao.json"
+
+
+def listar_pdfs(diretorio="pdfs"):
+    """
+    Gera (caminho_pdf, projeto) para cada PDF em `diretorio`, recursivamente
+    O projeto é a subpasta de primeiro nível (pdfs/<projeto>/...); PDFs soltos
+    na raiz têm projeto None. A ordem é estável (por caminho).
+    """
+    raiz = Path(diretorio)
+    if not raiz.is_dir():
+        return
+
+    for caminho in sorted(raiz.rglob("*"), key=lambda p: p.as_posix().lower()):
+        if not caminho.is_file() or caminho.suffix.lower() != ".pdf":
+            continue
+        partes = caminho.relative_to(raiz).parts
+        yield caminho, (partes[0] if len(partes) > 1 else None)
+
+
+def dir_saida_projeto(projeto, dir_saida="outputs"):
+    """Pasta de saída de um projeto (projeto None = raiz de outputs/, como antes)"""
+    return Path(dir_saida) if projeto is None else Path(dir_saida) / projeto
+
+
+class ManifestoExtracao:
+    """
+    Manifesto em JSON: caminho do PDF → hash, tamanho, data de modificação,
+    projeto e JSON de saída
+    Tamanho + data de modificação iguais dispensam o hash, então uma execução
+    sobre milhares de documentos inalterados só faz `stat` em cada arquivo.
+    """
+
+    def __init__(self, caminho=CAMINHO_MANIFESTO_PADRAO):
+        self.caminho = Path(caminho)
+        self.documentos = {}
+        self.carregar()
+
+    def carregar(self):
+        """Lê o manifesto do disco (ausente, corrompido ou de outra versão = vazio)"""
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            self.documentos = {}
+            return
+
+        if dados.get('versao') != VERSAO_MANIFESTO:
+            self.documentos = {}
+            return
+
+        self.documentos = dados.get('documentos', {})
+
+    def salvar(self):
+        """Grava o manifesto de forma atômica"""
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = self.caminho.with_suffix(f".{os.getpid()}.tmp")
+
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(
+                {"versao": VERSAO_MANIFESTO, "documentos": self.documentos},
+                f, indent=2, ensure_ascii=False, sort_keys=True
+            )
+        os.replace(temporario, self.caminho)
+
+    def verificar(self, pdfs, calcular_hash):
+        """
+        Compara os PDFs encontrados com o manifesto
+        pdfs: lista de (caminho_pdf, projeto); calcular_hash(caminho) -> str
+
+        Retorna {"pendentes": [(caminho, projeto, hash)], "inalterados": [...],
+        "removidos": [chave]}. Um documento fica pendente se é novo, se o
+        conteúdo mudou, se mudou de projeto ou se o JSON de saída sumiu.
+        """
+        pendentes = []
+        inalterados = []
+        vistos = set()
+
+        for caminho, projeto in pdfs:
+            chave = Path(caminho).as_posix()
+            vistos.add(chave)
+            registro = self.documentos.get(chave)
+            info = os.stat(caminho)
+
+            if registro and registro.get('projeto') == projeto and Path(registro['saida']).exists():
+                if registro['tamanho'] == info.st_size and registro['modificado_em'] == info.st_mtime:
+                    inalterados.append(caminho)
+                    continue
+
+                # Arquivo tocado (cópia, checkout...) mas com o mesmo conteúdo
+                hash_atual = calcular_hash(caminho)
+                if hash_atual == registro['hash']:
+                    registro['tamanho'] = info.st_size
+                    registro['modificado_em'] = info.st_mtime
+                    inalterados.append(caminho)
+                    continue
+            else:
+                hash_atual = calcular_hash(caminho)
+
+            pendentes.append((caminho, projeto, hash_atual))
+
+        removidos = [chave for chave in self.documentos if chave not in vistos]
+
+        return {"pendentes": pendentes, "inalterados": inalterados, "removidos": removidos}
+
+    def registrar(self, caminho, projeto, hash_conteudo, saida):
+        """Marca o documento como extraído"""
+        info = os.stat(caminho)
+        self.documentos[Path(caminho).as_posix()] = {
+            "hash": hash_conteudo,
+            "tamanho": info.st_size,
+            "modificado_em": info.st_mtime,
+            "projeto": projeto,
+            "saida": Path(saida).as_posix()
+        }
+
+    def remover(self, chave):
+        """Tira um documento do manifesto e retorna o registro removido"""
+        return self.documentos.pop(chave, None)
+
+    def saidas_do_projeto(self, projeto):
+        """JSONs individuais de um projeto, na ordem dos PDFs"""
+        return [
+            registro['saida']
+            for chave, registro in sorted(self.documentos.items(), key=lambda item: item[0].lower())
+            if registro.get('projeto') == projeto
+        ]
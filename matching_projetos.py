@@ -0,0 +1,221 @@
+"""
+Matching em Lote - Desafio Siemens Energy
+Compara vários projetos (requisitos consolidados) com o mesmo catálogo de motores
+
+Uso: python matching_projetos.py [requisitos.json ...] [--catalogo motor_catalog.json]
+Sem arquivos, usa todos os outputs/**/requisitos_consolidados.json
+"""
+
+import copy
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from analisador_motores import AnalisadorMotores
+
+
+def caminho_relatorio(arquivo_requisitos):
+    """Relatório ao lado do arquivo de requisitos (analise_matching.json para os consolidados)"""
+    arquivo = Path(arquivo_requisitos)
+    if arquivo.name == 'requisitos_consolidados.json':
+        return arquivo.with_name('analise_matching.json')
+    return arquivo.with_name(f"{arquivo.stem}_analise_matching.json")
+
+
+class MatchingProjetos:
+    """
+    Matching de N projetos contra um catálogo
+
+    O catálogo é carregado e preparado uma vez (índice, colunas, projeções e
+    resumos, ver CatalogoPreparado). Cada projeto roda em uma cópia rasa do
+    analisador, que compartilha o catálogo preparado, o cliente LLM (agendador
+    e cache) e a memória de análises: as requisições de todos os projetos
+    disputam o mesmo limite de taxa e o mesmo pool de conexões.
+    """
+
+    def __init__(self, analisador=None):
+        self.analisador = analisador or AnalisadorMotores()
+        self.projetos_paralelos = max(int(os.getenv('MATCHING_PROJETOS_PARALELOS', '2')), 1)
+        self.tempo_preparo = 0.0
+
+    def carregar_catalogo(self, caminho_catalogo):
+        """Carrega e prepara o catálogo uma única vez para todos os projetos"""
+        inicio = time.perf_counter()
+        catalogo = self.analisador.carregar_catalogo(caminho_catalogo)
+        preparado = self.analisador.preparar_catalogo(catalogo)
+        # Referência IE2 do payback: calculada aqui uma vez, não por projeto
+        preparado.referencias_ie2
+        self.tempo_preparo = time.perf_counter() - inicio
+        return catalogo
+
+    def processar(self, arquivos_requisitos, catalogo):
+        """
+        Analisa cada projeto contra o catálogo
+        O log de cada projeto é impresso inteiro, na ordem dos arquivos.
+        Retorna a lista de (arquivo, relatorio, analisador do projeto);
+        relatorio é None quando o projeto falhou.
+        """
+        total = len(arquivos_requisitos)
+        print(f"\n🚀 {total} projetos x {len(catalogo)} motores (até {self.projetos_paralelos} projetos em paralelo)")
+
+        resultados = []
+        with ThreadPoolExecutor(max_workers=min(self.projetos_paralelos, max(total, 1))) as executor:
+            futuros = [executor.submit(self._processar_projeto, arquivo, catalogo) for arquivo in arquivos_requisitos]
+
+            for i, (arquivo, futuro) in enumerate(zip(arquivos_requisitos, futuros), 1):
+                relatorio, analisador, log = futuro.result()
+                print(f"\n[{i}/{total}] Projeto: {arquivo}")
+                print(log, end='')
+                resultados.append((arquivo, relatorio, analisador))
+
+        return resultados
+
+    def _processar_projeto(self, arquivo, catalogo):
+        """Analisa um projeto capturando as mensagens em um buffer"""
+        buffer = io.StringIO()
+        analisador = copy.copy(self.analisador)
+
+        try:
+            requisitos = analisador.carregar_requisitos(arquivo)
+            resultados = analisador.processar_catalogo(requisitos, catalogo, saida=buffer)
+            relatorio = analisador.gerar_relatorio(requisitos, resultados)
+            destino = caminho_relatorio(arquivo)
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            with open(destino, 'w', encoding='utf-8') as f:
+                json.dump(relatorio, f, indent=2, ensure_ascii=False)
+            print(f"\n✅ Relatório salvo: {destino.as_posix()}", file=buffer)
+        except Exception as e:
+            print(f"❌ Erro ao analisar {arquivo}: {e}", file=buffer)
+            return None, analisador, buffer.getvalue()
+
+        return relatorio, analisador, buffer.getvalue()
+
+    def gerar_resumo(self, resultados, catalogo, tempo_total):
+        """Resumo entre projetos: recomendação de cada um, motores mais indicados e vazão em pares/s"""
+        pares = sum(1 for _, relatorio, _ in resultados if relatorio) * len(catalogo)
+        tempo_triagem = sum(analisador.tempo_triagem for _, relatorio, analisador in resultados if relatorio)
+
+        projetos = []
+        motores = {}
+        for arquivo, relatorio, analisador in resultados:
+            if relatorio is None:
+                projetos.append({"arquivo_requisitos": Path(arquivo).as_posix(), "erro": True})
+                continue
+
+            metadata = relatorio['metadata']
+            resumo = relatorio['resumo_executivo']
+            projetos.append({
+                "arquivo_requisitos": Path(arquivo).as_posix(),
+                "relatorio": caminho_relatorio(arquivo).as_posix(),
+                "projeto": metadata['projeto'],
+                "cliente": metadata['cliente'],
+                "recomendacao_principal": resumo['recomendacao_principal'],
+                "score_recomendacao": resumo['score_recomendacao'],
+                "alternativas_viaveis": resumo['alternativas_viaveis'],
+                "motores_viaveis": len(catalogo) - len(metadata['motores_eliminados']),
+                "motores_analisados": metadata['total_motores_analisados'],
+                "motores_nao_analisados": metadata['motores_nao_analisados']
+            })
+
+            indicados = [resumo['recomendacao_principal']] if resumo['recomendacao_principal'] else []
+            for papel, codigos in (("recomendado_em", indicados), ("alternativa_em", resumo['alternativas_viaveis'])):
+                for codigo in codigos:
+                    motor = motores.setdefault(codigo, {"codigo_produto": codigo, "recomendado_em": [], "alternativa_em": []})
+                    motor[papel].append(Path(arquivo).as_posix())
+
+        return {
+            "data_analise": datetime.now().isoformat(),
+            "total_projetos": len(resultados),
+            "total_motores_catalogo": len(catalogo),
+            "projetos": projetos,
+            "motores_indicados": sorted(
+                motores.values(), key=lambda m: (-len(m['recomendado_em']), -len(m['alternativa_em']), m['codigo_produto'])
+            ),
+            "desempenho": {
+                "pares_projeto_motor": pares,
+                "tempo_preparo_catalogo_s": round(self.tempo_preparo, 4),
+                "tempo_triagem_s": round(tempo_triagem, 4),
+                "pares_por_segundo_triagem": round(pares / tempo_triagem, 1) if tempo_triagem else None,
+                "tempo_total_s": round(tempo_total, 2),
+                "pares_por_segundo": round(pares / tempo_total, 1) if tempo_total else None,
+                "analises_llm": sum(a.analises_recalculadas for _, r, a in resultados if r),
+                "analises_reaproveitadas": sum(a.analises_reaproveitadas for _, r, a in resultados if r),
+                "analises_evitadas": sum(a.analises_evitadas for _, r, a in resultados if r)
+            }
+        }
+
+    def imprimir_resumo(self, resumo):
+        """Imprime o resumo entre projetos no console"""
+        print(f"\n{'='*80}")
+        print(f"📊 RESUMO DOS PROJETOS")
+        print(f"{'='*80}\n")
+
+        for projeto in resumo['projetos']:
+            if projeto.get('erro'):
+                print(f"❌ {projeto['arquivo_requisitos']}: não analisado")
+                continue
+            print(f"🏆 {projeto['projeto']} ({projeto['arquivo_requisitos']})")
+            if projeto['recomendacao_principal']:
+                print(f"   {projeto['recomendacao_principal']} - Score: {projeto['score_recomendacao']:.1f}%")
+            else:
+                print(f"   Nenhum motor recomendado")
+            if projeto['alternativas_viaveis']:
+                print(f"   Alternativas: {', '.join(projeto['alternativas_viaveis'])}")
+
+        desempenho = resumo['desempenho']
+        print(f"\n⚙️  Catálogo preparado uma vez em {desempenho['tempo_preparo_catalogo_s'] * 1000:.1f} ms")
+        if desempenho['pares_por_segundo_triagem']:
+            print(f"🧮 Triagem local: {desempenho['pares_projeto_motor']} pares em {desempenho['tempo_triagem_s'] * 1000:.1f} ms ({desempenho['pares_por_segundo_triagem']:,.0f} pares/s)")
+        print(f"⏱️  Total: {desempenho['tempo_total_s']:.2f} s ({desempenho['pares_por_segundo']:,.1f} pares/s)")
+        print(f"🤖 Análises pelo LLM: {desempenho['analises_llm']} feitas, {desempenho['analises_reaproveitadas']} reaproveitadas, {desempenho['analises_evitadas']} evitadas")
+
+
+def main():
+    """Função principal"""
+
+    print("\n" + "="*80)
+    print("🔌 MATCHING EM LOTE DE MOTORES ELÉTRICOS - DESAFIO SIEMENS ENERGY")
+    print("="*80 + "\n")
+
+    argumentos = sys.argv[1:]
+    caminho_catalogo = 'motor_catalog.json'
+    if '--catalogo' in argumentos:
+        posicao = argumentos.index('--catalogo')
+        caminho_catalogo = argumentos[posicao + 1]
+        del argumentos[posicao:posicao + 2]
+
+    arquivos = argumentos or sorted(str(p) for p in Path('outputs').glob('**/requisitos_consolidados.json'))
+    if not arquivos:
+        print("❌ Nenhum arquivo de requisitos encontrado!")
+        print("   Execute primeiro: python extrator_requisitos.py")
+        return
+
+    matching = MatchingProjetos()
+    inicio = time.perf_counter()
+    catalogo = matching.carregar_catalogo(caminho_catalogo)
+    print(f"✅ Catálogo carregado e preparado ({len(catalogo)} motores)")
+
+    resultados = matching.processar(arquivos, catalogo)
+    resumo = matching.gerar_resumo(resultados, catalogo, time.perf_counter() - inicio)
+
+    Path('outputs').mkdir(exist_ok=True)
+    with open('outputs/resumo_projetos.json', 'w', encoding='utf-8') as f:
+        json.dump(resumo, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Resumo salvo: outputs/resumo_projetos.json")
+
+    matching.imprimir_resumo(resumo)
+
+    stats_agendador = matching.analisador.llm.estatisticas_agendador()
+    print(f"🚦 Requisições ao LLM: {stats_agendador['requisicoes']} enviadas, {stats_agendador['retentativas']} retentativas, {stats_agendador['falhas']} falhas")
+
+    print(f"\n{'='*80}")
+    print(f"✅ Matching concluído!")
+    print(f"{'='*80}\n")
+
+
+if __name__ == "__main__":
+    main()
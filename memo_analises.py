@@ -0,0 +1,70 @@
+"""
+Memória de Análises - Desafio Siemens Energy
+Guarda a análise de cada motor para que uma nova execução só refaça os motores cujos dados mudaram
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from cache_llm import CacheMemoria, CacheSQLite
+from pontuacao import VERSAO_RUBRICA
+from prompt_analise import VERSAO_PROMPT
+
+CAMINHO_MEMO_PADRAO = Path(__file__).resolve().parent / ".cache" / "analises_motores.sqlite"
+
+
+def normalizar(valor):
+    """Remove campos nulos e espaços das pontas dos textos (null e ausente valem o mesmo)"""
+    if isinstance(valor, dict):
+        return {chave: normalizar(item) for chave, item in valor.items() if item is not None}
+    if isinstance(valor, list):
+        return [normalizar(item) for item in valor]
+    if isinstance(valor, str):
+        return valor.strip()
+    return valor
+
+
+def resumo(valor):
+    """SHA-256 do valor normalizado (JSON com chaves ordenadas)"""
+    conteudo = json.dumps(normalizar(valor), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def resumo_requisitos(requisitos):
+    """Resumo só do que entra na análise (sem data de extração, documentos de origem ou proveniência)"""
+    return resumo({
+        "projeto": requisitos.get('projeto_info') or {},
+        "requisitos": requisitos.get('requisitos', requisitos)
+    })
+
+
+def chave_analise(resumo_requisitos, resumo_motor, modelo):
+    """
+    Chave da análise de um motor
+    Combina os resumos dos requisitos e do registro completo do motor (ver
+    resumo_requisitos e resumo), as versões da rubrica e do prompt e o
+    modelo. Se o preço de um motor muda, só a chave desse motor muda. Os
+    resumos são calculados à parte para que cada motor seja serializado uma
+    vez por catálogo, não uma vez por projeto.
+    """
+    conteudo = f"{resumo_requisitos}|{resumo_motor}|{VERSAO_RUBRICA}|{VERSAO_PROMPT}|{modelo}"
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def criar_memo_padrao():
+    """
+    Cria a memória de análises conforme as variáveis de ambiente
+    ANALISADOR_MEMO: sqlite (padrão) | memoria | desligado
+    ANALISADOR_MEMO_TTL_HORAS: validade das análises (padrão 720h)
+    ANALISADOR_MEMO_MAX_ENTRADAS: limite de análises guardadas (padrão 20000)
+    """
+    backend = os.getenv('ANALISADOR_MEMO', 'sqlite').lower()
+    ttl = float(os.getenv('ANALISADOR_MEMO_TTL_HORAS', '720')) * 3600
+    max_entradas = int(os.getenv('ANALISADOR_MEMO_MAX_ENTRADAS', '20000'))
+
+    if backend == 'desligado':
+        return None
+    if backend == 'memoria':
+        return CacheMemoria(max_entradas=max_entradas, ttl_segundos=ttl)
+    return CacheSQLite(CAMINHO_MEMO_PADRAO, max_entradas=max_entradas, ttl_segundos=ttl)
@@ -0,0 +1,262 @@
+"""
+Motor Compacto - Desafio Siemens Energy
+Representação compacta do catálogo em memória: colunas numéricas em array,
+campos categóricos codificados num vocabulário e texto descritivo comprimido
+"""
+
+import json
+import math
+import sys
+import zlib
+from array import array
+
+# Campos extraídos para colunas, por grupo ("" = raiz do registro, "comercial" = motor['comercial'],
+# demais = motor['especificacoes'][grupo]). O resto do registro fica no texto descritivo.
+CAMPOS_NUMERICOS = {
+    "eletricos": (
+        "potencia_kw", "potencia_cv", "potencia_hp", "corrente_nominal_380v_a", "corrente_nominal_440v_a",
+        "frequencia_hz", "numero_fases", "fator_potencia", "rendimento_100_carga_percent",
+        "rendimento_75_carga_percent", "rendimento_50_carga_percent"
+    ),
+    "mecanicos": ("rotacao_sincrona_rpm", "rotacao_nominal_rpm", "numero_polos", "altura_eixo_mm", "peso_kg"),
+    "operacionais": (
+        "temp_ambiente_min_c", "temp_ambiente_max_c", "altitude_max_m", "umidade_relativa_max_percent",
+        "nivel_ruido_db", "fator_servico"
+    ),
+    "comercial": ("preco_base_brl", "prazo_entrega_dias", "estoque_quantidade", "garantia_meses")
+}
+CAMPOS_CATEGORICOS = {
+    "": ("fabricante", "linha_produto", "categoria"),
+    "eletricos": ("tensao_v", "classe_isolamento"),
+    "mecanicos": ("tipo_carcaca", "material_carcaca", "tipo_montagem_disponiveis", "tipo_montagem_padrao"),
+    "operacionais": ("grau_protecao", "eficiencia_energetica", "regime_trabalho", "tipo_refrigeracao"),
+    "aplicacao": ("tipos_bomba_compativel", "ambientes_instalacao", "preparado_inversor"),
+    "protecoes": ("protecao_termica_tipo", "resistencia_anticondensacao_disponivel"),
+    "comercial": ("disponibilidade", "origem_produto")
+}
+
+# Tipo guardado ao lado de cada número, para a volta ao JSON sair igual (15 continua 15, não 15.0)
+_NAO_EXTRAIDO, _INTEIRO, _REAL, _NULO = 0, 1, 2, 3
+_AUSENTE = object()
+_MAX_CODIGOS = 0xFFFF
+_MAX_DICIONARIO = 32 * 1024
+_LIMITE_INTEIRO = 2 ** 53
+
+
+def _grupo(registro, grupo):
+    """Dicionário do grupo dentro do registro (ou None)"""
+    if grupo == "":
+        return registro
+    if grupo == "comercial":
+        origem = registro.get('comercial')
+    else:
+        especificacoes = registro.get('especificacoes')
+        origem = especificacoes.get(grupo) if isinstance(especificacoes, dict) else None
+    return origem if isinstance(origem, dict) else None
+
+
+def _categoria(valor):
+    """Valor aceito como categoria (texto, booleano, nulo ou lista de escalares), na forma imutável"""
+    if valor is None or isinstance(valor, (str, bool)):
+        return valor
+    if isinstance(valor, list) and all(item is None or isinstance(item, (str, bool, int, float)) for item in valor):
+        return tuple(valor)
+    raise TypeError
+
+
+class MotorCompacto:
+    """
+    Um motor do CatalogoCompacto, sem copiar nada
+
+    valor(grupo, campo) lê direto das colunas; o texto descritivo só é
+    descomprimido quando o campo pedido não foi extraído ou em para_registro().
+    """
+
+    __slots__ = ("catalogo", "posicao")
+
+    def __init__(self, catalogo, posicao):
+        self.catalogo = catalogo
+        self.posicao = posicao
+
+    @property
+    def codigo_produto(self):
+        return self.catalogo._codigos[self.posicao]
+
+    def valor(self, grupo, campo):
+        """Valor de um campo (grupo como em CAMPOS_NUMERICOS; "" para a raiz)"""
+        return self.catalogo._valor(self.posicao, grupo, campo)
+
+    def para_registro(self):
+        """Registro completo, igual ao do JSON de origem"""
+        return self.catalogo.registro(self.posicao)
+
+
+class CatalogoCompacto:
+    """
+    Catálogo em colunas compactas, montado a partir dos registros JSON
+
+    - números de CAMPOS_NUMERICOS: array('d') por campo, com o tipo (inteiro,
+      real ou nulo) em array('b');
+    - categorias de CAMPOS_CATEGORICOS ("IP55", "IE3", "importacao", listas de
+      montagem...): código de 2 bytes num vocabulário por campo, que guarda uma
+      única cópia de cada valor;
+    - o resto do registro (descrições, opcionais, documentação, suporte): JSON
+      compacto comprimido com zlib, usando o primeiro registro como dicionário,
+      todos num único bytearray e descomprimidos só quando são pedidos.
+
+    Valores fora do tipo esperado (ex: potência em texto) ficam no texto
+    descritivo. As chaves extraídas ficam lá também, com valor 0, para que
+    registro(i) devolva as chaves na ordem original: a volta ao JSON é exata.
+    Iterar o catálogo gera os registros um a um, então ele pode ser passado a
+    processar_catalogo como um catálogo em fluxo.
+    """
+
+    __slots__ = ("_codigos", "_numeros", "_tipos", "_codigos_categoria", "_vocabularios", "_descricoes", "_fins", "_dicionario")
+
+    def __init__(self, produtos=()):
+        self._codigos = []
+        self._numeros = {(grupo, campo): array('d') for grupo, campos in CAMPOS_NUMERICOS.items() for campo in campos}
+        self._tipos = {caminho: array('b') for caminho in self._numeros}
+        self._codigos_categoria = {
+            (grupo, campo): array('H') for grupo, campos in CAMPOS_CATEGORICOS.items() for campo in campos
+        }
+        # Por campo: (valores, código de cada valor); o código 0 marca "não extraído"
+        self._vocabularios = {caminho: ([None], {}) for caminho in self._codigos_categoria}
+        self._descricoes = bytearray()
+        self._fins = array('Q')
+        self._dicionario = None
+        for produto in produtos:
+            self.adicionar(produto)
+
+    def __len__(self):
+        return len(self._fins)
+
+    def __getitem__(self, posicao):
+        if not -len(self) <= posicao < len(self):
+            raise IndexError(posicao)
+        return MotorCompacto(self, posicao % len(self))
+
+    def __iter__(self):
+        for posicao in range(len(self)):
+            yield self.registro(posicao)
+
+    def adicionar(self, registro):
+        """Acrescenta um registro do catálogo (o dicionário original não é alterado)"""
+        resto = dict(registro)
+        copias = {"": resto}
+
+        def grupo_resto(grupo):
+            # Cópia rasa do grupo dentro do resto, feita só quando algo é extraído dele
+            if grupo not in copias:
+                if grupo == "comercial":
+                    copias[grupo] = resto['comercial'] = dict(resto['comercial'])
+                else:
+                    if 'especificacoes' not in copias:
+                        copias['especificacoes'] = resto['especificacoes'] = dict(resto['especificacoes'])
+                    copias[grupo] = copias['especificacoes'][grupo] = dict(copias['especificacoes'][grupo])
+            return copias[grupo]
+
+        codigo = registro.get('codigo_produto')
+        self._codigos.append(codigo if isinstance(codigo, str) else None)
+
+        for (grupo, campo), numeros in self._numeros.items():
+            origem = _grupo(registro, grupo)
+            valor = origem.get(campo, _AUSENTE) if origem is not None else _AUSENTE
+            if valor is None:
+                tipo = _NULO
+            elif type(valor) is int and abs(valor) < _LIMITE_INTEIRO:
+                tipo = _INTEIRO
+            elif type(valor) is float and math.isfinite(valor):
+                tipo = _REAL
+            else:
+                tipo = _NAO_EXTRAIDO
+            numeros.append(float(valor) if tipo in (_INTEIRO, _REAL) else 0.0)
+            self._tipos[(grupo, campo)].append(tipo)
+            if tipo != _NAO_EXTRAIDO:
+                grupo_resto(grupo)[campo] = 0
+
+        for caminho, codigos in self._codigos_categoria.items():
+            grupo, campo = caminho
+            origem = _grupo(registro, grupo)
+            codigo = 0
+            if origem is not None and campo in origem:
+                try:
+                    codigo = self._codificar(caminho, _categoria(origem[campo]))
+                except TypeError:
+                    codigo = 0
+            codigos.append(codigo)
+            if codigo:
+                grupo_resto(grupo)[campo] = 0
+
+        texto = json.dumps(resto, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if self._dicionario is None:
+            self._dicionario = texto[:_MAX_DICIONARIO]
+        compressor = zlib.compressobj(6, zdict=self._dicionario)
+        self._descricoes += compressor.compress(texto) + compressor.flush()
+        self._fins.append(len(self._descricoes))
+
+    def registro(self, posicao):
+        """Registro completo do motor na posição, com os campos e a ordem de chaves originais"""
+        registro = self._descricao(posicao)
+
+        for (grupo, campo), numeros in self._numeros.items():
+            tipo = self._tipos[(grupo, campo)][posicao]
+            if tipo != _NAO_EXTRAIDO:
+                _grupo(registro, grupo)[campo] = self._numero(tipo, numeros[posicao])
+
+        for caminho, codigos in self._codigos_categoria.items():
+            codigo = codigos[posicao]
+            if codigo:
+                valor = self._vocabularios[caminho][0][codigo]
+                _grupo(registro, caminho[0])[caminho[1]] = list(valor) if isinstance(valor, tuple) else valor
+
+        return registro
+
+    def bytes_ocupados(self):
+        """Memória do catálogo: colunas, vocabulários, códigos de produto e textos comprimidos (sys.getsizeof)"""
+        colunas = (*self._numeros.values(), *self._tipos.values(), *self._codigos_categoria.values())
+        total = sum(sys.getsizeof(coluna) for coluna in colunas)
+        total += sys.getsizeof(self._descricoes) + sys.getsizeof(self._fins) + sys.getsizeof(self._dicionario or b"")
+        total += sys.getsizeof(self._codigos) + sum(sys.getsizeof(codigo) for codigo in self._codigos if codigo is not None)
+        for valores, codigos in self._vocabularios.values():
+            total += sys.getsizeof(valores) + sum(sys.getsizeof(valor) for valor in valores)
+            total += sys.getsizeof(codigos) + sum(sys.getsizeof(chave) for chave in codigos)
+        return total
+
+    def _valor(self, posicao, grupo, campo):
+        caminho = (grupo, campo)
+        if caminho in self._numeros:
+            tipo = self._tipos[caminho][posicao]
+            if tipo != _NAO_EXTRAIDO:
+                return self._numero(tipo, self._numeros[caminho][posicao])
+        elif caminho in self._codigos_categoria:
+            codigo = self._codigos_categoria[caminho][posicao]
+            if codigo:
+                valor = self._vocabularios[caminho][0][codigo]
+                return list(valor) if isinstance(valor, tuple) else valor
+        origem = _grupo(self._descricao(posicao), grupo)
+        return origem.get(campo) if origem is not None else None
+
+    def _numero(self, tipo, valor):
+        if tipo == _NULO:
+            return None
+        return int(valor) if tipo == _INTEIRO else valor
+
+    def _codificar(self, caminho, valor):
+        """Código do valor no vocabulário do campo (0 quando o vocabulário está cheio)"""
+        valores, codigos = self._vocabularios[caminho]
+        # Chave em JSON: True e 1, ou ["B3"] e "B3", não podem cair no mesmo código
+        chave = json.dumps(valor, ensure_ascii=False)
+        codigo = codigos.get(chave)
+        if codigo is None:
+            if len(valores) > _MAX_CODIGOS:
+                return 0
+            codigo = codigos[chave] = len(valores)
+            valores.append(valor)
+        return codigo
+
+    def _descricao(self, posicao):
+        inicio = self._fins[posicao - 1] if posicao else 0
+        descompressor = zlib.decompressobj(zdict=self._dicionario)
+        texto = descompressor.decompress(self._descricoes[inicio:self._fins[posicao]]) + descompressor.flush()
+        return json.loads(texto)
@@ -0,0 +1,455 @@
+"""
+Pontuação de Motores - Desafio Siemens Energy
+Calcula localmente o score de adequação (rubrica de 100 pontos) a partir dos requisitos consolidados e do catálogo
+"""
+
+import math
+import re
+import numpy as np
+
+# Muda quando a rubrica muda: análises memorizadas com outra versão são refeitas
+VERSAO_RUBRICA = 2
+
+PONTOS_MAXIMOS = {
+    "potencia": 20,
+    "tensao": 15,
+    "eficiencia": 15,
+    "grau_protecao": 10,
+    "rotacao": 10,
+    "preparado_inversor": 10,
+    "prazo_entrega": 10,
+    "disponibilidade": 5,
+    "garantia": 5
+}
+
+# Critérios que, zerados, tiram o motor da disputa
+CRITERIOS_ELIMINATORIOS = ("potencia", "tensao", "grau_protecao")
+
+# Valores usados quando o documento não especifica o requisito
+PRAZO_MAXIMO_PADRAO = 30
+GARANTIA_MINIMA_PADRAO = 12
+TOLERANCIA_ROTACAO_PADRAO = 2.0
+
+PONTOS_DISPONIBILIDADE = {
+    "em_estoque": 5,
+    "estoque": 5,
+    "pronta_entrega": 4,
+    "sob_encomenda": 3,
+    "importacao": 2
+}
+
+
+def classificar(score, eliminado=False):
+    """Classificação final pela faixa de score (eliminado = NÃO RECOMENDADO)"""
+    if eliminado or score < 60:
+        return "NÃO RECOMENDADO"
+    if score >= 90:
+        return "RECOMENDADO"
+    if score >= 75:
+        return "ALTERNATIVA"
+    return "CONDICIONAL"
+
+
+# Milhar com ponto, como no Brasil ("1.750", "2.200,5"); "0.855" e "1.75" seguem decimais
+_REGEX_MILHAR = re.compile(r"-?[1-9]\d{0,2}(?:\.\d{3})+(?:,\d+)?")
+_PADRAO_NUMERO = r"[1-9]\d{0,2}(?:\.\d{3})+(?![\d.])(?:,\d+)?|\d+(?:[.,]\d+)?"
+_REGEX_NUMERO = re.compile(rf"-?(?:{_PADRAO_NUMERO})")
+_REGEX_NUMEROS = re.compile(_PADRAO_NUMERO)
+
+
+def _para_float(texto):
+    if _REGEX_MILHAR.fullmatch(texto):
+        texto = texto.replace(".", "")
+    return float(texto.replace(",", "."))
+
+
+def numero(valor):
+    """Primeiro número de um valor extraído ("15 kW", "380/440", "1.750 rpm" -> 1750.0, 15) ou None"""
+    if isinstance(valor, bool) or valor is None:
+        return None
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, (list, tuple)):
+        return numero(valor[0]) if valor else None
+    encontrado = _REGEX_NUMERO.search(str(valor))
+    if not encontrado:
+        return None
+    return _para_float(encontrado.group())
+
+
+def numeros(valor):
+    """Todos os números de um valor (lista de tensões, "380V/440V"...)"""
+    if isinstance(valor, (list, tuple)):
+        return [n for item in valor for n in numeros(item)]
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return [float(valor)]
+    if valor is None:
+        return []
+    return [_para_float(n) for n in _REGEX_NUMEROS.findall(str(valor))]
+
+
+def nivel_eficiencia(valor):
+    """IE3 -> 3 (None se não reconhecido)"""
+    encontrado = re.search(r"IE\s*(\d)", str(valor or ""), re.IGNORECASE)
+    return int(encontrado.group(1)) if encontrado else None
+
+
+def codigo_ip(valor):
+    """IP55 -> (5, 5) (None se não reconhecido)"""
+    encontrado = re.search(r"IP\s*(\d)(\d)", str(valor or ""), re.IGNORECASE)
+    return (int(encontrado.group(1)), int(encontrado.group(2))) if encontrado else None
+
+
+_PALAVRAS_VERDADEIRO = {"sim", "s", "yes", "y", "true", "obrigatorio", "obrigatoria", "obrigatório", "obrigatória"}
+
+
+def booleano(valor):
+    """true/"sim"/"obrigatório" -> True ("sem proteção", "não" -> False); None se não informado"""
+    if valor is None or isinstance(valor, bool):
+        return valor
+    texto = str(valor).strip().lower()
+    if texto in ("", "n/a", "null"):
+        return None
+    palavras = re.findall(r"\w+", texto)
+    return bool(palavras) and palavras[0] in _PALAVRAS_VERDADEIRO
+
+
+class CalculadoraPontuacao:
+    """
+    Aplica a rubrica de 9 critérios a motores do catálogo
+
+    Os limites (potência, tensão, rotação, classes mínimas, prazo e garantia)
+    vêm dos requisitos do projeto e são lidos uma única vez; cada motor é
+    avaliado só com aritmética, de forma reprodutível. As faixas seguem a
+    rubrica do prompt original, escaladas pelo valor especificado (ex: prazo
+    ≤ metade do máximo = 10 pontos; com máximo de 30 dias, ≤ 15 dias).
+    """
+
+    def __init__(self, requisitos):
+        req = requisitos.get('requisitos', requisitos)
+        eletricos = req.get('eletricos') or {}
+        mecanicos = req.get('mecanicos') or {}
+        operacionais = req.get('operacionais') or {}
+        comercial = req.get('comercial') or {}
+
+        self.potencia_kw = numero(eletricos.get('potencia_kw'))
+        self.tensao_v = numero(eletricos.get('tensao_v'))
+        self.eficiencia_desejada = nivel_eficiencia(
+            eletricos.get('eficiencia_desejada') or operacionais.get('eficiencia')
+        )
+        self.eficiencia_minima = nivel_eficiencia(eletricos.get('eficiencia_minima')) or self.eficiencia_desejada
+        self.grau_protecao = codigo_ip(operacionais.get('grau_protecao'))
+        self.rotacao_rpm = numero(mecanicos.get('rotacao_rpm'))
+        self.tolerancia_rotacao = numero(mecanicos.get('rotacao_tolerancia_percentual')) or TOLERANCIA_ROTACAO_PADRAO
+        self.inversor_obrigatorio = bool(booleano(eletricos.get('preparado_inversor')))
+        self.prazo_maximo = numero(comercial.get('prazo_entrega_maximo_dias')) or PRAZO_MAXIMO_PADRAO
+        self.garantia_minima = numero(comercial.get('garantia_minima_meses')) or GARANTIA_MINIMA_PADRAO
+
+    def avaliar(self, motor):
+        """
+        Pontua um motor do catálogo
+        Retorna {score_adequacao, classificacao, eliminado, criterios_eliminatorios, analise_pontuacao}
+        """
+        especificacoes = motor.get('especificacoes') or {}
+        eletricos = especificacoes.get('eletricos') or {}
+        mecanicos = especificacoes.get('mecanicos') or {}
+        operacionais = especificacoes.get('operacionais') or {}
+        aplicacao = especificacoes.get('aplicacao') or {}
+        comercial = motor.get('comercial') or {}
+
+        analise = {
+            "potencia": self._potencia(numero(eletricos.get('potencia_kw'))),
+            "tensao": self._tensao(numeros(eletricos.get('tensao_v'))),
+            "eficiencia": self._eficiencia(operacionais.get('eficiencia_energetica')),
+            "grau_protecao": self._grau_protecao(operacionais.get('grau_protecao')),
+            "rotacao": self._rotacao(numero(mecanicos.get('rotacao_nominal_rpm'))),
+            "preparado_inversor": self._inversor(booleano(aplicacao.get('preparado_inversor'))),
+            "prazo_entrega": self._prazo(numero(comercial.get('prazo_entrega_dias'))),
+            "disponibilidade": self._disponibilidade(comercial.get('disponibilidade')),
+            "garantia": self._garantia(numero(comercial.get('garantia_meses')))
+        }
+
+        eliminatorios = [c for c in CRITERIOS_ELIMINATORIOS if analise[c].pop('elimina', False)]
+        for criterio in analise.values():
+            criterio.pop('elimina', None)
+
+        score = float(sum(c['pontos_obtidos'] for c in analise.values()))
+
+        return {
+            "score_adequacao": score,
+            "classificacao": classificar(score, bool(eliminatorios)),
+            "eliminado": bool(eliminatorios),
+            "criterios_eliminatorios": eliminatorios,
+            "analise_pontuacao": analise
+        }
+
+    def pontuar_colunas(self, catalogo):
+        """
+        Mesma rubrica de avaliar(), vetorizada sobre um CatalogoColunar
+        Retorna {criterio: pontos (int64)} mais "score_adequacao" (float64) e
+        "eliminado" (bool), um elemento por motor. Sem a análise descritiva por critério.
+        """
+        n = len(catalogo)
+        pontos = {}
+        elimina = np.zeros(n, dtype=bool)
+
+        # Potência
+        potencia = catalogo.potencia_kw
+        if self.potencia_kw is None:
+            pontos['potencia'] = np.full(n, 20)
+        else:
+            informada = ~np.isnan(potencia)
+            exata = np.abs(potencia - self.potencia_kw) <= 1e-3 * np.maximum(np.abs(potencia), abs(self.potencia_kw))
+            desvio = np.abs(potencia - self.potencia_kw) / self.potencia_kw * 100
+            pontos['potencia'] = np.select([exata, desvio <= 5, desvio <= 10], [20, 15, 10], 0)
+            elimina |= informada & (pontos['potencia'] == 0)
+
+        # Tensão
+        if self.tensao_v is None:
+            pontos['tensao'] = np.full(n, 15)
+        else:
+            disponivel = (catalogo.tensoes & catalogo.mascara_tensao(self.tensao_v)) != 0
+            pontos['tensao'] = np.where(disponivel, 15, 0)
+            elimina |= (catalogo.tensoes != 0) & ~disponivel
+
+        # Eficiência
+        nivel = catalogo.eficiencia
+        if self.eficiencia_desejada is None:
+            pontos['eficiencia'] = np.full(n, 15)
+        else:
+            pontos['eficiencia'] = np.select(
+                [nivel < 0, nivel >= self.eficiencia_desejada, nivel >= self.eficiencia_minima], [0, 15, 10], 5
+            )
+
+        # Grau de proteção
+        ip = catalogo.grau_protecao
+        if self.grau_protecao is None:
+            pontos['grau_protecao'] = np.full(n, 10)
+        else:
+            exigido_1, exigido_2 = self.grau_protecao
+            d1, d2 = ip // 10, ip % 10
+            pontos['grau_protecao'] = np.select(
+                [ip < 0, (d1 >= exigido_1) & (d2 >= exigido_2), (d1 >= exigido_1) & (d2 == exigido_2 - 1)],
+                [0, 10, 5], 0
+            )
+            elimina |= (ip >= 0) & (pontos['grau_protecao'] == 0)
+
+        # Rotação
+        rotacao = catalogo.rotacao_rpm
+        if self.rotacao_rpm is None:
+            pontos['rotacao'] = np.full(n, 10)
+        else:
+            variacao = np.abs(rotacao - self.rotacao_rpm) / self.rotacao_rpm * 100
+            pontos['rotacao'] = np.select(
+                [np.isnan(rotacao), variacao <= 1, variacao <= 2, variacao <= 3], [0, 10, 8, 5], 2
+            )
+
+        pontos['preparado_inversor'] = np.where(catalogo.preparado_inversor, 10, 5)
+
+        # Prazo de entrega
+        prazo = catalogo.prazo_dias
+        maximo = self.prazo_maximo
+        pontos['prazo_entrega'] = np.select(
+            [np.isnan(prazo), prazo <= maximo / 2, prazo <= maximo, prazo <= maximo * 1.5, prazo <= maximo * 2],
+            [0, 10, 8, 5, 3], 1
+        )
+
+        pontos['disponibilidade'] = catalogo.pontos_disponibilidade()[catalogo.disponibilidade]
+
+        # Garantia
+        garantia = catalogo.garantia_meses
+        minima = self.garantia_minima
+        pontos['garantia'] = np.select(
+            [np.isnan(garantia), garantia >= minima * 4 / 3, garantia >= minima, garantia >= minima * 2 / 3],
+            [0, 5, 4, 3], 1
+        )
+
+        pontos = {criterio: pontos[criterio].astype(np.int64, copy=False) for criterio in PONTOS_MAXIMOS}
+        pontos['score_adequacao'] = sum(pontos[criterio] for criterio in PONTOS_MAXIMOS).astype(np.float64)
+        pontos['eliminado'] = elimina
+        return pontos
+
+    def _criterio(self, nome, pontos, especificado, valor_motor, atende, observacao, elimina=False, **extra):
+        criterio = {
+            "pontos_obtidos": pontos,
+            "pontos_maximos": PONTOS_MAXIMOS[nome],
+            "valor_especificado": especificado,
+            "valor_motor": valor_motor,
+            "atende": atende,
+            "observacao": observacao
+        }
+        criterio.update(extra)
+        if elimina:
+            criterio['elimina'] = True
+        return criterio
+
+    def _potencia(self, potencia):
+        especificada = self.potencia_kw
+        if especificada is None:
+            return self._criterio("potencia", 20, None, potencia, True, "Potência não especificada")
+        if potencia is None:
+            return self._criterio("potencia", 0, especificada, None, False, "Motor sem potência informada")
+
+        desvio = abs(potencia - especificada) / especificada * 100
+        if math.isclose(potencia, especificada, rel_tol=1e-3):
+            return self._criterio("potencia", 20, especificada, potencia, True, "Potência exata conforme especificação")
+        if desvio <= 5:
+            return self._criterio("potencia", 15, especificada, potencia, True, f"Potência {desvio:.1f}% diferente da especificada (±5%)")
+        if desvio <= 10:
+            return self._criterio("potencia", 10, especificada, potencia, True, f"Potência {desvio:.1f}% diferente da especificada (±10%)")
+        return self._criterio(
+            "potencia", 0, especificada, potencia, False,
+            f"Potência {desvio:.1f}% fora da especificada (ELIMINATÓRIO)", elimina=True
+        )
+
+    def _tensao(self, tensoes):
+        especificada = self.tensao_v
+        if especificada is None:
+            return self._criterio("tensao", 15, None, tensoes, True, "Tensão não especificada")
+        if not tensoes:
+            return self._criterio("tensao", 0, especificada, None, False, "Motor sem tensão informada")
+        if any(math.isclose(t, especificada, rel_tol=1e-3) for t in tensoes):
+            return self._criterio("tensao", 15, especificada, tensoes, True, f"Tensão {especificada:g}V disponível")
+        return self._criterio(
+            "tensao", 0, especificada, tensoes, False,
+            f"Tensão {especificada:g}V não disponível (ELIMINATÓRIO)", elimina=True
+        )
+
+    def _eficiencia(self, classe):
+        nivel = nivel_eficiencia(classe)
+        desejada = self.eficiencia_desejada
+        minima = self.eficiencia_minima
+        especificada = f"IE{desejada}" if desejada else None
+
+        if desejada is None:
+            return self._criterio("eficiencia", 15, None, classe, True, "Eficiência não especificada")
+        if nivel is None:
+            return self._criterio("eficiencia", 0, especificada, classe, False, "Motor sem classe de eficiência informada")
+        if nivel >= desejada:
+            return self._criterio("eficiencia", 15, especificada, classe, True, f"IE{nivel} atende a classe desejada IE{desejada}")
+        if nivel >= minima:
+            return self._criterio("eficiencia", 10, especificada, classe, True, f"IE{nivel} aceitável (mínimo IE{minima}), perdas maiores")
+        return self._criterio("eficiencia", 5, especificada, classe, False, f"IE{nivel} abaixo do mínimo IE{minima}, custo operacional alto")
+
+    def _grau_protecao(self, grau):
+        codigo = codigo_ip(grau)
+        exigido = self.grau_protecao
+        especificado = f"IP{exigido[0]}{exigido[1]}" if exigido else None
+
+        if exigido is None:
+            return self._criterio("grau_protecao", 10, None, grau, True, "Grau de proteção não especificado")
+        if codigo is None:
+            return self._criterio("grau_protecao", 0, especificado, grau, False, "Motor sem grau de proteção informado")
+        if codigo[0] >= exigido[0] and codigo[1] >= exigido[1]:
+            return self._criterio("grau_protecao", 10, especificado, grau, True, f"{grau} atende o mínimo {especificado}")
+        if codigo[0] >= exigido[0] and codigo[1] == exigido[1] - 1:
+            return self._criterio("grau_protecao", 5, especificado, grau, False, f"{grau} um nível abaixo de {especificado} contra água")
+        return self._criterio(
+            "grau_protecao", 0, especificado, grau, False,
+            f"{grau} inferior ao mínimo {especificado} (ELIMINATÓRIO)", elimina=True
+        )
+
+    def _rotacao(self, rotacao):
+        especificada = self.rotacao_rpm
+        if especificada is None:
+            return self._criterio("rotacao", 10, None, rotacao, True, "Rotação não especificada")
+        if rotacao is None:
+            return self._criterio("rotacao", 0, especificada, None, False, "Motor sem rotação informada")
+
+        variacao = abs(rotacao - especificada) / especificada * 100
+        atende = variacao <= self.tolerancia_rotacao
+        if variacao <= 1:
+            pontos = 10
+        elif variacao <= 2:
+            pontos = 8
+        elif variacao <= 3:
+            pontos = 5
+        else:
+            pontos = 2
+
+        observacao = (
+            f"{rotacao:g} rpm representa variação de {variacao:.1f}%, "
+            f"{'dentro' if atende else 'fora'} da tolerância de ±{self.tolerancia_rotacao:g}%"
+        )
+        return self._criterio("rotacao", pontos, especificada, rotacao, atende, observacao, variacao_percentual=round(variacao, 1))
+
+    def _inversor(self, preparado):
+        if preparado:
+            return self._criterio("preparado_inversor", 10, self.inversor_obrigatorio, True, True, "Preparado para operação com inversor")
+        return self._criterio(
+            "preparado_inversor", 5, self.inversor_obrigatorio, preparado, not self.inversor_obrigatorio,
+            "Não preparado para inversor (limitação futura)"
+        )
+
+    def _prazo(self, prazo):
+        maximo = self.prazo_maximo
+        if prazo is None:
+            return self._criterio("prazo_entrega", 0, maximo, None, False, "Motor sem prazo de entrega informado")
+
+        if prazo <= maximo / 2:
+            pontos, avaliacao = 10, "EXCELENTE"
+        elif prazo <= maximo:
+            pontos, avaliacao = 8, "ATENDE"
+        elif prazo <= maximo * 1.5:
+            pontos, avaliacao = 5, "ACEITÁVEL"
+        elif prazo <= maximo * 2:
+            pontos, avaliacao = 3, "CRÍTICO"
+        else:
+            pontos, avaliacao = 1, "INADEQUADO"
+
+        return self._criterio(
+            "prazo_entrega", pontos, maximo, prazo, prazo <= maximo,
+            f"Prazo de {prazo:g} dias para máximo de {maximo:g} dias ({avaliacao})"
+        )
+
+    def _disponibilidade(self, disponibilidade):
+        chave = str(disponibilidade or "").strip().lower()
+        pontos = PONTOS_DISPONIBILIDADE.get(chave, 1 if chave else 0)
+        return self._criterio(
+            "disponibilidade", pontos, "estoque", disponibilidade, pontos >= 4,
+            f"Disponibilidade: {disponibilidade}" if disponibilidade else "Disponibilidade não informada"
+        )
+
+    def _garantia(self, garantia):
+        minima = self.garantia_minima
+        if garantia is None:
+            return self._criterio("garantia", 0, minima, None, False, "Motor sem garantia informada")
+
+        if garantia >= minima * 4 / 3:
+            pontos = 5
+        elif garantia >= minima:
+            pontos = 4
+        elif garantia >= minima * 2 / 3:
+            pontos = 3
+        else:
+            pontos = 1
+
+        return self._criterio(
+            "garantia", pontos, minima, garantia, garantia >= minima,
+            f"{garantia:g} meses de garantia para mínimo de {minima:g} meses"
+        )
+
+
+def chave_ranking(score, eliminado):
+    """Chave de ordenação do ranking (escalar ou vetor): eliminados sempre abaixo dos demais"""
+    return np.where(eliminado, score, score + 1000.0)
+
+
+def selecionar_top_k(score, eliminado, k=None):
+    """
+    Índices dos k melhores motores, na ordem do ranking
+    Eliminados ficam depois dos demais; empates mantêm a ordem do catálogo
+    (como o sort estável de processar_catalogo). argpartition evita ordenar o catálogo inteiro.
+    """
+    n = len(score)
+    chave = chave_ranking(score, eliminado)
+    if k is None or k >= n:
+        candidatos = np.arange(n)
+    else:
+        if k <= 0:
+            return np.array([], dtype=np.intp)
+        # Tudo que empata com o k-ésimo entra, para o desempate pela ordem do catálogo
+        limite = -np.partition(-chave, k - 1)[k - 1]
+        candidatos = np.flatnonzero(chave >= limite)
+    ordem = np.lexsort((candidatos, -chave[candidatos]))
+    return candidatos[ordem][:k]
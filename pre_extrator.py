@@ -0,0 +1,185 @@
+"""
+Pré-extrator por Regras - Desafio Siemens Energy
+Preenche campos de padrão fixo (potência, tensão, IP, rpm, normas...) com regex, antes do LLM
+"""
+
+import re
+from collections import Counter
+from pontuacao import numero, numeros
+from selecao_relevancia import normalizar
+
+# Número com milhar ("1.500", "2.200,5") ou decimal ("15,5", "1.75"), sem começar no meio de outro
+_NUMERO = r"(?<![\d.,])(?:[1-9]\d{0,2}(?:\.\d{3})+(?![\d.])(?:,\d+)?|\d+(?:[.,]\d+)?)"
+_TENSAO = r"(?:\d{1,2}\.\d{3}|\d{3,4})"
+_ROTACAO = r"(?:\d{1,2}\.\d{3}|\d{3,4})"
+
+
+def _valores(texto):
+    """"380/440" -> (380, 440); um valor só -> 380"""
+    valores = tuple(dict.fromkeys(int(n) for n in numeros(texto)))
+    return valores[0] if len(valores) == 1 else valores
+
+
+# Cada regra procura um valor numa linha já normalizada (minúsculas, sem acentos).
+# "rotulo" é procurado na linha atual e na anterior, sem espaços, porque o
+# PyPDF2 costuma quebrar palavras ("Númer o de P ólos"). Um valor encontrado
+# perto do rótulo vale mais que um valor solto.
+REGRAS = [
+    {
+        "secao": "eletricos", "campo": "potencia_kw",
+        "regex": re.compile(rf"({_NUMERO})\s*kw\b"),
+        "rotulo": "potencia", "converter": numero
+    },
+    {
+        "secao": "eletricos", "campo": "potencia_cv",
+        "regex": re.compile(rf"({_NUMERO})\s*cv\b"),
+        "rotulo": "potencia", "converter": numero
+    },
+    {
+        "secao": "eletricos", "campo": "potencia_hp",
+        "regex": re.compile(rf"({_NUMERO})\s*hp\b"),
+        "rotulo": "potencia", "converter": numero
+    },
+    {
+        "secao": "eletricos", "campo": "tensao_v",
+        "regex": re.compile(rf"(?<![\d.,/])({_TENSAO}(?:\s*/\s*{_TENSAO})*)\s*v(?:olts)?\b"),
+        "rotulo": "tensao", "converter": _valores
+    },
+    {
+        "secao": "eletricos", "campo": "frequencia_hz",
+        "regex": re.compile(r"(?<![\d.,/])((?:50|60)(?:\s*/\s*(?:50|60))*)\s*(?:hz|hertz)\b"),
+        "rotulo": "frequencia", "converter": _valores
+    },
+    {
+        "secao": "operacionais", "campo": "grau_protecao",
+        "regex": re.compile(r"\bip\s?([0-6][0-9])\b"),
+        "rotulo": "grau(?:de)?protecao", "converter": lambda v: f"IP{v}"
+    },
+    {
+        "secao": "mecanicos", "campo": "rotacao_rpm",
+        "regex": re.compile(
+            rf"(?<![\d.,])({_ROTACAO})(?![\d.,])\s*(?:(?:±\s*\d+\s*)|(?:(?:a|-|–)\s*{_ROTACAO}\s*))?rpm\b"
+        ),
+        "rotulo": "rotacao", "excluir": "sincrona", "converter": lambda v: int(numero(v))
+    },
+    {
+        "secao": "mecanicos", "campo": "numero_polos",
+        "regex": re.compile(r"\b(\d{1,2})\s*polos\b"),
+        "rotulo": "polos", "converter": int
+    },
+    {
+        "secao": "eletricos", "campo": "classe_isolamento",
+        "regex": re.compile(r"classe(?:de)?isolamento(?:classe)?:?([abefh])(?![a-z])"),
+        "compacta": True, "converter": str.upper
+    },
+    {
+        "secao": "operacionais", "campo": "regime_trabalho",
+        "regex": re.compile(r"regime.{0,30}?\bs([1-9])\b"),
+        "rotulo": "regime", "converter": lambda v: f"S{v}"
+    },
+]
+
+# Normas têm 4-5 dígitos (IEC 60034, NBR 17094); API usa 3 ("API 541"). Isso evita "IEC 160" (carcaça)
+_REGEX_NORMA = re.compile(r"(NBRIEC|NBR|IEC|ISO|ABNT)(\d{4,5}(?:-\d+)*)|(API)(\d{3})(?!\d)")
+_REGEX_FASES = re.compile(r"(trifasic|monofasic)")
+_REGEX_ESPACOS = re.compile(r"\s+")
+
+CONFIANCA_ROTULADO_UNICO = 0.95
+CONFIANCA_ROTULADO_AMBIGUO = 0.7
+CONFIANCA_SOLTO_UNICO = 0.75
+CONFIANCA_SOLTO_AMBIGUO = 0.5
+# "380/440 V", "50/60 Hz": qual valor vale para o projeto fica com o LLM (abaixo do limite que dispensa a pergunta)
+CONFIANCA_MULTIPLOS = 0.7
+
+
+class PreExtrator:
+    """
+    Extrai, linha a linha, os campos que seguem padrões fixos
+    Processa o documento como fluxo de páginas (processar_pagina/observar) e
+    ao final entrega cada campo com valor, confiança (0.0 a 1.0) e página de origem.
+    """
+
+    def __init__(self):
+        self._candidatos = {}
+        self._normas = []
+        self._fases = []
+        self._linha_anterior = ""
+
+    def observar(self, paginas):
+        """Repassa o fluxo de (numero_pagina, texto) processando cada página no caminho"""
+        for numero, texto in paginas:
+            self.processar_pagina(numero, texto)
+            yield numero, texto
+
+    def processar_pagina(self, numero, texto):
+        for linha in texto.splitlines():
+            normalizada = normalizar(linha)
+            compacta = _REGEX_ESPACOS.sub("", normalizada)
+            contexto = self._linha_anterior + compacta
+
+            for regra in REGRAS:
+                alvo = compacta if regra.get('compacta') else normalizada
+                for match in regra['regex'].finditer(alvo):
+                    if regra.get('excluir') and re.search(regra['excluir'], contexto):
+                        continue
+                    rotulado = bool(regra.get('rotulo') and re.search(regra['rotulo'], contexto)) or regra.get('compacta', False)
+                    valor = regra['converter'](match.group(1))
+                    chave = (regra['secao'], regra['campo'])
+                    self._candidatos.setdefault(chave, []).append((valor, rotulado, numero))
+
+            for match in _REGEX_NORMA.finditer(_REGEX_ESPACOS.sub("", linha.upper())):
+                sigla = match.group(1) or match.group(3)
+                numero_norma = match.group(2) or match.group(4)
+                norma = f"{'NBR IEC' if sigla == 'NBRIEC' else sigla} {numero_norma}"
+                if norma not in self._normas:
+                    self._normas.append(norma)
+
+            fases = _REGEX_FASES.search(compacta)
+            if fases:
+                self._fases.append((3 if fases.group(1) == 'trifasic' else 1, numero))
+
+            self._linha_anterior = compacta
+
+    def campos(self):
+        """Retorna {(secao, campo): {"valor", "confianca", "pagina"}}"""
+        resultado = {}
+
+        for chave, candidatos in self._candidatos.items():
+            rotulados = [c for c in candidatos if c[1]]
+            base = rotulados or candidatos
+            contagem = Counter(valor for valor, _, _ in base)
+            valor = contagem.most_common(1)[0][0]
+            unico = len(contagem) == 1
+
+            if rotulados:
+                confianca = CONFIANCA_ROTULADO_UNICO if unico else CONFIANCA_ROTULADO_AMBIGUO
+            else:
+                confianca = CONFIANCA_SOLTO_UNICO if unico else CONFIANCA_SOLTO_AMBIGUO
+
+            pagina = next(p for v, _, p in base if v == valor)
+            if isinstance(valor, tuple):
+                valor = list(valor)
+                confianca = min(confianca, CONFIANCA_MULTIPLOS)
+            resultado[chave] = {"valor": valor, "confianca": confianca, "pagina": pagina}
+
+        if self._fases:
+            valores = Counter(v for v, _ in self._fases)
+            valor = valores.most_common(1)[0][0]
+            resultado[('eletricos', 'numero_fases')] = {
+                "valor": valor,
+                "confianca": 0.9 if len(valores) == 1 else CONFIANCA_SOLTO_AMBIGUO,
+                "pagina": next(p for v, p in self._fases if v == valor)
+            }
+
+        if self._normas:
+            resultado[('aplicacao', 'normas')] = {"valor": list(self._normas), "confianca": CONFIANCA_ROTULADO_UNICO, "pagina": None}
+
+        return resultado
+
+
+def pre_extrair(paginas):
+    """Atalho: processa todas as páginas e retorna os campos encontrados"""
+    pre = PreExtrator()
+    for numero, texto in paginas:
+        pre.processar_pagina(numero, texto)
+    return pre.campos()
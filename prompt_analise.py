@@ -0,0 +1,183 @@
+"""
+Prompt de Análise - Desafio Siemens Energy
+Prefixo fixo por projeto (requisitos, instruções e formato) seguido dos motores em projeção compacta
+"""
+
+import json
+
+_LINHA = "═" * 75
+
+# Muda quando o prompt muda: análises memorizadas com outra versão são refeitas
+VERSAO_PROMPT = 2
+
+# Campos do catálogo que a rubrica e a análise descritiva usam (o resto não vai ao LLM)
+CAMPOS_MOTOR = {
+    "eletricos": (
+        "potencia_kw", "tensao_v", "frequencia_hz", "corrente_nominal_380v_a", "fator_potencia",
+        "rendimento_100_carga_percent", "rendimento_75_carga_percent", "classe_isolamento"
+    ),
+    "mecanicos": (
+        "rotacao_nominal_rpm", "numero_polos", "tipo_carcaca", "altura_eixo_mm", "tipo_montagem_disponiveis", "peso_kg"
+    ),
+    "operacionais": (
+        "grau_protecao", "eficiencia_energetica", "regime_trabalho", "temp_ambiente_max_c",
+        "umidade_relativa_max_percent", "fator_servico", "nivel_ruido_db"
+    ),
+    "aplicacao": ("preparado_inversor", "tipos_bomba_compativel", "ambientes_instalacao"),
+    "protecoes": ("protecao_termica_tipo", "resistencia_anticondensacao_disponivel")
+}
+CAMPOS_COMERCIAIS = ("preco_base_brl", "prazo_entrega_dias", "disponibilidade", "garantia_meses", "origem_produto")
+
+
+def projetar_motor(motor):
+    """Só os campos de CAMPOS_MOTOR/CAMPOS_COMERCIAIS, sem os vazios"""
+    especificacoes = motor.get('especificacoes') or {}
+    projecao = {
+        "codigo_produto": motor.get('codigo_produto'),
+        "fabricante": motor.get('fabricante'),
+        "linha_produto": motor.get('linha_produto')
+    }
+
+    for grupo, campos in CAMPOS_MOTOR.items():
+        origem = especificacoes.get(grupo) or {}
+        valores = {campo: origem[campo] for campo in campos if origem.get(campo) is not None}
+        if valores:
+            projecao[grupo] = valores
+
+    comercial = motor.get('comercial') or {}
+    valores = {campo: comercial[campo] for campo in CAMPOS_COMERCIAIS if comercial.get(campo) is not None}
+    if valores:
+        projecao["comercial"] = valores
+
+    return {chave: valor for chave, valor in projecao.items() if valor is not None}
+
+
+def codificar_motor(motor):
+    """Projeção em JSON compacto (sem indentação nem espaços)"""
+    return json.dumps(projetar_motor(motor), ensure_ascii=False, separators=(',', ':'))
+
+
+class PromptAnalise:
+    """
+    Prompts de análise de um projeto
+
+    O prefixo (requisitos, instruções e formato de saída) é montado uma vez e
+    é idêntico byte a byte em toda requisição do projeto, com um motor ou um
+    lote, para aproveitar o cache de prompt do provedor. Cada motor vai depois
+    dele como projeção compacta e o resumo da pontuação calculada.
+    `codificar` permite reaproveitar projeções já calculadas (CatalogoPreparado).
+    """
+
+    def __init__(self, requisitos, codificar=codificar_motor):
+        self.requisitos = requisitos
+        self.codificar = codificar
+        self.prefixo = self._montar_prefixo()
+
+    def montar(self, lote):
+        """Prompt completo para a lista de (motor, pontuacao)"""
+        return self.prefixo + "".join(self.bloco_motor(motor, pontuacao) for motor, pontuacao in lote)
+
+    def bloco_motor(self, motor, pontuacao):
+        """Trecho de um motor: projeção compacta e pontuação já calculada"""
+        linhas = [
+            f"- {nome}: {criterio['pontos_obtidos']}/{criterio['pontos_maximos']} - {criterio['observacao']}"
+            for nome, criterio in pontuacao['analise_pontuacao'].items()
+        ]
+        if pontuacao['eliminado']:
+            linhas.append(f"ELIMINADO POR: {', '.join(pontuacao['criterios_eliminatorios'])}")
+
+        return f"""
+MOTOR {motor['codigo_produto']}
+{self.codificar(motor)}
+PONTUAÇÃO: {pontuacao['score_adequacao']:.1f} pontos ({pontuacao['classificacao']})
+{chr(10).join(linhas)}
+"""
+
+    def _montar_prefixo(self):
+        requisitos = self.requisitos
+        req = requisitos['requisitos']
+        aplicacao = req.get('aplicacao') or {}
+        eletricos = req.get('eletricos') or {}
+        mecanicos = req.get('mecanicos') or {}
+        operacionais = req.get('operacionais') or {}
+        comercial = req.get('comercial') or {}
+
+        return f"""
+TAREFA: Analisar a adequação técnica de cada motor listado ao final para a aplicação especificada.
+
+{_LINHA}
+REQUISITOS DO PROJETO
+{_LINHA}
+
+PROJETO: {requisitos.get('projeto_info', {}).get('nome', 'N/A')}
+APLICAÇÃO: {aplicacao.get('modelo_bomba', 'N/A')}
+- Bomba: {aplicacao.get('fabricante_bomba', 'N/A')} {aplicacao.get('modelo_bomba', 'N/A')}
+- Vazão: {aplicacao.get('vazao_m3h', 'N/A')} m³/h
+- AMT: {aplicacao.get('altura_manometrica_m', 'N/A')} m
+- Regime: {aplicacao.get('regime_operacao', 'N/A')}
+
+REQUISITOS CRÍTICOS (NÃO NEGOCIÁVEIS):
+- Potência: {eletricos.get('potencia_kw', 'N/A')} kW (exata)
+- Tensão: {eletricos.get('tensao_v', 'N/A')}V ±10%
+- Grau Proteção: {operacionais.get('grau_protecao', 'N/A')} (mínimo)
+- Eficiência: {eletricos.get('eficiencia_minima', 'N/A')} (mínimo), {eletricos.get('eficiencia_desejada', 'N/A')} (desejado)
+
+REQUISITOS IMPORTANTES:
+- Rotação: {mecanicos.get('rotacao_rpm', 'N/A')} rpm (±{mecanicos.get('rotacao_tolerancia_percentual', 2.0)}%)
+- Corrente máxima: {eletricos.get('corrente_nominal_a', 'N/A')} A @ 380V
+- Montagem: {mecanicos.get('tipo_montagem', 'N/A')}
+- Altura eixo: {mecanicos.get('altura_eixo_mm', 'N/A')} mm
+- Preparado inversor: {'Obrigatório' if eletricos.get('preparado_inversor', False) else 'Não necessário'}
+
+REQUISITOS COMERCIAIS:
+- Prazo máximo: {comercial.get('prazo_entrega_maximo_dias', 'N/A')} dias
+- Garantia mínima: {comercial.get('garantia_minima_meses', 'N/A')} meses
+- Orçamento: até R$ {comercial.get('orcamento_disponivel_brl', 'N/A')}
+
+{_LINHA}
+INSTRUÇÕES DE ANÁLISE
+{_LINHA}
+
+1. Analise CADA motor separadamente, sem misturar dados entre eles
+2. A pontuação de cada motor já foi calculada pela rubrica de 100 pontos: use-a como base, sem alterar pontos
+3. SEJA RIGOROSO com requisitos críticos (Potência, Tensão, Grau Proteção)
+4. CONSIDERE trade-offs reais:
+   - IE4 é melhor que IE3, mas pode ter prazo maior
+   - Importação tem qualidade superior, mas prazo longo
+   - Garantia maior reduz TCO
+5. JUSTIFIQUE tecnicamente cada decisão
+6. IDENTIFIQUE riscos operacionais
+7. COMPARE com especificações da bomba {aplicacao.get('fabricante_bomba', 'N/A')} {aplicacao.get('modelo_bomba', 'N/A')}
+8. A recomendação de engenharia deve ser coerente com a classificação calculada
+
+{_LINHA}
+FORMATO DE SAÍDA (JSON)
+{_LINHA}
+
+Retorne um objeto JSON com uma análise por motor, na ordem em que aparecem:
+
+{{"analises": [<análise do 1º motor>, <análise do 2º motor>, ...]}}
+
+Formato de cada análise ("codigo_produto" igual ao do motor analisado):
+
+{{
+  "codigo_produto": "<codigo_produto do motor>",
+  "parecer_tecnico": "Resumo executivo em 2-3 linhas",
+  "vantagens": ["Eficiência IE3 proporciona economia de energia", "Garantia estendida de 24 meses"],
+  "desvantagens": ["Prazo de entrega de 60 dias excede especificação (30 dias)", "Produto importado, sem estoque local"],
+  "riscos_tecnicos": ["Prazo longo pode impactar cronograma do projeto"],
+  "recomendacao_engenharia": "ALTERNATIVA | RECOMENDADO | CONDICIONAL | NÃO RECOMENDADO",
+  "justificativa_recomendacao": "Explicação técnica da recomendação",
+  "adequacao_aplicacao": {{
+    "bomba_centrifuga": "alta | média | baixa",
+    "regime_continuo": "alta | média | baixa",
+    "ambiente_umido": "alta | média | baixa"
+  }}
+}}
+
+IMPORTANTE: Seja objetivo, técnico e baseado em fatos. Evite subjetividade.
+
+{_LINHA}
+MOTORES EM ANÁLISE (especificação compacta em JSON + pontuação calculada)
+{_LINHA}
+"""
@@ -0,0 +1,180 @@
+"""
+Seleção de Trechos Relevantes - Desafio Siemens Energy
+Pontua seções do documento contra os campos do schema (BM25) para enxugar o prompt de extração
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+
+# Termos que indicam dados do schema de extração, com peso relativo
+TERMOS_RELEVANCIA = {
+    # Elétricos
+    "potencia": 2.0, "kw": 2.0, "cv": 1.5, "hp": 1.5, "tensao": 2.0, "volts": 1.5, "v": 0.5,
+    "corrente": 1.5, "frequencia": 1.5, "hz": 1.5, "fases": 1.0, "trifasico": 1.0,
+    "fator": 1.0, "isolamento": 1.5, "eficiencia": 2.0, "rendimento": 1.5,
+    "ie1": 2.0, "ie2": 2.0, "ie3": 2.0, "ie4": 2.0, "partida": 1.0, "inversor": 1.5, "vfd": 1.5,
+    # Mecânicos
+    "rotacao": 2.0, "rpm": 2.0, "polos": 1.5, "torque": 1.5, "conjugado": 1.0, "montagem": 1.5,
+    "b3": 1.5, "b5": 1.5, "b35": 1.5, "carcaca": 1.5, "eixo": 1.0, "acoplamento": 1.0,
+    "rolamento": 1.0, "rolamentos": 1.0, "peso": 0.5, "kg": 0.5,
+    # Operacionais
+    "grau": 1.0, "protecao": 1.5, "ip54": 2.0, "ip55": 2.0, "ip56": 2.0, "ip65": 2.0, "ip66": 2.0,
+    "regime": 1.5, "s1": 1.5, "temperatura": 1.0, "ambiente": 1.0, "umidade": 1.0, "altitude": 1.0,
+    "refrigeracao": 1.0, "vibracao": 1.0, "ruido": 1.0, "db": 1.0,
+    # Aplicação
+    "bomba": 1.5, "centrifuga": 1.0, "vazao": 1.5, "m3": 1.0, "manometrica": 1.5, "amt": 1.5,
+    "pressao": 1.0, "bar": 1.0, "fluido": 1.0, "agua": 0.5,
+    "nbr": 2.0, "iec": 2.0, "iso": 1.5, "api": 1.0, "nema": 1.5, "abnt": 1.5,
+    # Proteções
+    "pt100": 1.5, "termica": 1.0, "sensores": 0.5, "ligacao": 1.0, "aterramento": 1.0,
+    # Comercial
+    "garantia": 1.5, "meses": 1.0, "prazo": 1.5, "entrega": 1.0, "dias": 0.5,
+    "orcamento": 1.0, "inmetro": 1.5, "certificacao": 1.0,
+}
+
+# Linhas de tabela do tipo "Potência Nominal 15 kW" (número seguido de unidade)
+_REGEX_MEDIDA = re.compile(
+    r"\d+(?:[.,]\d+)?\s*(?:kw|cv|hp|v|a|hz|rpm|°c|db|m3/h|m³/h|bar|mm|kg|dias|meses|%)\b",
+    re.IGNORECASE
+)
+_REGEX_TITULO = re.compile(r"^\s*\d+(?:\.\d+)*\.?\s+\S")
+_REGEX_TOKEN = re.compile(r"[a-z0-9]+")
+
+PESO_MEDIDA = 1.5
+TERMO_MEDIDA = "__medida"
+
+
+def normalizar(texto):
+    """Minúsculas e sem acentos, para casar 'Potência' com 'potencia'"""
+    texto = unicodedata.normalize('NFKD', texto.lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def estimar_tokens(texto):
+    """Estimativa grosseira (~4 caracteres por token)"""
+    return len(texto) // 4 + 1
+
+
+def dividir_em_secoes(paginas, max_caracteres=4000):
+    """
+    Gera seções a partir do fluxo de (numero_pagina, texto)
+    Uma seção começa em cada título numerado ("3.1. Características Elétricas")
+    e é cortada em max_caracteres. A divisão é determinística: percorrer as
+    mesmas páginas de novo produz as mesmas seções, na mesma ordem.
+    """
+    linhas = []
+    tamanho = 0
+    inicio = None
+    fim = None
+    indice = 0
+
+    for numero, texto in paginas:
+        for linha in texto.splitlines():
+            if linhas and (_REGEX_TITULO.match(linha) or tamanho + len(linha) + 1 > max_caracteres):
+                yield {"indice": indice, "paginas": (inicio, fim), "texto": "\n".join(linhas) + "\n"}
+                indice += 1
+                linhas = []
+                tamanho = 0
+                inicio = None
+
+            if inicio is None:
+                inicio = numero
+            fim = numero
+            linhas.append(linha)
+            tamanho += len(linha) + 1
+
+    if linhas:
+        yield {"indice": indice, "paginas": (inicio, fim), "texto": "\n".join(linhas) + "\n"}
+
+
+def perfil_secao(secao):
+    """Resumo da seção usado na pontuação (sem guardar o texto)"""
+    texto = normalizar(secao['texto'])
+    tokens = _REGEX_TOKEN.findall(texto)
+    termos = Counter(t for t in tokens if t in TERMOS_RELEVANCIA)
+
+    medidas = len(_REGEX_MEDIDA.findall(texto))
+    if medidas:
+        termos[TERMO_MEDIDA] = medidas
+
+    return {
+        "indice": secao['indice'],
+        "paginas": secao['paginas'],
+        "tokens": estimar_tokens(secao['texto']),
+        "comprimento": max(len(tokens), 1),
+        "termos": termos
+    }
+
+
+def pontuar(perfis, k1=1.2, b=0.75):
+    """
+    BM25 das seções contra a "consulta" fixa TERMOS_RELEVANCIA
+    O IDF é calculado dentro do próprio documento: termos presentes em todas
+    as seções (ex: nome do projeto) pesam pouco.
+    """
+    if not perfis:
+        return []
+
+    n = len(perfis)
+    media = sum(p['comprimento'] for p in perfis) / n
+    documentos_com_termo = Counter()
+    for p in perfis:
+        documentos_com_termo.update(p['termos'].keys())
+
+    pesos = dict(TERMOS_RELEVANCIA)
+    pesos[TERMO_MEDIDA] = PESO_MEDIDA
+
+    scores = []
+    for p in perfis:
+        score = 0.0
+        for termo, tf in p['termos'].items():
+            df = documentos_com_termo[termo]
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            normalizacao = k1 * (1 - b + b * p['comprimento'] / media)
+            score += pesos[termo] * idf * tf * (k1 + 1) / (tf + normalizacao)
+        scores.append(score)
+    return scores
+
+
+def selecionar_secoes(perfis, orcamento_tokens, limiar_relativo=0.15):
+    """
+    Decide quais seções vão ao LLM
+    São relevantes as seções com score >= limiar_relativo × maior score.
+    Se couberem no orçamento, vão todas em uma única requisição; senão são
+    agrupadas (na ordem do documento) em lotes de até orcamento_tokens, para
+    extração map-reduce.
+
+    Retorna (lotes, resumo), onde cada lote é uma lista de índices de seção.
+    """
+    scores = pontuar(perfis)
+    maior = max(scores, default=0.0)
+
+    if maior <= 0:
+        # Nada reconhecível: mantém o documento inteiro
+        relevantes = list(perfis)
+    else:
+        relevantes = [p for p, s in zip(perfis, scores) if s >= limiar_relativo * maior]
+
+    lotes = []
+    lote = []
+    tokens_lote = 0
+    for perfil in relevantes:
+        if lote and tokens_lote + perfil['tokens'] > orcamento_tokens:
+            lotes.append(lote)
+            lote = []
+            tokens_lote = 0
+        lote.append(perfil['indice'])
+        tokens_lote += perfil['tokens']
+    if lote:
+        lotes.append(lote)
+
+    resumo = {
+        "secoes_total": len(perfis),
+        "secoes_selecionadas": len(relevantes),
+        "tokens_total": sum(p['tokens'] for p in perfis),
+        "tokens_selecionados": sum(p['tokens'] for p in relevantes),
+        "lotes": len(lotes)
+    }
+    return lotes, resumo
@@ -0,0 +1,257 @@
+"""
+Snapshot do Catálogo - Desafio Siemens Energy
+Compila o catálogo JSON num arquivo binário colunar aberto com mmap: a pontuação
+e o índice leem os vetores direto do arquivo, sem reler nem decodificar o JSON
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+from catalogo_colunar import CatalogoColunar
+from catalogo_preparado import CatalogoPreparado
+from indice_catalogo import IndiceCatalogo
+from leitor_catalogo import LeitorProdutos
+
+PASTA_SNAPSHOTS = Path(__file__).resolve().parent / ".cache" / "catalogo"
+
+# Muda quando o formato ou a regra de alguma coluna muda: snapshots de outra versão são recompilados
+VERSAO_SNAPSHOT = 4
+
+# Assinatura, versão, reservado e tamanho do cabeçalho JSON; os vetores começam alinhados depois dele
+_PREAMBULO = struct.Struct("<8sIIQ")
+_ASSINATURA = b"MOTORSNP"
+_ALINHAMENTO = 64
+
+
+def caminho_snapshot(caminho_catalogo):
+    """Arquivo do snapshot de um catálogo em .cache/catalogo/ (um por caminho de origem)"""
+    origem = Path(caminho_catalogo).resolve()
+    marca = hashlib.sha256(str(origem).encode('utf-8')).hexdigest()[:12]
+    return PASTA_SNAPSHOTS / f"{origem.stem}-{marca}.snapshot"
+
+
+def estado_fonte(caminho_catalogo):
+    """Tamanho e data de modificação do JSON: se mudarem, o snapshot é recompilado"""
+    estado = os.stat(caminho_catalogo)
+    return {"tamanho": estado.st_size, "mtime_ns": estado.st_mtime_ns}
+
+
+def _alinhar(posicao):
+    return -(-posicao // _ALINHAMENTO) * _ALINHAMENTO
+
+
+def compilar_snapshot(caminho_catalogo, destino=None):
+    """
+    Compila o catálogo JSON no snapshot e retorna o caminho gravado
+
+    O JSON é lido em fluxo (LeitorProdutos), guardando o trecho em bytes de
+    cada produto; as colunas do CatalogoColunar e as estruturas do
+    IndiceCatalogo são gravadas como vetores contíguos. Os registros
+    completos não são copiados: o snapshot aponta para o JSON original.
+    """
+    destino = Path(destino or caminho_snapshot(caminho_catalogo))
+    # Lido antes do JSON: se ele mudar durante a compilação, a próxima abertura recompila
+    fonte = estado_fonte(caminho_catalogo)
+
+    inicios = []
+    fins = []
+    produtos = []
+    with open(caminho_catalogo, 'r', encoding='utf-8', newline='') as f:
+        leitor = LeitorProdutos(f)
+        for inicio, fim, produto in leitor.com_posicoes():
+            inicios.append(inicio)
+            fins.append(fim)
+            produtos.append(produto)
+    cabecalho_catalogo = leitor.cabecalho
+
+    colunas = CatalogoColunar(produtos)
+    indice = IndiceCatalogo(produtos)
+
+    codigos = [json.dumps(codigo, ensure_ascii=False).encode('utf-8') for codigo in colunas.codigos]
+    tamanhos_codigos = np.array([len(codigo) for codigo in codigos], dtype=np.uint64)
+    fins_codigos = np.cumsum(tamanhos_codigos, dtype=np.uint64)
+    vetores = {
+        "registros.inicio": np.array(inicios, dtype=np.uint64),
+        "registros.fim": np.array(fins, dtype=np.uint64),
+        "codigos.texto": np.frombuffer(b"".join(codigos), dtype=np.uint8),
+        "codigos.inicio": fins_codigos - tamanhos_codigos,
+        "codigos.fim": fins_codigos
+    }
+    for nome, coluna in colunas.colunas().items():
+        vetores[f"colunas.{nome}"] = coluna
+
+    grupos = {}
+    for nome, estrutura in indice.estruturas().items():
+        if isinstance(estrutura, dict):
+            grupos[nome] = list(estrutura)
+            for i, mascara in enumerate(estrutura.values()):
+                vetores[f"indice.{nome}.{i}"] = mascara
+        else:
+            vetores[f"indice.{nome}"] = estrutura
+
+    posicao = 0
+    descricao_vetores = {}
+    for nome, vetor in vetores.items():
+        vetor = np.ascontiguousarray(vetor)
+        vetores[nome] = vetor
+        descricao_vetores[nome] = {"dtype": vetor.dtype.str, "quantidade": int(vetor.size), "inicio": posicao}
+        posicao = _alinhar(posicao + vetor.nbytes)
+
+    metadados = {
+        "fonte": fonte,
+        "catalogo": {
+            "versao": cabecalho_catalogo.get('versao'),
+            "data_atualizacao": cabecalho_catalogo.get('data_atualizacao')
+        },
+        "total": len(produtos),
+        "valores_tensao": colunas.valores_tensao,
+        "valores_disponibilidade": colunas.valores_disponibilidade,
+        "grupos": grupos,
+        "vetores": descricao_vetores
+    }
+    texto = json.dumps(metadados, ensure_ascii=False).encode('utf-8')
+
+    # Grava num temporário e troca de uma vez: quem já tem o snapshot antigo mapeado não é afetado
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = destino.with_name(destino.name + ".tmp")
+    with open(temporario, 'wb') as f:
+        f.write(_PREAMBULO.pack(_ASSINATURA, VERSAO_SNAPSHOT, 0, len(texto)))
+        f.write(texto)
+        inicio_dados = _alinhar(_PREAMBULO.size + len(texto))
+        for nome, vetor in vetores.items():
+            f.write(b"\0" * (inicio_dados + descricao_vetores[nome]["inicio"] - f.tell()))
+            f.write(vetor.tobytes())
+    os.replace(temporario, destino)
+    return destino
+
+
+def abrir_snapshot(caminho_catalogo, destino=None, saida=None):
+    """
+    Abre o snapshot do catálogo, compilando-o antes se ele não existe, é de
+    outra versão ou o JSON mudou (tamanho ou data de modificação)
+    """
+    destino = Path(destino or caminho_snapshot(caminho_catalogo))
+    try:
+        snapshot = SnapshotCatalogo(destino, caminho_catalogo)
+        if snapshot.metadados['fonte'] == estado_fonte(caminho_catalogo):
+            return snapshot
+        motivo = "catálogo alterado"
+    except FileNotFoundError:
+        motivo = "primeira execução"
+    except (OSError, ValueError, KeyError, struct.error):
+        motivo = "snapshot de outra versão"
+
+    print(f"🗜️  Compilando snapshot do catálogo ({motivo})...", file=saida)
+    compilar_snapshot(caminho_catalogo, destino)
+    return SnapshotCatalogo(destino, caminho_catalogo)
+
+
+class SnapshotCatalogo:
+    """
+    Snapshot aberto com mmap
+
+    - produtos: sequência dos registros completos, decodificados do JSON
+      original só quando pedidos (RegistrosSnapshot)
+    - preparado: CatalogoPreparado cujo índice e colunas são vetores NumPy
+      apontando para o arquivo mapeado (somente leitura, sem cópia)
+    - versao / data_atualizacao: as do catálogo compilado
+
+    O JSON fica mapeado enquanto o snapshot estiver aberto: para atualizar o
+    catálogo durante uma execução, grave um arquivo novo e troque-o de lugar
+    (como compilar_snapshot faz), em vez de reescrevê-lo por cima.
+    """
+
+    def __init__(self, caminho_snapshot, caminho_catalogo):
+        with open(caminho_snapshot, 'rb') as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        assinatura, versao, _, tamanho = _PREAMBULO.unpack_from(self._mapa, 0)
+        if assinatura != _ASSINATURA or versao != VERSAO_SNAPSHOT:
+            raise ValueError(f"snapshot de outra versão: {caminho_snapshot}")
+        self.metadados = json.loads(self._mapa[_PREAMBULO.size:_PREAMBULO.size + tamanho])
+        self._inicio_dados = _alinhar(_PREAMBULO.size + tamanho)
+
+        self.versao = self.metadados['catalogo']['versao']
+        self.data_atualizacao = self.metadados['catalogo']['data_atualizacao']
+        with open(caminho_catalogo, 'rb') as f:
+            mapa_catalogo = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.produtos = RegistrosSnapshot(mapa_catalogo, self.vetor("registros.inicio"), self.vetor("registros.fim"))
+        self.preparado = CatalogoPreparado(self.produtos, indice=self._indice(), colunas=self._colunas())
+
+    def __len__(self):
+        return self.metadados['total']
+
+    def vetor(self, nome):
+        """Vetor gravado no snapshot, lido direto do arquivo mapeado"""
+        descricao = self.metadados['vetores'][nome]
+        return np.frombuffer(
+            self._mapa, dtype=descricao['dtype'], count=descricao['quantidade'],
+            offset=self._inicio_dados + descricao['inicio']
+        )
+
+    def _colunas(self):
+        prefixo = "colunas."
+        colunas = {nome[len(prefixo):]: self.vetor(nome) for nome in self.metadados['vetores'] if nome.startswith(prefixo)}
+        codigos = TextosSnapshot(self.vetor("codigos.texto"), self.vetor("codigos.inicio"), self.vetor("codigos.fim"))
+        return CatalogoColunar.de_colunas(
+            codigos, colunas, self.metadados['valores_tensao'], self.metadados['valores_disponibilidade']
+        )
+
+    def _indice(self):
+        prefixo = "indice."
+        estruturas = {
+            nome[len(prefixo):]: self.vetor(nome) for nome in self.metadados['vetores']
+            if nome.startswith(prefixo) and nome.count('.') == 1
+        }
+        for grupo, chaves in self.metadados['grupos'].items():
+            estruturas[grupo] = {chave: self.vetor(f"indice.{grupo}.{i}") for i, chave in enumerate(chaves)}
+        return IndiceCatalogo.de_estruturas(self.produtos, estruturas)
+
+
+class RegistrosSnapshot(Sequence):
+    """Registros do catálogo decodificados sob demanda do JSON original (mapeado com mmap)"""
+
+    def __init__(self, mapa_catalogo, inicios, fins):
+        self._mapa = mapa_catalogo
+        self._inicios = inicios
+        self._fins = fins
+
+    def __len__(self):
+        return len(self._inicios)
+
+    def selecionar(self, indices):
+        """Registros `indices` (na ordem dada), ainda sem decodificar nenhum"""
+        indices = np.asarray(indices, dtype=np.intp)
+        return RegistrosSnapshot(self._mapa, self._inicios[indices], self._fins[indices])
+
+    def __getitem__(self, posicao):
+        if isinstance(posicao, slice):
+            return [self[i] for i in range(*posicao.indices(len(self)))]
+        return json.loads(self._mapa[int(self._inicios[posicao]):int(self._fins[posicao])])
+
+
+class TextosSnapshot(Sequence):
+    """Valores JSON curtos (códigos de produto) concatenados num vetor de bytes, decodificados sob demanda"""
+
+    def __init__(self, texto, inicios, fins):
+        self._texto = texto
+        self._inicios = inicios
+        self._fins = fins
+
+    def __len__(self):
+        return len(self._fins)
+
+    def selecionar(self, indices):
+        """Valores `indices` (na ordem dada), ainda sem decodificar nenhum"""
+        indices = np.asarray(indices, dtype=np.intp)
+        return TextosSnapshot(self._texto, self._inicios[indices], self._fins[indices])
+
+    def __getitem__(self, posicao):
+        if isinstance(posicao, slice):
+            return [self[i] for i in range(*posicao.indices(len(self)))]
+        return json.loads(self._texto[int(self._inicios[posicao]):int(self._fins[posicao])].tobytes())
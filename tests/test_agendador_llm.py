@@ -0,0 +1,35 @@
+"""Retentativas do agendador do LLM"""
+
+import pytest
+
+groq = pytest.importorskip("groq")
+httpx = pytest.importorskip("httpx")
+
+from agendador_llm import AgendadorLLM
+
+
+def falhar_com(erro, chamadas):
+    def funcao():
+        chamadas.append(1)
+        raise erro
+    return funcao
+
+
+def agendador():
+    return AgendadorLLM(rpm=6000, tpm=10 ** 7, max_tentativas=5, espera_base=0.001, max_tentativas_timeout=2)
+
+
+def test_timeout_tem_limite_proprio_de_tentativas():
+    chamadas = []
+    erro = groq.APITimeoutError(request=httpx.Request("POST", "https://api.groq.com"))
+    with pytest.raises(groq.APITimeoutError):
+        agendador().executar(falhar_com(erro, chamadas), 100)
+    assert len(chamadas) == 2
+
+
+def test_queda_de_conexao_usa_todas_as_tentativas():
+    chamadas = []
+    erro = groq.APIConnectionError(request=httpx.Request("POST", "https://api.groq.com"))
+    with pytest.raises(groq.APIConnectionError):
+        agendador().executar(falhar_com(erro, chamadas), 100)
+    assert len(chamadas) == 5
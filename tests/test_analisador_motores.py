@@ -0,0 +1,99 @@
+"""Análise em lotes: requisições individuais de reserva e o prazo de cada motor"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("groq")
+pytest.importorskip("dotenv")
+
+from analisador_motores import AnalisadorMotores
+from cliente_llm import RequisicaoCancelada
+from pontuacao import CalculadoraPontuacao
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+class LLMFalso:
+    """Lote sem análises; o primeiro motor individual trava até o prazo vencer, os demais respondem"""
+
+    streaming = False
+
+    def __init__(self, travar, respondem):
+        self.travar = travar
+        self.respondem = respondem
+        self.chamadas = 0
+
+    def completar_json(self, system_prompt, prompt, temperature, max_tokens, cancelar=None, timeout=None):
+        # Como o ClienteLLM: cancelado antes de começar, nem chega à API
+        if cancelar is not None and cancelar.is_set():
+            raise RequisicaoCancelada("requisição cancelada")
+        self.chamadas += 1
+        if self.chamadas == 1:
+            return {"analises": []}
+        codigo = next(codigo for codigo in self.travar + self.respondem if codigo in prompt)
+        if codigo in self.travar:
+            while not cancelar.is_set():
+                time.sleep(0.01)
+            raise RequisicaoCancelada("requisição cancelada")
+        return {"analises": [{
+            "codigo_produto": codigo,
+            "parecer_tecnico": "Atende.",
+            "recomendacao_engenharia": "Aprovar.",
+            "vantagens": [], "desvantagens": [], "riscos_tecnicos": []
+        }]}
+
+
+@pytest.fixture
+def cenario():
+    with open(RAIZ / "outputs" / "requisitos_consolidados.json", 'r', encoding='utf-8') as f:
+        requisitos = json.load(f)
+    with open(RAIZ / "motor_catalog.json", 'r', encoding='utf-8') as f:
+        motores = json.load(f)['catalogo_motores']['produtos'][:3]
+    calculadora = CalculadoraPontuacao(requisitos)
+    lote = [(motor, calculadora.avaliar(motor)) for motor in motores]
+
+    # Sem cliente real, caches nem catálogo preparado: só o necessário para _analisar_lote
+    analisador = AnalisadorMotores.__new__(AnalisadorMotores)
+    analisador.timeout_motor = 0.2
+    analisador.tokens_resposta_motor = 1000
+    analisador.catalogo_preparado = None
+    analisador.prompt = None
+    return analisador, requisitos, lote
+
+
+def test_prazo_esgotado_de_um_motor_nao_cancela_os_seguintes(cenario):
+    analisador, requisitos, lote = cenario
+    codigos = [motor['codigo_produto'] for motor, _ in lote]
+    llm = LLMFalso(travar=codigos[:1], respondem=codigos[1:])
+    analisador.llm = llm
+    cancelar = threading.Event()
+
+    resultados = analisador._analisar_lote(requisitos, lote, cancelar)
+
+    analise, _, esgotado = resultados[0]
+    assert analise is None and esgotado
+    for (motor, _), (analise, _, esgotado) in zip(lote[1:], resultados[1:]):
+        assert analise is not None and not esgotado
+        assert analise['codigo_produto'] == motor['codigo_produto']
+    assert not cancelar.is_set()
+    assert llm.chamadas == 1 + len(lote)
+
+
+def test_cancelamento_do_lote_chega_a_requisicao_individual(cenario):
+    analisador, requisitos, lote = cenario
+    codigos = [motor['codigo_produto'] for motor, _ in lote]
+    llm = LLMFalso(travar=codigos, respondem=[])
+    analisador.llm = llm
+    analisador.timeout_motor = 0
+    cancelar = threading.Event()
+    threading.Timer(0.1, cancelar.set).start()
+
+    resultados = analisador._analisar_lote(requisitos, lote, cancelar)
+
+    # Cancelado pelo usuário, não por tempo: o primeiro motor para e os demais nem são pedidos
+    assert [(analise, esgotado) for analise, _, esgotado in resultados] == [(None, False)] * len(lote)
+    assert llm.chamadas == 2
@@ -0,0 +1,58 @@
+"""Cache de respostas do ClienteLLM compartilhado entre as chamadas completa e em streaming"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("groq")
+
+from agendador_llm import AgendadorLLM
+from cache_llm import CacheMemoria
+from cliente_llm import ClienteLLM
+
+RESPOSTA = {"parecer_tecnico": "Atende.", "vantagens": ["IE3"]}
+
+
+class CompletionsFalso:
+    """Responde com RESPOSTA, inteira ou em pedaços (stream=True), e registra as chamadas"""
+
+    def __init__(self):
+        self.chamadas = []
+
+    def create(self, stream=False, **parametros):
+        self.chamadas.append(stream)
+        texto = json.dumps(RESPOSTA)
+        if not stream:
+            mensagem = SimpleNamespace(content=texto)
+            return SimpleNamespace(choices=[SimpleNamespace(message=mensagem)], usage=SimpleNamespace(total_tokens=10))
+        return iter([
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=texto[i:i + 7]))])
+            for i in range(0, len(texto), 7)
+        ])
+
+
+@pytest.fixture
+def cliente():
+    # Sem cliente Groq real: só o necessário para completar_json e completar_json_stream
+    cliente = ClienteLLM.__new__(ClienteLLM)
+    cliente.modelo = "modelo-teste"
+    cliente.cache = CacheMemoria()
+    cliente.agendador = AgendadorLLM(rpm=1000, tpm=10 ** 6)
+    cliente.client = SimpleNamespace(chat=SimpleNamespace(completions=CompletionsFalso()))
+    return cliente
+
+
+def chamar(cliente, streaming):
+    if streaming:
+        return cliente.completar_json_stream("sistema", "prompt", temperature=0.2, max_tokens=100)
+    return cliente.completar_json("sistema", "prompt", temperature=0.2, max_tokens=100)
+
+
+@pytest.mark.parametrize("primeira, segunda", [(False, True), (True, False)])
+def test_streaming_e_resposta_completa_dividem_o_cache(cliente, primeira, segunda):
+    assert chamar(cliente, primeira) == RESPOSTA
+    assert chamar(cliente, segunda) == RESPOSTA
+
+    assert cliente.client.chat.completions.chamadas == [primeira]
+    assert cliente.cache.tamanho() == 1
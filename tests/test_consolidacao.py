@@ -0,0 +1,88 @@
+"""Consolidação pela matriz campo × documento contra a regra campo a campo"""
+
+import json
+import random
+
+import pytest
+
+from consolidacao import SECOES_CONFIANCA, SECOES_CONSOLIDACAO, ConsolidadorRequisitos
+
+VALORES = [380, 440, 0.85, "IP55", "IP56", "sim", [1, 2], ["IEC 60034"], {"min": 10, "max": 40}, None]
+CAMPOS = ["a", "b", "c", "d", "e"]
+
+
+def gerar_documentos(semente, quantidade, projetos):
+    aleatorio = random.Random(semente)
+    documentos = []
+    for i in range(quantidade):
+        requisitos = {}
+        for secao in SECOES_CONSOLIDACAO:
+            campos = [campo for campo in CAMPOS if aleatorio.random() < 0.7]
+            if campos:
+                requisitos[secao] = {campo: aleatorio.choice(VALORES) for campo in campos}
+        documentos.append((f"p{aleatorio.randrange(projetos)}", {
+            "documento_origem": f"doc{i}.pdf",
+            "requisitos": requisitos,
+            # Poucas confianças distintas: empates são comuns
+            "confianca_extracao": {secao: aleatorio.choice([0.5, 0.7, 0.9]) for secao in SECOES_CONSOLIDACAO},
+        }))
+    return documentos
+
+
+def consolidar_campo_a_campo(documentos):
+    """Regra anterior: maior confiança da seção vence (empate: o primeiro); conflito se há valores diferentes"""
+    requisitos = {secao: {} for secao in SECOES_CONSOLIDACAO}
+    faltantes = set()
+    proveniencia = {}
+    conflitos = set()
+    for secao in SECOES_CONSOLIDACAO:
+        campos = dict.fromkeys(campo for doc in documentos for campo in doc['requisitos'].get(secao, {}))
+        for campo in campos:
+            encontrados = [
+                (doc['confianca_extracao'][secao], doc['requisitos'][secao][campo], doc['documento_origem'])
+                for doc in documentos if doc['requisitos'].get(secao, {}).get(campo) is not None
+            ]
+            if not encontrados:
+                requisitos[secao][campo] = None
+                faltantes.add(f"{secao}.{campo}")
+                continue
+            confianca, valor, origem = max(encontrados, key=lambda encontrado: encontrado[0])
+            requisitos[secao][campo] = valor
+            proveniencia[f"{secao}.{campo}"] = {"documento": origem, "confianca": confianca}
+            if len({json.dumps(v, sort_keys=True) for _, v, _ in encontrados}) > 1:
+                conflitos.add(f"{secao}.{campo}")
+    return requisitos, faltantes, proveniencia, conflitos
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_matriz_igual_a_regra_campo_a_campo(semente):
+    documentos = gerar_documentos(semente, quantidade=60, projetos=7)
+    consolidados = ConsolidadorRequisitos().consolidar_por_projeto(documentos)
+
+    por_projeto = {}
+    for projeto, requisitos in documentos:
+        por_projeto.setdefault(projeto, []).append(requisitos)
+    assert list(consolidados) == list(por_projeto)
+
+    for projeto, lista in por_projeto.items():
+        consolidado = consolidados[projeto]
+        if len(lista) == 1:
+            assert consolidado is lista[0]
+            continue
+
+        requisitos, faltantes, proveniencia, conflitos = consolidar_campo_a_campo(lista)
+        assert consolidado['requisitos'] == requisitos
+        assert set(consolidado['informacoes_faltantes']) == faltantes
+        assert consolidado['proveniencia'] == proveniencia
+        assert {conflito['campo'] for conflito in consolidado['conflitos']} == conflitos
+        assert consolidado['documentos_origem'] == [doc['documento_origem'] for doc in lista]
+        for secao in SECOES_CONFIANCA:
+            media = sum(doc['confianca_extracao'][secao] for doc in lista) / len(lista)
+            assert consolidado['confianca_extracao'][secao] == pytest.approx(media)
+
+
+def test_consolidar_um_projeto():
+    documentos = [requisitos for _, requisitos in gerar_documentos(7, quantidade=4, projetos=1)]
+    consolidado = ConsolidadorRequisitos().consolidar(documentos)
+    assert consolidado['requisitos'] == consolidar_campo_a_campo(documentos)[0]
+    assert ConsolidadorRequisitos().consolidar([]) is None
@@ -0,0 +1,100 @@
+"""Regras locais do extrator: junção de blocos, preparo de documentos curtos e processos de leitura (sem LLM)"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("groq")
+pytest.importorskip("PyPDF2")
+
+from extrator_requisitos import ExtratorRequisitos
+
+PDFS = sorted(str(caminho) for caminho in (Path(__file__).resolve().parent.parent / "pdfs").glob("*.pdf"))
+
+
+def parcial(tensao, confianca=0.8):
+    return {
+        "requisitos": {"eletricos": {"tensao_v": tensao, "potencia_kw": None}},
+        "informacoes_faltantes": [],
+        "confianca_extracao": {"eletricos": confianca},
+        "observacoes": []
+    }
+
+
+@pytest.fixture
+def extrator():
+    # Sem cliente LLM nem caches: só os limites usados pelas regras locais
+    extrator = ExtratorRequisitos.__new__(ExtratorRequisitos)
+    extrator.max_caracteres_pequeno = 100
+    extrator.confianca_minima_regras = 0.75
+    extrator.dispensar_llm_simples = True
+    extrator.max_caracteres_simples = 2500
+    extrator.processos_parsing = None
+    extrator.min_pdfs_processos = 4
+    extrator.min_paginas_processos = 32
+    return extrator
+
+
+@pytest.mark.parametrize("blocos, esperado", [
+    ([[380, 440], 380], [380, 440]),
+    ([380, [380, 440]], [380, 440]),
+    ([440, [380, 440], 220], [440, 380, 220]),
+    ([None, 380, [440]], [380, 440]),
+])
+def test_lista_e_valor_unico_no_mesmo_campo(extrator, blocos, esperado):
+    mesclado = extrator._mesclar_parciais([parcial(tensao) for tensao in blocos])
+    assert mesclado["requisitos"]["eletricos"]["tensao_v"] == esperado
+    assert mesclado["requisitos"]["eletricos"]["potencia_kw"] is None
+
+
+def test_valor_unico_fica_com_o_bloco_de_maior_confianca(extrator):
+    mesclado = extrator._mesclar_parciais([parcial(380, 0.6), parcial(440, 0.9), parcial(220, 0.7), None])
+    assert mesclado["requisitos"]["eletricos"]["tensao_v"] == 440
+    assert mesclado["confianca_extracao"]["eletricos"] == 0.9
+    assert "1 de 4 blocos do documento não puderam ser extraídos" in mesclado["observacoes"]
+
+
+def paginas_contadas(quantidade, lidas):
+    for numero in range(1, quantidade + 1):
+        lidas.append(numero)
+        yield numero, f"Página {numero} " + "x" * 40
+
+
+def test_documento_curto_vai_para_pacote(extrator):
+    lidas = []
+    doc, paginas = extrator._preparar_pequeno("curto.pdf", 3, paginas_contadas(2, lidas))
+    assert paginas is None
+    assert doc["posicao"] == 3 and doc["nome"] == "curto.pdf"
+    assert doc["texto"].count("Página") == 2
+
+
+def test_documento_longo_continua_da_pagina_em_que_parou(extrator):
+    lidas = []
+    doc, paginas = extrator._preparar_pequeno("longo.pdf", 0, paginas_contadas(6, lidas))
+    assert doc is None
+    assert lidas == [1, 2, 3]
+
+    assert [numero for numero, _ in paginas] == [1, 2, 3, 4, 5, 6]
+    assert lidas == [1, 2, 3, 4, 5, 6]
+
+
+def test_lote_grande_le_em_processos_por_padrao(extrator, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    # A partir de min_pdfs_processos PDFs nem é preciso contar páginas
+    assert extrator._processos_do_lote([f"doc{i}.pdf" for i in range(4)]) == 8
+
+
+def test_lote_pequeno_le_nas_threads_salvo_se_tiver_muitas_paginas(extrator, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    assert extrator._processos_do_lote(PDFS[:2]) == 1
+    extrator.min_paginas_processos = 2
+    assert extrator._processos_do_lote(PDFS[:2]) == 8
+
+
+def test_extrator_processos_fixa_o_numero_de_processos(extrator, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    extrator.processos_parsing = 1
+    assert extrator._processos_do_lote([f"doc{i}.pdf" for i in range(10)]) == 1
+    extrator.processos_parsing = 3
+    assert extrator._processos_do_lote(PDFS[:1]) == 3
@@ -0,0 +1,29 @@
+"""Restrições rígidas respondidas pelo índice do catálogo"""
+
+from indice_catalogo import IndiceCatalogo
+
+
+def motor(frequencia):
+    return {"codigo_produto": str(frequencia), "especificacoes": {"eletricos": {"frequencia_hz": frequencia}}}
+
+
+INDICE = IndiceCatalogo([motor("50/60 Hz"), motor(60), motor(50), motor(None), motor([50, 60])])
+
+
+def viaveis(frequencia):
+    return INDICE.filtrar({"eletricos": {"frequencia_hz": frequencia}}).viaveis.tolist()
+
+
+def test_motor_50_60_hz_atende_as_duas_frequencias():
+    assert viaveis("60 Hz") == [0, 1, 3, 4]
+    assert viaveis(50) == [0, 2, 3, 4]
+
+
+def test_projeto_50_60_hz_aceita_qualquer_uma():
+    assert viaveis("50/60 Hz") == [0, 1, 2, 3, 4]
+
+
+def test_motivo_da_eliminacao():
+    filtro = INDICE.filtrar({"eletricos": {"frequencia_hz": 60}})
+    assert filtro.eliminados.tolist() == [2]
+    assert filtro.motivos(2) == ["frequência 50 Hz, especificada 60 Hz"]
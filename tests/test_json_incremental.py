@@ -0,0 +1,83 @@
+"""ParserJSONIncremental alimentado em pedaços de tamanho aleatório"""
+
+import json
+import random
+
+import pytest
+
+from json_incremental import ParserJSONIncremental
+
+RESPOSTA = {
+    "requisitos": {
+        "eletricos": {"potencia_kw": 75, "tensao_v": "380/440", "frequencia_hz": 60},
+        "normas": ["IEC 60034", "NBR 17094"],
+    },
+    "texto": "aspas \" barra \\ chaves {} [] , : e acentuação ção",
+    "vazio": {},
+    "lista_vazia": [],
+    "numeros": [-1.5e3, 0, 12.25],
+    "literais": [True, False, None],
+    "confianca": 0.92,
+}
+
+
+def fatiar(texto, semente):
+    aleatorio = random.Random(semente)
+    i = 0
+    while i < len(texto):
+        tamanho = aleatorio.randint(1, 12)
+        yield texto[i:i + tamanho]
+        i += tamanho
+
+
+@pytest.mark.parametrize("semente", range(20))
+@pytest.mark.parametrize("indent", [None, 2])
+def test_pedacos_aleatorios_equivalem_a_json_loads(semente, indent):
+    texto = "```json\n" + json.dumps(RESPOSTA, ensure_ascii=False, indent=indent) + "\n```"
+    recebidos = []
+    parser = ParserJSONIncremental(lambda caminho, valor: recebidos.append((caminho, valor)))
+
+    eventos = []
+    for pedaco in fatiar(texto, semente):
+        eventos.extend(parser.alimentar(pedaco))
+
+    assert parser.completo
+    assert parser.resultado() == RESPOSTA
+    assert parser.parcial() == RESPOSTA
+    # Um evento por campo de primeiro nível, na ordem do texto
+    assert recebidos == eventos == list(RESPOSTA.items())
+
+
+@pytest.mark.parametrize("semente", range(10))
+def test_profundidade_2_entrega_campos_aninhados(semente):
+    texto = json.dumps(RESPOSTA)
+    parser = ParserJSONIncremental(profundidade=2)
+    eventos = []
+    for pedaco in fatiar(texto, semente):
+        eventos.extend(parser.alimentar(pedaco))
+
+    caminhos = dict(eventos)
+    assert caminhos["requisitos.eletricos"] == RESPOSTA["requisitos"]["eletricos"]
+    assert caminhos["requisitos.normas"] == RESPOSTA["requisitos"]["normas"]
+    assert caminhos["numeros.0"] == -1.5e3
+    assert caminhos["literais.2"] is None
+    assert caminhos["requisitos"] == RESPOSTA["requisitos"]
+
+
+def test_interrompe_quando_ao_campo_retorna_true():
+    parser = ParserJSONIncremental(lambda caminho, valor: caminho == "texto")
+    eventos = []
+    for pedaco in fatiar(json.dumps(RESPOSTA), 0):
+        eventos.extend(parser.alimentar(pedaco))
+
+    assert parser.interrompido
+    assert [caminho for caminho, _ in eventos] == ["requisitos", "texto"]
+    assert parser.parcial()["texto"] == RESPOSTA["texto"]
+
+
+def test_resposta_incompleta():
+    parser = ParserJSONIncremental()
+    parser.alimentar(json.dumps(RESPOSTA)[:-1])
+    assert not parser.completo
+    with pytest.raises(ValueError):
+        parser.resultado()
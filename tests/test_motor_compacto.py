@@ -0,0 +1,84 @@
+"""CatalogoCompacto: volta exata ao JSON de origem"""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.benchmark_pontuacao import gerar_catalogo
+from motor_compacto import CatalogoCompacto
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def _como_json(registro):
+    # Compara também a ordem das chaves e o tipo dos números (15 e 15.0)
+    return json.dumps(registro, ensure_ascii=False)
+
+
+def _catalogo_real():
+    with open(RAIZ / "motor_catalog.json", 'r', encoding='utf-8') as f:
+        return json.load(f)['catalogo_motores']['produtos']
+
+
+def _registros_atipicos():
+    base = _catalogo_real()[0]
+
+    texto = copy.deepcopy(base)
+    texto['especificacoes']['eletricos']['potencia_kw'] = "15 kW"
+    texto['comercial']['garantia_meses'] = 24.0
+
+    booleano_e_inteiro = copy.deepcopy(base)
+    booleano_e_inteiro['especificacoes']['aplicacao']['preparado_inversor'] = 1
+    booleano_e_inteiro['especificacoes']['mecanicos']['numero_polos'] = True
+    booleano_e_inteiro['especificacoes']['operacionais']['grau_protecao'] = ["IP55"]
+
+    nulos = copy.deepcopy(base)
+    nulos['especificacoes']['eletricos']['potencia_kw'] = None
+    nulos['comercial']['disponibilidade'] = None
+    nulos['especificacoes']['mecanicos']['tipo_montagem_disponiveis'] = [{"codigo": "B3"}]
+
+    sem_grupos = {"codigo_produto": "X-1", "fabricante": "Outro", "especificacoes": None}
+    vazio = {}
+    return [texto, booleano_e_inteiro, nulos, sem_grupos, vazio]
+
+
+@pytest.mark.parametrize("origem", ["real", "sintetico", "atipicos"])
+def test_registro_igual_ao_original(origem):
+    produtos = {
+        "real": _catalogo_real,
+        "sintetico": lambda: gerar_catalogo(500, semente=3),
+        "atipicos": _registros_atipicos,
+    }[origem]()
+    originais = [_como_json(produto) for produto in produtos]
+
+    catalogo = CatalogoCompacto(produtos)
+
+    assert len(catalogo) == len(produtos)
+    # O catálogo não altera os dicionários recebidos
+    assert [_como_json(produto) for produto in produtos] == originais
+    assert [_como_json(catalogo.registro(i)) for i in range(len(catalogo))] == originais
+    assert [_como_json(registro) for registro in catalogo] == originais
+    assert _como_json(catalogo[-1].para_registro()) == originais[-1]
+
+
+def test_valor_le_colunas_e_texto_descritivo():
+    produtos = _catalogo_real() + _registros_atipicos()
+    catalogo = CatalogoCompacto(produtos)
+
+    for i, produto in enumerate(produtos):
+        motor = catalogo[i]
+        assert motor.codigo_produto == produto.get('codigo_produto')
+        especificacoes = produto.get('especificacoes') or {}
+        for grupo, campo in [("eletricos", "potencia_kw"), ("operacionais", "grau_protecao"),
+                             ("aplicacao", "preparado_inversor"), ("mecanicos", "numero_polos")]:
+            assert motor.valor(grupo, campo) == (especificacoes.get(grupo) or {}).get(campo)
+        assert motor.valor("comercial", "garantia_meses") == (produto.get('comercial') or {}).get('garantia_meses')
+        assert motor.valor("", "fabricante") == produto.get('fabricante')
+
+
+def test_posicao_fora_do_catalogo():
+    catalogo = CatalogoCompacto(_catalogo_real())
+    with pytest.raises(IndexError):
+        catalogo[len(catalogo)]
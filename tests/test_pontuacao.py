@@ -0,0 +1,86 @@
+"""Rubrica de pontuação: leitura dos valores extraídos e pontuação vetorizada"""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.benchmark_pontuacao import gerar_catalogo
+from catalogo_colunar import CatalogoColunar
+from pontuacao import CalculadoraPontuacao, booleano, numero, numeros
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    ("1.750 rpm", 1750.0),
+    ("2.200,5", 2200.5),
+    ("1.75", 1.75),
+    ("0.855", 0.855),
+    ("15,5 kW", 15.5),
+    ("380/440 V", 380.0),
+    ([440, 380], 440.0),
+    (15, 15.0),
+    ("sem valor", None),
+    (True, None),
+])
+def test_numero(valor, esperado):
+    assert numero(valor) == esperado
+
+
+def test_numeros_com_milhar():
+    assert numeros("1.750/3.500 rpm") == [1750.0, 3500.0]
+    assert numeros(["380V", "440 V"]) == [380.0, 440.0]
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    ("sim", True),
+    ("S", True),
+    ("Sim, com inversor", True),
+    ("obrigatório", True),
+    ("true", True),
+    ("sem proteção", False),
+    ("sem sensores", False),
+    ("não obrigatório", False),
+    ("não", False),
+    ("n/a", None),
+    (None, None),
+    (False, False),
+])
+def test_booleano(valor, esperado):
+    assert booleano(valor) is esperado
+
+
+def _variar(requisitos, secao, campo, valor):
+    variado = copy.deepcopy(requisitos)
+    variado['requisitos'].setdefault(secao, {})[campo] = valor
+    return variado
+
+
+def _variacoes_requisitos():
+    with open(RAIZ / "outputs" / "requisitos_consolidados.json", 'r', encoding='utf-8') as f:
+        requisitos = json.load(f)
+    yield "consolidados", requisitos
+    yield "sem_requisitos", {"requisitos": {}}
+    yield "potencia_16", _variar(requisitos, 'eletricos', 'potencia_kw', "16,5 kW")
+    yield "tensao_440", _variar(requisitos, 'eletricos', 'tensao_v', "440 V")
+    yield "ip56", _variar(requisitos, 'operacionais', 'grau_protecao', "IP56")
+    yield "ie4", _variar(requisitos, 'eletricos', 'eficiencia_desejada', "IE4")
+    yield "rotacao_milhar", _variar(requisitos, 'mecanicos', 'rotacao_rpm', "1.780 rpm")
+    yield "prazo_curto", _variar(requisitos, 'comercial', 'prazo_entrega_maximo_dias', 10)
+    yield "garantia_36", _variar(requisitos, 'comercial', 'garantia_minima_meses', 36)
+
+
+@pytest.mark.parametrize("nome, requisitos", list(_variacoes_requisitos()))
+def test_pontuar_colunas_igual_a_avaliar(nome, requisitos):
+    catalogo = gerar_catalogo(2000, semente=7)
+    calculadora = CalculadoraPontuacao(requisitos)
+    notas = calculadora.pontuar_colunas(CatalogoColunar(catalogo))
+
+    for i, motor in enumerate(catalogo):
+        avaliacao = calculadora.avaliar(motor)
+        assert notas['score_adequacao'][i] == avaliacao['score_adequacao'], motor['codigo_produto']
+        assert notas['eliminado'][i] == avaliacao['eliminado'], motor['codigo_produto']
+        for criterio, analise in avaliacao['analise_pontuacao'].items():
+            assert notas[criterio][i] == analise['pontos_obtidos'], (motor['codigo_produto'], criterio)
@@ -0,0 +1,57 @@
+"""Pré-extração por regras: notação numérica dos datasheets brasileiros"""
+
+import pytest
+
+from pre_extrator import CONFIANCA_ROTULADO_UNICO, pre_extrair
+
+# Abaixo disso o extrator não deixa a regra prevalecer sobre o LLM (confianca_minima_regras)
+CONFIANCA_MINIMA_REGRAS = 0.75
+
+
+def campo(texto, secao, nome):
+    return pre_extrair([(1, texto)])[(secao, nome)]
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("Potência: 1.500 kW", 1500.0),
+    ("Potência: 2.200,5 kW", 2200.5),
+    ("Potência: 15,5 kW", 15.5),
+    ("Potência: 1.75 kW", 1.75),
+    ("Potência nominal 75 kW", 75.0),
+])
+def test_potencia_com_milhar_e_decimal(texto, esperado):
+    assert campo(texto, "eletricos", "potencia_kw") == {"valor": esperado, "confianca": CONFIANCA_ROTULADO_UNICO, "pagina": 1}
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("Rotação nominal: 1.750 rpm", 1750),
+    ("Rotação nominal: 1750 rpm", 1750),
+    ("Rotação: 1.750 ± 20 rpm", 1750),
+    ("Rotação: 1.740 a 1.760 rpm", 1740),
+])
+def test_rotacao_nao_perde_o_milhar(texto, esperado):
+    assert campo(texto, "mecanicos", "rotacao_rpm")["valor"] == esperado
+
+
+def test_rotacao_sincrona_ignorada():
+    assert ("mecanicos", "rotacao_rpm") not in pre_extrair([(1, "Rotação síncrona: 1.800 rpm")])
+
+
+@pytest.mark.parametrize("texto, secao, nome, esperado", [
+    ("Tensão nominal: 380/440 V", "eletricos", "tensao_v", [380, 440]),
+    ("Tensão: 220/380/440V", "eletricos", "tensao_v", [220, 380, 440]),
+    ("Frequência: 50/60 Hz", "eletricos", "frequencia_hz", [50, 60]),
+])
+def test_multiplos_valores_ficam_com_o_llm(texto, secao, nome, esperado):
+    info = campo(texto, secao, nome)
+    assert info["valor"] == esperado
+    assert info["confianca"] < CONFIANCA_MINIMA_REGRAS
+
+
+@pytest.mark.parametrize("texto, secao, nome, esperado", [
+    ("Tensão nominal: 380 V", "eletricos", "tensao_v", 380),
+    ("Tensão: 3.300 V", "eletricos", "tensao_v", 3300),
+    ("Frequência: 60 Hz", "eletricos", "frequencia_hz", 60),
+])
+def test_valor_unico_rotulado(texto, secao, nome, esperado):
+    assert campo(texto, secao, nome) == {"valor": esperado, "confianca": CONFIANCA_ROTULADO_UNICO, "pagina": 1}
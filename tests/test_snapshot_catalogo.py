@@ -0,0 +1,120 @@
+"""Snapshot colunar do catálogo: recompilação e leitura sob demanda"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import snapshot_catalogo
+from catalogo_preparado import CatalogoPreparado
+from snapshot_catalogo import abrir_snapshot
+
+CATALOGO = Path(__file__).resolve().parent.parent / "motor_catalog.json"
+
+
+@pytest.fixture
+def catalogo(tmp_path):
+    caminho = tmp_path / "catalogo.json"
+    shutil.copy(CATALOGO, caminho)
+    return caminho
+
+
+def produtos(caminho):
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)['catalogo_motores']['produtos']
+
+
+def reabrir(caminho, destino, capsys):
+    snapshot = abrir_snapshot(caminho, destino)
+    return snapshot, capsys.readouterr().out
+
+
+def test_abre_sem_recompilar_quando_o_catalogo_nao_muda(catalogo, tmp_path, capsys):
+    destino = tmp_path / "catalogo.snapshot"
+    _, saida = reabrir(catalogo, destino, capsys)
+    assert "primeira execução" in saida
+
+    snapshot, saida = reabrir(catalogo, destino, capsys)
+    assert saida == ""
+    assert list(snapshot.produtos) == produtos(catalogo)
+
+
+def test_recompila_quando_o_catalogo_muda(catalogo, tmp_path, capsys):
+    destino = tmp_path / "catalogo.snapshot"
+    reabrir(catalogo, destino, capsys)
+
+    dados = json.loads(catalogo.read_text(encoding='utf-8'))
+    dados['catalogo_motores']['produtos'] = dados['catalogo_motores']['produtos'][:2]
+    catalogo.write_text(json.dumps(dados, ensure_ascii=False), encoding='utf-8')
+
+    snapshot, saida = reabrir(catalogo, destino, capsys)
+    assert "catálogo alterado" in saida
+    assert len(snapshot) == 2
+    assert list(snapshot.produtos) == produtos(catalogo)
+
+
+def test_recompila_quando_so_a_data_de_modificacao_muda(catalogo, tmp_path, capsys):
+    destino = tmp_path / "catalogo.snapshot"
+    reabrir(catalogo, destino, capsys)
+
+    estado = os.stat(catalogo)
+    os.utime(catalogo, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10 ** 9))
+
+    _, saida = reabrir(catalogo, destino, capsys)
+    assert "catálogo alterado" in saida
+
+
+def test_recompila_snapshot_de_outra_versao(catalogo, tmp_path, capsys, monkeypatch):
+    destino = tmp_path / "catalogo.snapshot"
+    monkeypatch.setattr(snapshot_catalogo, "VERSAO_SNAPSHOT", snapshot_catalogo.VERSAO_SNAPSHOT - 1)
+    reabrir(catalogo, destino, capsys)
+    monkeypatch.undo()
+
+    _, saida = reabrir(catalogo, destino, capsys)
+    assert "snapshot de outra versão" in saida
+
+
+def test_indice_e_colunas_iguais_aos_montados_do_json(catalogo, tmp_path):
+    snapshot = abrir_snapshot(catalogo, tmp_path / "catalogo.snapshot")
+    em_memoria = CatalogoPreparado(produtos(catalogo))
+
+    for nome, coluna in em_memoria.colunas.colunas().items():
+        assert np.array_equal(snapshot.preparado.colunas.colunas()[nome], coluna, equal_nan=True), nome
+    assert list(snapshot.preparado.colunas.codigos) == list(em_memoria.colunas.codigos)
+    requisitos = {"eletricos": {"potencia_kw": 15, "tensao_v": 380, "frequencia_hz": 60}}
+    assert np.array_equal(snapshot.preparado.indice.filtrar(requisitos).viavel, em_memoria.indice.filtrar(requisitos).viavel)
+
+
+def test_projecoes_e_resumos_calculados_uma_vez_por_motor(catalogo, tmp_path):
+    snapshot = abrir_snapshot(catalogo, tmp_path / "catalogo.snapshot")
+    preparado = snapshot.preparado
+
+    for _ in range(20):
+        # Cada acesso ao snapshot decodifica um registro novo
+        for motor in snapshot.produtos:
+            preparado.projecao(motor)
+            preparado.resumo(motor)
+
+    assert len(preparado._projecoes) == len(snapshot) == len(preparado._resumos)
+    assert preparado.resumo(snapshot.produtos[0]) == CatalogoPreparado(produtos(catalogo)).resumo(produtos(catalogo)[0])
+
+
+def test_codigo_repetido_nao_divide_projecao_nem_resumo(catalogo):
+    originais = produtos(catalogo)
+    outro = json.loads(json.dumps(originais[0]))
+    outro['fabricante'] = "Outro Fabricante"
+    outro['comercial']['preco_base_brl'] += 1000
+    preparado = CatalogoPreparado(originais + [outro])
+
+    primeiro = (preparado.projecao(originais[0]), preparado.resumo(originais[0]))
+    segundo = (preparado.projecao(outro), preparado.resumo(outro))
+
+    assert primeiro[0] != segundo[0] and primeiro[1] != segundo[1]
+    assert (preparado.projecao(originais[0]), preparado.resumo(originais[0])) == primeiro
+    assert originais[0]['codigo_produto'] not in preparado._projecoes
+    # Os demais continuam memorizados pelo código
+    preparado.resumo(originais[1])
+    assert list(preparado._resumos) == [originais[1]['codigo_produto']]